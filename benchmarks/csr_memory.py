@@ -0,0 +1,57 @@
+"""
+Memory footprint of `Graph` versus its frozen `CSRGraph` copy.
+
+Builds a synthetic pedigree where every person has two parents among the
+people born before them, so the graph has about two edges per vertex, and
+reports the bytes allocated by each representation as seen by tracemalloc.
+
+Usage::
+
+    python benchmarks/csr_memory.py --edges 10000000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import pedigree_edges  # noqa: E402
+from src.graph import Graph  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = Graph()
+    for src, dst in pedigree_edges(args.edges, args.seed):
+        graph.add_edge(src, dst)
+    build_time = time.perf_counter() - start
+    graph_bytes = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    frozen = graph.freeze()
+    freeze_time = time.perf_counter() - start
+    del graph
+    gc.collect()
+    csr_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    edges = frozen.num_edges
+    print(f"vertices          {len(frozen):>14,}")
+    print(f"edges             {edges:>14,}")
+    print(f"Graph             {graph_bytes:>14,} bytes  {graph_bytes / edges:6.1f} B/edge  built in {build_time:.2f}s")
+    print(f"CSRGraph          {csr_bytes:>14,} bytes  {csr_bytes / edges:6.1f} B/edge  frozen in {freeze_time:.2f}s")
+    print(f"reduction         {graph_bytes / csr_bytes:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Edge list loading throughput: add_edge loop versus Graph.from_edgelist.
+
+Writes a synthetic pedigree as a TSV file of parent/child rows, then loads
+it with one `add_edge` call per row, with `Graph.from_edgelist`, with the
+garbage collector paused during the load, and with
+`Graph.from_edgelist(freeze=True)`, which builds a `CSRGraph` directly.
+
+Usage::
+
+    python benchmarks/edgelist_load.py --edges 2000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.graph import Graph  # noqa: E402
+
+
+def write_pedigree(path, num_edges, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("parent\tchild\n")
+        for child in range(16, 16 + num_edges // 2):
+            f.write(f"person{rng.randrange(child)}\tperson{child}\n")
+            f.write(f"person{rng.randrange(child)}\tperson{child}\n")
+
+
+def load_with_add_edge(path):
+    graph = Graph()
+    with open(path) as f:
+        next(f)
+        for line in f:
+            src, dst = line.split()
+            graph.add_edge(src, dst)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--memory", action="store_true", help="also trace the memory held by each graph (slower)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pedigree.tsv")
+        write_pedigree(path, args.edges)
+        loaders = [
+            ("add_edge loop", lambda: load_with_add_edge(path)),
+            ("from_edgelist", lambda: Graph.from_edgelist(path, skip_header=True, chunk_size=args.chunk_size)),
+            ("from_edgelist(pause_gc=True)", lambda: Graph.from_edgelist(
+                path, skip_header=True, chunk_size=args.chunk_size, pause_gc=True)),
+            ("from_edgelist(freeze=True)", lambda: Graph.from_edgelist(
+                path, skip_header=True, chunk_size=args.chunk_size, freeze=True)),
+        ]
+        for name, load in loaders:
+            if args.memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            graph = load()
+            elapsed = time.perf_counter() - start
+            line = f"{name:<30} {elapsed:>7.2f} s  {args.edges / elapsed:>12,.0f} edges/s"
+            if args.memory:
+                line += f"  {tracemalloc.get_traced_memory()[0] / 2**20:>8.1f} MiB"
+                tracemalloc.stop()
+            print(line)
+            del graph
+
+
+if __name__ == "__main__":
+    main()
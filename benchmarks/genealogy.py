@@ -0,0 +1,98 @@
+"""
+extract_genealogical_subgraph versus the previous per-ancestor algorithm.
+
+Builds deep synthetic pedigrees, where every generation has a fixed number
+of people and every child has two parents in the previous generation, and
+times the extraction of the tree of someone in the last generation.
+
+The previous algorithm ran a full `dfs` from every ancestor, so its cost
+grows with ancestors x descendants; the single-pass extraction grows with
+the size of the tree.
+
+Usage::
+
+    python benchmarks/genealogy.py --width 50 --generations 10 20 40 80
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.graph import Graph  # noqa: E402
+from src.graph.searching import dfs  # noqa: E402
+from src.graph.utils import extract_genealogical_subgraph, reverse  # noqa: E402
+
+
+def deep_pedigree(generations, width, seed=0):
+    """
+    Returns a pedigree of `generations` x `width` people, where person
+    ``(g, i)`` is numbered ``g * width + i``.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for person in range(width):
+        graph.add_vertex(person)
+    for generation in range(1, generations):
+        for i in range(width):
+            child = generation * width + i
+            for parent in rng.sample(range(width), 2):
+                graph.add_edge((generation - 1) * width + parent, child)
+    return graph
+
+
+def legacy_extract(graph, start_vertex):
+    """
+    The extraction algorithm before the single-pass rewrite.
+    """
+    sub_tree = Graph()
+
+    def add_children(src_graph, dst_graph, start_node):
+        for node in dfs(src_graph, start_node):
+            for child in src_graph.get(node, []):
+                if child not in dst_graph[node]:
+                    dst_graph.add_edge(node, child)
+
+    def add_parents(src_graph, dst_graph, start_node):
+        reversed_g1 = reverse(src_graph)
+        for node in dfs(reversed_g1, start_node):
+            if node != start_node and node is not None:
+                add_children(src_graph, dst_graph, node)
+
+    add_children(graph, sub_tree, start_node=start_vertex)
+    add_parents(graph, sub_tree, start_node=start_vertex)
+    return sub_tree
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--generations", type=int, nargs="+", default=[10, 20, 40, 80])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'generations':>11} {'edges':>8} {'tree':>8} {'legacy s':>9} {'single s':>9} {'speedup':>8}")
+    for generations in args.generations:
+        graph = deep_pedigree(generations, args.width, args.seed)
+        start = generations * args.width - 1
+        old, old_time = timed(legacy_extract, graph, start)
+        new, new_time = timed(extract_genealogical_subgraph, graph, start)
+        assert {(u, v) for u in new.keys() for v in new[u]} == {(u, v) for u in old.keys() for v in old[u]}
+        num_edges = sum(len(edges) for edges in graph.values())
+        tree_edges = sum(len(edges) for edges in new.values())
+        print(
+            f"{generations:>11} {num_edges:>8} {tree_edges:>8} {old_time:>9.3f} {new_time:>9.4f}"
+            f" {old_time / new_time:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
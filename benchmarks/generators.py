@@ -0,0 +1,155 @@
+"""
+Seeded generators of synthetic graphs for the benchmarks.
+
+Every generator yields about `num_edges` directed ``(src, dst)`` edges
+between integer vertices, with parents pointing to children where the
+shape is genealogical, and produces the same edges for the same seed.
+
+Shapes
+------
+pedigree
+    Every child has two parents among all the people born before them.
+deep
+    Fixed-width generations, every child has two parents in the previous
+    generation, so paths are as long as the number of generations.
+wide
+    Few generations of couples with many children each.
+dag
+    Uniformly random edges from lower to higher vertex numbers.
+cyclic
+    A pedigree with a fraction of child -> ancestor edges, which create
+    cycles of bad data.
+powerlaw
+    Preferential attachment: vertices that already have many edges are the
+    likeliest parents of new ones, giving a few very prolific hubs.
+"""
+import random
+from typing import Iterator, Tuple
+
+Edge = Tuple[int, int]
+
+
+def pedigree_edges(num_edges: int, seed: int = 0) -> Iterator[Edge]:
+    """
+    Yields parent -> child edges of a random pedigree with two parents per child.
+    """
+    rng = random.Random(seed)
+    founders = 16
+    child = founders
+    for _ in range(num_edges // 2):
+        yield rng.randrange(child), child
+        yield rng.randrange(child), child
+        child += 1
+
+
+def deep_pedigree_edges(num_edges: int, width: int = 100, seed: int = 0) -> Iterator[Edge]:
+    """
+    Yields the edges of a pedigree of generations of `width` people each.
+
+    Person ``i`` of generation ``g`` is numbered ``g * width + i`` and has two
+    distinct parents in generation ``g - 1``.
+    """
+    rng = random.Random(seed)
+    parents = range(width)
+    child = width
+    for _ in range(num_edges // 2):
+        generation_start = child - child % width
+        for parent in rng.sample(parents, 2):
+            yield generation_start - width + parent, child
+        child += 1
+
+
+def wide_family_edges(num_edges: int, children: int = 50, seed: int = 0) -> Iterator[Edge]:
+    """
+    Yields the edges of families where every couple has about `children` children.
+
+    Couples are formed at random among the people of the latest generation,
+    so there are few generations and many siblings and cousins.
+    """
+    rng = random.Random(seed)
+    generation = list(range(2))
+    next_vertex = 2
+    produced = 0
+    while produced < num_edges:
+        rng.shuffle(generation)
+        couples = [generation[i:i + 2] for i in range(0, len(generation) - 1, 2)] or [generation * 2]
+        offspring = []
+        for mother, father in couples:
+            for _ in range(rng.randint(children // 2, children + children // 2)):
+                yield mother, next_vertex
+                yield father, next_vertex
+                offspring.append(next_vertex)
+                next_vertex += 1
+                produced += 2
+                if produced >= num_edges:
+                    return
+        generation = offspring
+
+
+def random_dag_edges(num_edges: int, num_vertices: int = None, seed: int = 0) -> Iterator[Edge]:
+    """
+    Yields random edges from lower to higher vertex numbers, which form a DAG.
+
+    By default there are half as many vertices as edges.
+    """
+    rng = random.Random(seed)
+    num_vertices = num_vertices or max(2, num_edges // 2)
+    for _ in range(num_edges):
+        u, v = rng.randrange(num_vertices), rng.randrange(num_vertices)
+        while u == v:
+            v = rng.randrange(num_vertices)
+        yield min(u, v), max(u, v)
+
+
+def cyclic_edges(num_edges: int, noise: float = 0.001, seed: int = 0) -> Iterator[Edge]:
+    """
+    Yields a pedigree in which a fraction `noise` of the edges point from a
+    child back to one of its recent ancestors, closing a cycle.
+    """
+    rng = random.Random(seed)
+    parents_of = {}
+    for src, dst in pedigree_edges(num_edges, seed):
+        yield src, dst
+        parents_of.setdefault(dst, src)
+        if rng.random() < noise:
+            ancestor = src
+            for _ in range(rng.randint(0, 3)):
+                ancestor = parents_of.get(ancestor, ancestor)
+            yield dst, ancestor
+
+
+def power_law_edges(num_edges: int, edges_per_vertex: int = 2, seed: int = 0) -> Iterator[Edge]:
+    """
+    Yields edges grown by preferential attachment (Barabasi-Albert).
+
+    Each new vertex gets `edges_per_vertex` parents, picked with probability
+    proportional to their number of edges, so degrees follow a power law.
+    """
+    rng = random.Random(seed)
+    endpoints = list(range(edges_per_vertex + 1))
+    vertex = len(endpoints)
+    produced = 0
+    while produced < num_edges:
+        parents = {rng.choice(endpoints) for _ in range(edges_per_vertex)}
+        for parent in parents:
+            yield parent, vertex
+            endpoints.extend((parent, vertex))
+            produced += 1
+        vertex += 1
+
+
+SHAPES = {
+    "pedigree": pedigree_edges,
+    "deep": deep_pedigree_edges,
+    "wide": wide_family_edges,
+    "dag": random_dag_edges,
+    "cyclic": cyclic_edges,
+    "powerlaw": power_law_edges,
+}
+
+
+def generate(shape: str, num_edges: int, seed: int = 0) -> list:
+    """
+    Returns the edges of the graph of the given `shape` as a list.
+    """
+    return list(SHAPES[shape](num_edges, seed=seed))
@@ -0,0 +1,60 @@
+"""
+Start-up time of a saved graph versus re-inserting its edges.
+
+Builds a synthetic pedigree, saves it with `Graph.save` and reports how
+long it takes to get a queryable graph back: by re-inserting every edge,
+by loading the binary file into memory, and by memory-mapping it.
+
+Usage::
+
+    python benchmarks/graph_load.py --edges 10000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import pedigree_edges  # noqa: E402
+from src.graph import Graph  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    edges = list(pedigree_edges(args.edges, args.seed))
+    start = time.perf_counter()
+    graph = Graph()
+    graph.bulk_add_edges(edges)
+    insert_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pedigree.graph")
+        start = time.perf_counter()
+        graph.save(path)
+        save_time = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        timings = {}
+        for mmap in (False, True):
+            start = time.perf_counter()
+            loaded = Graph.load(path, mmap=mmap)
+            loaded[edges[-1][0]]
+            timings[mmap] = time.perf_counter() - start
+            del loaded
+
+    print(f"edges             {len(edges):>14,}")
+    print(f"file size         {size:>14,} bytes")
+    print(f"bulk insert       {insert_time * 1000:>11.1f} ms")
+    print(f"save              {save_time * 1000:>11.1f} ms")
+    print(f"load              {timings[False] * 1000:>11.1f} ms")
+    print(f"load (mmap)       {timings[True] * 1000:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
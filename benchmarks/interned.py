@@ -0,0 +1,79 @@
+"""
+Memory and traversal time of `InternedGraph` and `CompactGraph` versus `Graph`.
+
+Builds the same synthetic pedigree with UUID-like string labels in every
+class, reports the memory each allocates as seen by tracemalloc (labels
+excluded, since they exist before the graphs), and times `dfs` from a
+sample of vertices in each. Graphs are built one `add_edge` at a time, or
+with one `bulk_add_edges` call with ``--bulk``.
+
+Usage::
+
+    python benchmarks/interned.py --edges 2000000 --bulk
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import pedigree_edges  # noqa: E402
+from src.graph import CompactGraph, Graph, InternedGraph  # noqa: E402
+from src.graph.searching import dfs  # noqa: E402
+
+
+def build(cls, edges, bulk):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = cls()
+    if bulk:
+        graph.bulk_add_edges(edges)
+    else:
+        for src, dst in edges:
+            graph.add_edge(src, dst)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bulk", action="store_true", help="build with bulk_add_edges")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = {}
+    edges = []
+    for src, dst in pedigree_edges(args.edges, args.seed):
+        for vertex in (src, dst):
+            if vertex not in names:
+                names[vertex] = str(uuid.UUID(int=rng.getrandbits(128)))
+        edges.append((names[src], names[dst]))
+    # Start near the founders so that searches cover a large part of the graph.
+    starts = [names[rng.randrange(64)] for _ in range(args.queries)]
+
+    print(f"edges             {len(edges):>14,}")
+    results = {}
+    for cls in (Graph, InternedGraph, CompactGraph):
+        graph, size, build_time = build(cls, edges, args.bulk)
+        start = time.perf_counter()
+        results[cls] = [len(dfs(graph, vertex)) for vertex in starts]
+        search_time = time.perf_counter() - start
+        print(f"{cls.__name__:<16}{size:>16,} bytes  built in {build_time:.2f}s"
+              f"  {args.queries} dfs in {search_time:.2f}s  {size / len(edges):.1f} bytes/edge")
+        del graph
+    assert results[Graph] == results[InternedGraph] == results[CompactGraph]
+
+
+if __name__ == "__main__":
+    main()
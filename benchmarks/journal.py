@@ -0,0 +1,84 @@
+"""
+Durable changes with a `Journal` versus saving the whole graph after each group.
+
+Builds a synthetic graph, then applies the same random edge additions and
+vertex removals twice, making them durable every `--every` changes: once
+by saving the whole graph, once by flushing a journal. Finally times
+recovering the journaled graph, which loads the checkpoint and replays the
+log.
+
+Usage::
+
+    python benchmarks/journal.py --shape pedigree --edges 1000000 --changes 10000 --every 100
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import SHAPES, generate  # noqa: E402
+from src.graph import Graph  # noqa: E402
+from src.graph.journal import Journal  # noqa: E402
+
+
+def apply(graph, changes, every, commit):
+    for i, (kind, args) in enumerate(changes, 1):
+        getattr(graph, kind)(*args)
+        if i % every == 0:
+            commit()
+    commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="pedigree")
+    parser.add_argument("--edges", type=int, default=200_000)
+    parser.add_argument("--changes", type=int, default=2_000)
+    parser.add_argument("--every", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    edges = list(generate(args.shape, args.edges, args.seed))
+    base = Graph(reverse_index=True)
+    base.bulk_add_edges(edges)
+    vertices = base.keys()
+    rng = random.Random(args.seed)
+    changes = [("remove_vertex", (rng.choice(vertices),)) if rng.random() < 0.1
+               else ("add_edge", (rng.choice(vertices), rng.choice(vertices)))
+               for _ in range(args.changes)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        graph = Graph(reverse_index=True)
+        graph.bulk_add_edges(edges)
+        path = os.path.join(directory, "full.graph")
+        start = time.perf_counter()
+        apply(graph, changes, args.every, lambda: graph.save(path))
+        dump_time = time.perf_counter() - start
+
+        graph = Graph(reverse_index=True)
+        graph.bulk_add_edges(edges)
+        journal = Journal.open(os.path.join(directory, "journal"), graph=graph, max_pending=args.every)
+        start = time.perf_counter()
+        apply(graph, changes, args.every, journal.flush)
+        journal_time = time.perf_counter() - start
+        log_size = journal.log_size
+        journal.close()
+
+        start = time.perf_counter()
+        recovered = Journal.open(os.path.join(directory, "journal"), reverse_index=True)
+        recover_time = time.perf_counter() - start
+        assert recovered.graph.keys() == graph.keys()
+        recovered.close()
+
+    print(f"{args.changes} changes, durable every {args.every}, on a {args.shape} graph of {len(edges)} edges")
+    print(f"  save the whole graph: {dump_time:8.3f} s")
+    print(f"  journal:              {journal_time:8.3f} s   log {log_size / 1024:.1f} KiB")
+    print(f"  recover from journal: {recover_time:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
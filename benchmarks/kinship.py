@@ -0,0 +1,60 @@
+"""
+Relationship queries with `AncestorIndex` versus intersecting extracted subgraphs.
+
+Builds a synthetic graph, then answers the same random pairs twice: by
+extracting the genealogical subgraph of both people and intersecting their
+vertices, and with `AncestorIndex.kinship_many`.
+
+Usage::
+
+    python benchmarks/kinship.py --shape wide --edges 1000000 --pairs 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import SHAPES, generate  # noqa: E402
+from src.graph import Graph  # noqa: E402
+from src.graph.kinship import AncestorIndex  # noqa: E402
+from src.graph.utils import extract_genealogical_subgraph  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="deep")
+    parser.add_argument("--edges", type=int, default=200_000)
+    parser.add_argument("--pairs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = Graph(reverse_index=True)
+    graph.bulk_add_edges(generate(args.shape, args.edges, args.seed))
+    vertices = graph.keys()
+    rng = random.Random(args.seed)
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(args.pairs)]
+
+    start = time.perf_counter()
+    for a, b in pairs:
+        extract_genealogical_subgraph(graph, a).all_nodes() & extract_genealogical_subgraph(graph, b).all_nodes()
+    extract_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = AncestorIndex(graph)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index.kinship_many(pairs)
+    query_time = time.perf_counter() - start
+
+    print(f"edges             {args.edges:>14,}")
+    print(f"pairs             {args.pairs:>14,}")
+    print(f"extract + intersect {extract_time / args.pairs * 1000:>9.2f} ms/pair")
+    print(f"index build       {build_time * 1000:>11.1f} ms")
+    print(f"index query       {query_time / args.pairs * 1000:>11.3f} ms/pair")
+
+
+if __name__ == "__main__":
+    main()
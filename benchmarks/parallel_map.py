@@ -0,0 +1,72 @@
+"""
+Scaling of `parallel.map_descendants` with the number of worker processes.
+
+Builds a synthetic pedigree of shallow families, so that every search is
+small and the run measures dispatch overhead as much as search speed, and
+times descendant searches from a sample of start vertices, serially and
+with each requested number of workers.
+
+Usage::
+
+    python benchmarks/parallel_map.py --vertices 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.graph import Graph  # noqa: E402
+from src.graph.parallel import map_descendants  # noqa: E402
+from src.graph.searching import dfs  # noqa: E402
+
+
+def pedigree(num_vertices, generation_size=1000, seed=0):
+    """
+    Returns a pedigree where every child has two parents in the previous generation.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for child in range(num_vertices):
+        graph.add_vertex(child)
+        generation_start = child - child % generation_size
+        if generation_start:
+            for _ in range(2):
+                graph.add_edge(generation_start - generation_size + rng.randrange(generation_size), child)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vertices", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    frozen = pedigree(args.vertices, seed=args.seed).freeze()
+    # Start in the last generations so every search stays small.
+    rng = random.Random(args.seed)
+    lo = max(0, args.vertices - 10_000)
+    starts = [rng.randrange(lo, args.vertices) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    expected = [len(dfs(frozen, vertex)) for vertex in starts]
+    serial = time.perf_counter() - start
+    print(f"cpus              {os.cpu_count():>10}")
+    print(f"serial            {serial:>10.2f} s")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        sizes = [len(found) for _, found in map_descendants(frozen, starts, workers=workers,
+                                                            chunk_size=args.chunk_size)]
+        elapsed = time.perf_counter() - start
+        assert sizes == expected
+        print(f"{workers:>3} workers       {elapsed:>10.2f} s  speed-up {serial / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Reachability queries: `ReachabilityIndex` versus one `dfs` per query.
+
+Builds a synthetic pedigree where every person has two parents among the
+previous generations, then times random "is B a descendant of A" queries.
+
+Usage::
+
+    python benchmarks/reachability.py --people 200000 --queries 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.graph import Graph  # noqa: E402
+from src.graph.reachability import ReachabilityIndex  # noqa: E402
+from src.graph.searching import dfs  # noqa: E402
+
+
+def pedigree(num_people, window=2000, seed=0):
+    """
+    Returns a pedigree where every child has two parents among the
+    `window` people born right before them.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for child in range(num_people):
+        graph.add_vertex(child)
+        if child < 2:
+            continue
+        for _ in range(2):
+            graph.add_edge(rng.randrange(max(0, child - window), child), child)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--people", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--dfs-queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = pedigree(args.people, seed=args.seed)
+    rng = random.Random(args.seed + 1)
+    queries = [(rng.randrange(args.people), rng.randrange(args.people)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = ReachabilityIndex(graph)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    answers = [index.is_reachable(src, dst) for src, dst in queries]
+    index_time = time.perf_counter() - start
+
+    sample = queries[:args.dfs_queries]
+    start = time.perf_counter()
+    expected = [dst in dfs(graph, src) for src, dst in sample]
+    dfs_time = time.perf_counter() - start
+    assert expected == answers[:len(sample)]
+
+    index_rate = len(queries) / index_time
+    dfs_rate = len(sample) / dfs_time
+    print(f"people            {args.people:>12,}")
+    print(f"index build       {build_time:>12.2f} s")
+    print(f"index queries     {index_rate:>12,.0f} /s  ({sum(answers):,} of {len(answers):,} reachable)")
+    print(f"dfs queries       {dfs_rate:>12,.0f} /s")
+    print(f"speedup           {index_rate / dfs_rate:>12,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Strongly connected components, condensation and topological sort at scale.
+
+Builds a synthetic pedigree, which is acyclic, then plants a number of bad
+cycles by adding child -> ancestor edges, and times each algorithm.
+
+Usage::
+
+    python benchmarks/scc.py --edges 10000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import pedigree_edges  # noqa: E402
+from src.graph import Graph  # noqa: E402
+from src.graph.searching import (  # noqa: E402
+    CycleError, condensation, strongly_connected_components, topological_sort,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = Graph(reverse_index=True)
+    graph.bulk_add_edges(pedigree_edges(args.edges, args.seed))
+    rng = random.Random(args.seed)
+    vertices = graph.keys()
+    for _ in range(args.cycles):
+        child = ancestor = rng.choice(vertices)
+        for _ in range(rng.randint(1, 5)):
+            ancestor = (graph.predecessors(ancestor) or [ancestor])[0]
+        graph.add_edge(child, ancestor)
+
+    def timed(label, func):
+        start = time.perf_counter()
+        result = func()
+        print(f"{label:<24}{time.perf_counter() - start:>8.2f} s")
+        return result
+
+    print(f"vertices                {len(vertices):>14,}")
+    print(f"edges                   {sum(map(len, graph.values())):>14,}")
+    components = timed("strongly connected", lambda: strongly_connected_components(graph))
+    print(f"  components            {len(components):>14,}")
+    print(f"  largest               {max(map(len, components)):>14,}")
+    dag, _ = timed("condensation", lambda: condensation(graph))
+    start = time.perf_counter()
+    try:
+        topological_sort(graph)
+    except CycleError as error:
+        print(f"{'topological sort':<24}{time.perf_counter() - start:>8.2f} s")
+        print(f"  cycle found           {len(error.cycle):>14,} vertices")
+    timed("topological sort (dag)", lambda: topological_sort(dag))
+
+
+if __name__ == "__main__":
+    main()
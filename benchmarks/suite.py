@@ -0,0 +1,276 @@
+"""
+Benchmark suite of the graph package, with a stored-baseline comparison mode.
+
+Runs every registered benchmark on every requested graph shape and size
+(see `generators.py`), and reports the best wall time over `--repeat` runs
+and the peak memory allocated during one extra traced run. Results can be
+saved as JSON and later compared against, so every performance change can
+be judged against a baseline.
+
+Usage::
+
+    # record a baseline
+    python benchmarks/suite.py --sizes 1e3 1e4 1e5 --save baseline.json
+
+    # after a change: compare, exit with status 1 on regressions
+    python benchmarks/suite.py --sizes 1e3 1e4 1e5 --compare baseline.json
+
+    # a single benchmark at scale
+    python benchmarks/suite.py --only dfs --shapes deep --sizes 1e7 --repeat 1
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from generators import SHAPES, generate  # noqa: E402
+from src.graph import Graph  # noqa: E402
+from src.graph.searching import dfs, shortest_path  # noqa: E402
+from src.graph.utils import extract_genealogical_subgraph, reverse  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name, max_edges=None):
+    """
+    Registers a benchmark.
+
+    The decorated function receives the list of edges and returns the
+    callable to time; everything it does before returning is setup and is
+    not measured. It is called again before every run, so benchmarks that
+    modify their graph start from the same state each time. Sizes above
+    `max_edges` are skipped.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, max_edges)
+        return setup
+    return register
+
+
+def build(edges):
+    graph = Graph()
+    for src, dst in edges:
+        graph.add_edge(src, dst)
+    return graph
+
+
+def sample(graph, count=10, seed=0):
+    vertices = graph.keys()
+    return random.Random(seed).sample(vertices, min(count, len(vertices)))
+
+
+@benchmark("add_edge")
+def bench_add_edge(edges):
+    return lambda: build(edges)
+
+
+@benchmark("bulk_add_edges")
+def bench_bulk_add_edges(edges):
+    return lambda: Graph().bulk_add_edges(edges)
+
+
+@benchmark("remove_vertex", max_edges=100_000)
+def bench_remove_vertex(edges):
+    graph = build(edges)
+    victims = sample(graph, 10)
+
+    def run():
+        for vertex in victims:
+            graph.remove_vertex(vertex)
+    return run
+
+
+@benchmark("batch")
+def bench_batch(edges):
+    graph = build(edges)
+    victims = sample(graph, 100)
+    added = edges[:1000]
+
+    def run():
+        with graph.batch():
+            for vertex in victims:
+                graph.remove_vertex(vertex)
+            graph.bulk_add_edges(added)
+    return run
+
+
+@benchmark("snapshot_writes")
+def bench_snapshot_writes(edges):
+    graph = Graph(reverse_index=True)
+    graph.bulk_add_edges(edges)
+    batch = edges[:1000]
+
+    def run():
+        # Ten batches of writes, each published to readers as a snapshot.
+        for _ in range(10):
+            graph.snapshot()
+            graph.bulk_add_edges(batch)
+    return run
+
+
+@benchmark("dfs")
+def bench_dfs(edges):
+    graph = build(edges)
+    starts = sample(graph, 10)
+    return lambda: [dfs(graph, vertex) for vertex in starts]
+
+
+@benchmark("shortest_path")
+def bench_shortest_path(edges):
+    graph = Graph(reverse_index=True)
+    graph.bulk_add_edges(edges)
+    ends = sample(graph, 20, seed=1)
+    pairs = list(zip(ends[::2], ends[1::2]))
+    return lambda: [shortest_path(graph, src, dst, directed=False) for src, dst in pairs]
+
+
+@benchmark("reverse")
+def bench_reverse(edges):
+    graph = build(edges)
+    return lambda: reverse(graph)
+
+
+@benchmark("extract_genealogical_subgraph")
+def bench_extract(edges):
+    graph = build(edges)
+    starts = sample(graph, 10)
+    return lambda: [extract_genealogical_subgraph(graph, vertex) for vertex in starts]
+
+
+@benchmark("freeze")
+def bench_freeze(edges):
+    graph = build(edges)
+    return graph.freeze
+
+
+@benchmark("plot_graph", max_edges=100_000)
+def bench_plot_graph(edges):
+    try:
+        from src.plot.graph import plot_graph
+    except ImportError:
+        return None
+    graph = build(edges)
+    return lambda: plot_graph(graph)
+
+
+@benchmark("write_dot")
+def bench_write_dot(edges):
+    from src.plot.dot import write_dot
+    graph = build(edges)
+    return lambda: write_dot(graph, io.StringIO())
+
+
+@benchmark("write_dot_focus")
+def bench_write_dot_focus(edges):
+    from src.plot.dot import write_dot
+    graph = Graph(reverse_index=True)
+    graph.bulk_add_edges(edges)
+    starts = sample(graph, 10)
+    return lambda: [write_dot(graph, io.StringIO(), focus=vertex, hops=3, max_nodes=1000) for vertex in starts]
+
+
+def measure(setup, edges, repeat):
+    """
+    Returns the best time of `repeat` runs and the peak traced memory of one
+    more run, or None if the benchmark is unavailable.
+    """
+    times = []
+    for _ in range(repeat):
+        run = setup(edges)
+        if run is None:
+            return None
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+        del run
+
+    run = setup(edges)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def run_suite(names, shapes, sizes, repeat, seed, progress=print):
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            edges = generate(shape, size, seed)
+            for name in names:
+                setup, max_edges = BENCHMARKS[name]
+                if max_edges is not None and size > max_edges:
+                    continue
+                measured = measure(setup, edges, repeat)
+                if measured is None:
+                    progress(f"{name:<32}{shape:<10}{size:>10,}  skipped")
+                    continue
+                seconds, peak = measured
+                results.append({"benchmark": name, "shape": shape, "edges": size,
+                                "seconds": seconds, "peak_bytes": peak})
+                progress(f"{name:<32}{shape:<10}{size:>10,}{seconds:>12.4f} s{peak / 2**20:>10.1f} MiB")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the ratio of every result to its baseline and returns the number
+    of results slower or larger than the baseline by more than `tolerance`.
+    """
+    reference = {(r["benchmark"], r["shape"], r["edges"]): r for r in baseline["results"]}
+    regressions = 0
+    print()
+    print(f"{'benchmark':<32}{'shape':<10}{'edges':>10}{'time':>10}{'memory':>10}")
+    for result in results:
+        old = reference.get((result["benchmark"], result["shape"], result["edges"]))
+        if old is None:
+            continue
+        time_ratio = result["seconds"] / max(old["seconds"], 1e-9)
+        memory_ratio = result["peak_bytes"] / max(old["peak_bytes"], 1)
+        regressed = time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        regressions += regressed
+        print(f"{result['benchmark']:<32}{result['shape']:<10}{result['edges']:>10,}"
+              f"{time_ratio:>9.2f}x{memory_ratio:>9.2f}x{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES))
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the results to a JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative slowdown or growth reported as a regression (default 0.25)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes]
+    results = run_suite(args.only, args.shapes, sizes, args.repeat, args.seed)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,4 @@
-from ._base import Graph
\ No newline at end of file
+from ._base import Graph, GraphSnapshot, ReversedGraph
+from ._compact import CompactGraph
+from ._csr import CSRGraph
+from ._interned import InternedGraph
@@ -1,6 +1,13 @@
+import gc
+import weakref
 from collections import defaultdict
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
 from typing import List, Set, Dict, Any
 
+from . import instrumentation
+
 class Graph:
     """
     A class to represent a directed graph using an adjacency list.
@@ -10,19 +17,344 @@ class Graph:
     graph : defaultdict
         A dictionary to store the graph as an adjacency list,
         where keys are the source vertices and values are lists of destination vertices.
+        With ``adjacency="set"`` the values are insertion-ordered dicts used as sets.
 
     Methods
     -------
     add_edge(src_vertex, dst_vertex):
         Adds a directed edge from `src_vertex` to `dst_vertex`.
+    has_edge(src_vertex, dst_vertex):
+        Checks whether the edge from `src_vertex` to `dst_vertex` exists.
+    predecessors(vertex):
+        Returns the vertices with an edge pointing to `vertex`.
+    snapshot():
+        Returns an immutable view of the current edges.
+    batch():
+        Buffers changes and applies them together.
     """
 
-    def __init__(self):
+    def __new__(cls, *args, intern: bool = False, **kwargs):
+        if not intern:
+            return super().__new__(cls)
+        if cls is not Graph or args or kwargs.get("reverse_index") or kwargs.get("adjacency", "list") != "list":
+            raise ValueError("intern=True builds an InternedGraph, which takes no other options")
+        from ._interned import InternedGraph
+
+        return InternedGraph()
+
+    def __init__(self, reverse_index: bool = False, adjacency: str = "list", intern: bool = False):
         """
         Initializes an empty graph represented as an adjacency list.
+
+        Parameters
+        ----------
+        reverse_index : bool, optional
+            If True, also maintain a predecessor list for every vertex,
+            updated incrementally by `add_edge`, `remove_edge`,
+            `remove_vertex` and item assignment. This makes
+            `predecessors`, `in_degree` and `utils.reverse` cheap at the
+            cost of storing every edge twice.
+        adjacency : {"list", "set"}, optional
+            How neighbours are stored. ``"list"`` keeps parallel edges and
+            makes `has_edge` and `remove_edge` linear in the degree.
+            ``"set"`` stores neighbours in insertion-ordered dicts, so those
+            operations are O(1) and iteration order is unchanged, but
+            parallel edges collapse into one.
+        intern : bool, optional
+            If True, an `InternedGraph` is returned instead: the same read
+            and write API for list adjacency, with edges stored as integer
+            ids in one array. It holds less memory and searches faster, but
+            has no reverse index, snapshots, batches or observers.
+        """
+        if adjacency not in ("list", "set"):
+            raise ValueError(f"adjacency must be 'list' or 'set', got {adjacency!r}")
+        self._adjacency = adjacency
+        container = list if adjacency == "list" else dict
+        self._graph = defaultdict(container)
+        self._pred = defaultdict(container) if reverse_index else None
+        self._version = 0
+        self._observers = None
+        self._batch = None
+        self._init_snapshots()
+
+    @property
+    def reverse_index(self) -> bool:
+        """
+        Whether the graph maintains a predecessor index.
+        """
+        return self._pred is not None
+
+    @property
+    def version(self) -> int:
+        """
+        A counter bumped by every mutation of the graph.
+
+        Two reads that see the same version see the same edges, as long as
+        adjacency lists are only changed through the graph's methods.
+        """
+        return self._version
+
+    @property
+    def adjacency(self) -> str:
+        """
+        The adjacency storage mode, either ``"list"`` or ``"set"``.
+        """
+        return self._adjacency
+
+    def subscribe(self, observer):
+        """
+        Registers `observer` to be told about every change to the graph.
+
+        After each change, ``observer.graph_changed(event, src_vertex,
+        dst_vertex)`` is called with one of these events:
+
+        - ``"add_edge"``: the edge from `src_vertex` to `dst_vertex` was
+          added, by `add_edge` or once per edge by `bulk_add_edges`. While
+          a graph has observers, `bulk_add_edges` adds the edges one at a
+          time, so every event sees the graph as it is after that edge.
+        - ``"add_vertex"``: `src_vertex` was added by `add_vertex`,
+          `dst_vertex` is None. Vertices added along with an edge only
+          send ``"add_edge"``.
+        - ``"remove_edge"``: one edge from `src_vertex` to `dst_vertex`
+          was removed.
+        - ``"remove_vertex"``: `src_vertex` was removed, `dst_vertex` is None.
+        - ``"reset"``: the adjacency of `src_vertex` was replaced by item
+          assignment; observers should recompute what they derive from it.
+        - ``"batch"``: the changes buffered by `batch` were applied.
+          `src_vertex` is the list of ``(method name, arguments)`` pairs
+          applied, in order, and `dst_vertex` is None; observers should
+          recompute what they derive from the graph.
+
+        Parameters
+        ----------
+        observer : object
+            Any object with a ``graph_changed`` method. It is held by weak
+            reference, so an observer that is no longer used elsewhere
+            stops receiving events without being unsubscribed.
+        """
+        if self._observers is None:
+            self._observers = weakref.WeakSet()
+        self._observers.add(observer)
+
+    def unsubscribe(self, observer):
+        """
+        Stops sending events to `observer`. Does nothing if it is not subscribed.
+        """
+        if self._observers is not None:
+            self._observers.discard(observer)
+
+    def __getstate__(self):
+        # Observers are not part of the graph's value and cannot be pickled,
+        # and an unpickled graph shares nothing with the snapshots.
+        state = self.__dict__.copy()
+        state["_observers"] = None
+        state["_batch"] = None
+        state.update(_snapshots=None, _shared=False, _owned=None, _owned_pred=None)
+        return state
+
+    @contextmanager
+    def batch(self):
+        """
+        Buffers the changes made in a ``with`` block and applies them when
+        the block exits.
+
+        Inside the block `add_edge`, `bulk_add_edges`, `remove_edge`,
+        `add_vertex`, `remove_vertex` and item assignment only record the
+        change, and reads see the graph as it was before the block. On
+        exit the changes are applied in order, with consecutive changes of
+        the same kind grouped: added edges go through one `bulk_add_edges`
+        call, and removed vertices are dropped in a single pass over the
+        adjacency lists instead of one pass per vertex, along with every
+        edge to them, parallel edges included. Observers receive one
+        ``"batch"`` event instead of one event per change.
+
+        If the block raises, nothing is applied. Vertices are hashed as
+        they are recorded, so an unhashable vertex raises inside the block.
+        Nested batches join the outermost one; if a nested block raises,
+        the changes it recorded are discarded, and the outer block may
+        catch the exception and go on.
+
+        Examples
+        --------
+        >>> with g.batch():
+        ...     for vertex in removed:
+        ...         g.remove_vertex(vertex)
+        ...     g.bulk_add_edges(added)
+        """
+        if self._batch is not None:
+            mark = len(self._batch)
+            try:
+                yield self
+            except BaseException:
+                del self._batch[mark:]
+                raise
+            return
+        self._batch = operations = []
+        try:
+            yield self
+        finally:
+            self._batch = None
+        if operations:
+            self._apply(operations)
+
+    def _defer(self, operation: str, vertices, args):
+        for vertex in vertices:
+            hash(vertex)
+        self._batch.append((operation, args))
+
+    @instrumentation.timed("Graph.batch")
+    def _apply(self, operations):
+        observers, self._observers = self._observers, None
+        try:
+            for operation, run in groupby(operations, key=itemgetter(0)):
+                if operation == "add_edge":
+                    self.bulk_add_edges([args for _, args in run])
+                elif operation == "remove_vertex":
+                    self._remove_vertices({args[0] for _, args in run})
+                else:
+                    method = getattr(self, operation)
+                    for _, args in run:
+                        method(*args)
+        finally:
+            self._observers = observers
+        if self._observers:
+            self._notify("batch", operations)
+
+    def _remove_vertices(self, vertices: Set):
+        # Removes many vertices with every edge to and from them, touching
+        # each adjacency list at most once.
+        gone = {vertex for vertex in vertices if vertex in self._graph}
+        if not gone:
+            return
+        if instrumentation._recorder is not None:
+            instrumentation._recorder.count("Graph.vertices_removed", len(gone))
+        if self._snapshots is not None:
+            self._writable()
+        graph, pred = self._graph, self._pred
+        successors = [graph.pop(vertex) for vertex in gone]
+        self._version += 1
+        if pred is None:
+            affected = [v for v, edges in graph.items() if not gone.isdisjoint(edges)]
+            for v in affected:
+                self._unlink_many(self._private(graph, self._owned, v), gone)
+            return
+        sources, targets = set(), set()
+        for vertex in gone:
+            sources.update(pred.pop(vertex, ()))
+        for edges in successors:
+            targets.update(edges)
+        for src in sources - gone:
+            if src in graph:
+                self._unlink_many(self._private(graph, self._owned, src), gone)
+        for dst in targets - gone:
+            if dst in pred:
+                self._unlink_many(self._private(pred, self._owned_pred, dst), gone)
+
+    def snapshot(self) -> 'GraphSnapshot':
+        """
+        Returns an immutable view of the graph as it is now.
+
+        Taking a snapshot copies nothing: the snapshot shares the vertex
+        map and every adjacency list with the graph. The graph then copies
+        on write. The first change after a snapshot copies the vertex map,
+        which holds references only, and every change copies the adjacency
+        lists it modifies the first time it modifies them. Lists that are
+        not modified stay shared, however many snapshots are taken.
+
+        Snapshots can be read from other threads while the graph keeps
+        changing, with the same read API as `Graph` and in any function
+        accepting one. Take them in the thread that modifies the graph,
+        or under the lock that serialises its changes. Reads copy nothing:
+        while a snapshot is alive, the lists ``graph[vertex]`` and `get`
+        return in list mode may be the snapshot's too, and must not be
+        modified in place; change the graph through its methods.
+
+        Returns
+        -------
+        GraphSnapshot
+            A read-only graph with the current edges and `version`.
+
+        Examples
+        --------
+        >>> view = g.snapshot()
+        >>> g.add_edge('Alice', 'Dave')
+        >>> 'Dave' in view.get('Alice')
+        False
         """
-        self._graph = defaultdict(list)
-        
+        snapshot = GraphSnapshot(self)
+        if self._snapshots is None:
+            self._snapshots = weakref.WeakSet()
+        self._snapshots.add(snapshot)
+        self._shared = True
+        self._owned = set()
+        self._owned_pred = None if self._pred is None else set()
+        return snapshot
+
+    def _init_snapshots(self):
+        # The live snapshots, whether they share the vertex map and the
+        # predecessor map, and the vertices whose containers were copied
+        # since the last snapshot; None when no snapshot is alive.
+        self._snapshots = None
+        self._shared = False
+        self._owned = None
+        self._owned_pred = None
+
+    def _writable(self):
+        # Called before any change while snapshots may exist.
+        if not self._snapshots:
+            self._init_snapshots()
+        elif self._shared:
+            self._graph = self._graph.copy()
+            if self._pred is not None:
+                self._pred = self._pred.copy()
+            self._shared = False
+
+    @staticmethod
+    def _private(mapping, owned, vertex):
+        # Returns the container of `vertex` for writing, copied first if a
+        # snapshot may still hold it.
+        if owned is None or vertex in owned:
+            return mapping[vertex]
+        owned.add(vertex)
+        container = mapping.get(vertex)
+        container = mapping.default_factory() if container is None else container.copy()
+        mapping[vertex] = container
+        return container
+
+    def _notify(self, event: str, src_vertex, dst_vertex=None):
+        for observer in list(self._observers):
+            observer.graph_changed(event, src_vertex, dst_vertex)
+
+    def _as_list(self, container) -> List:
+        # Set-backed containers are exposed as lists so callers see the same
+        # type in both storage modes.
+        return container if self._adjacency == "list" else list(container)
+
+    def _link(self, container, vertex):
+        if self._adjacency == "list":
+            container.append(vertex)
+        else:
+            container[vertex] = None
+
+    def _unlink(self, container, vertex):
+        if self._adjacency == "list":
+            container.remove(vertex)
+        else:
+            del container[vertex]
+
+    def _unlink_all(self, container, vertex):
+        if self._adjacency == "list":
+            container[:] = [v for v in container if v != vertex]
+        else:
+            container.pop(vertex, None)
+
+    def _unlink_many(self, container, vertices: Set):
+        if self._adjacency == "list":
+            container[:] = [v for v in container if v not in vertices]
+        else:
+            for vertex in vertices.intersection(container):
+                del container[vertex]
+
     def __getitem__(self, vertex):
         """
         Returns the adjacent vertices for the given `vertex`.
@@ -35,10 +367,21 @@ class Graph:
         Returns
         -------
         list
-            A list of adjacent vertices.
+            A list of adjacent vertices. In set mode this is a copy, so
+            changes to it do not affect the graph. In list mode it is the
+            graph's own list, which a snapshot may share, see `snapshot`.
         """
-        return self._graph[vertex]
+        if self._shared and vertex not in self._graph:
+            # The vertex is about to be created in a map a snapshot holds.
+            self._writable()
+        return self._as_list(self._graph[vertex])
     
+    def __contains__(self, vertex) -> bool:
+        """
+        Checks whether `vertex` is a key (source vertex) of the graph.
+        """
+        return vertex in self._graph
+
     def __setitem__(self, vertex, edges):
         """
         Sets the adjacent vertices for the given `vertex`.
@@ -50,7 +393,23 @@ class Graph:
         edges : list
             A list of adjacent vertices to set for the given vertex.
         """
+        if self._batch is not None:
+            edges = list(edges)
+            return self._defer("__setitem__", (vertex, *edges), (vertex, edges))
+        # The graph keeps its own container, so the caller's list, or the
+        # one recorded by a batch, never changes along with the graph.
+        edges = list(edges) if self._adjacency == "list" else dict.fromkeys(edges)
+        if self._snapshots is not None:
+            self._writable()
+        if self._pred is not None:
+            for dst in self._graph.get(vertex, ()):
+                self._unlink(self._private(self._pred, self._owned_pred, dst), vertex)
+            for dst in edges:
+                self._link(self._private(self._pred, self._owned_pred, dst), vertex)
         self._graph[vertex] = edges
+        self._version += 1
+        if self._observers:
+            self._notify("reset", vertex)
     
     def add_edge(self, src_vertex, dst_vertex):
         """
@@ -63,9 +422,178 @@ class Graph:
         dst_vertex : any hashable type
             The destination vertex to which the edge points.
         """
-        self.add_vertex(src_vertex)
-        self.add_vertex(dst_vertex)
-        self._graph[src_vertex].append(dst_vertex)
+        if self._batch is not None:
+            return self._defer("add_edge", (src_vertex, dst_vertex), (src_vertex, dst_vertex))
+        if self._snapshots is not None:
+            self._writable()
+        if src_vertex not in self._graph:
+            self._new_vertex(src_vertex)
+        if dst_vertex not in self._graph:
+            self._new_vertex(dst_vertex)
+        if self._owned is None:
+            self._link(self._graph[src_vertex], dst_vertex)
+            if self._pred is not None:
+                self._link(self._pred[dst_vertex], src_vertex)
+        else:
+            self._link(self._private(self._graph, self._owned, src_vertex), dst_vertex)
+            if self._pred is not None:
+                self._link(self._private(self._pred, self._owned_pred, dst_vertex), src_vertex)
+        self._version += 1
+        if instrumentation._recorder is not None:
+            instrumentation._recorder.count("Graph.edges_added")
+        if self._observers:
+            self._notify("add_edge", src_vertex, dst_vertex)
+
+    def bulk_add_edges(self, edges, dedupe: bool = False):
+        """
+        Adds many directed edges at once.
+
+        Equivalent to calling `add_edge` for every pair, but without the
+        per-call overhead, which matters when loading millions of edges.
+        While the graph has observers it does call `add_edge` for every
+        pair, see `subscribe`.
+
+        Parameters
+        ----------
+        edges : iterable of tuple
+            ``(src_vertex, dst_vertex)`` pairs.
+        dedupe : bool, optional
+            If True, skip edges that are already in the graph. Set-backed
+            graphs never hold duplicates, so this only affects list mode,
+            where each check is linear in the degree of the source vertex.
+        """
+        if self._batch is not None:
+            edges = list(edges)
+            vertices = [vertex for edge in edges for vertex in edge]
+            if dedupe:
+                return self._defer("bulk_add_edges", vertices, (edges, True))
+            for vertex in vertices:
+                hash(vertex)
+            self._batch.extend(("add_edge", (src_vertex, dst_vertex)) for src_vertex, dst_vertex in edges)
+            return
+        if self._observers:
+            # Observers must see the graph as it is after each edge they are
+            # told about, so the edges are added one at a time.
+            for src_vertex, dst_vertex in edges:
+                if not (dedupe and dst_vertex in self._graph.get(src_vertex, ())):
+                    self.add_edge(src_vertex, dst_vertex)
+            return
+        recorder = instrumentation._recorder
+        if recorder is not None:
+            edges = list(edges)
+        skipped = 0
+        if self._snapshots is not None:
+            self._writable()
+        # The adjacency map is a defaultdict, so indexing creates missing sources.
+        graph, pred = self._graph, self._pred
+        if self._owned is not None:
+            # Snapshots share the adjacency containers; copy each one once.
+            new = list if self._adjacency == "list" else dict
+            link, private = self._link, self._private
+            owned, owned_pred = self._owned, self._owned_pred
+            for src_vertex, dst_vertex in edges:
+                adjacent = private(graph, owned, src_vertex)
+                if dst_vertex not in graph:
+                    graph[dst_vertex] = new()
+                    owned.add(dst_vertex)
+                if dedupe and dst_vertex in adjacent:
+                    skipped += 1
+                    continue
+                link(adjacent, dst_vertex)
+                if pred is not None:
+                    link(private(pred, owned_pred, dst_vertex), src_vertex)
+        elif self._adjacency == "list" and pred is None and not dedupe:
+            for src_vertex, dst_vertex in edges:
+                graph[src_vertex].append(dst_vertex)
+                if dst_vertex not in graph:
+                    graph[dst_vertex] = []
+        else:
+            new = list if self._adjacency == "list" else dict
+            link = self._link
+            for src_vertex, dst_vertex in edges:
+                adjacent = graph[src_vertex]
+                if dst_vertex not in graph:
+                    graph[dst_vertex] = new()
+                if dedupe and dst_vertex in adjacent:
+                    skipped += 1
+                    continue
+                link(adjacent, dst_vertex)
+                if pred is not None:
+                    link(pred[dst_vertex], src_vertex)
+        self._version += 1
+        if recorder is not None:
+            recorder.count("Graph.edges_added", len(edges) - skipped)
+
+    @classmethod
+    def from_edgelist(cls, source, dedupe: bool = False, freeze: bool = False, chunk_size: int = 65536,
+                      delimiter: str = None, comment: str = "#", skip_header: bool = False,
+                      convert=None, pause_gc: bool = False, **options):
+        """
+        Builds a graph from an edge list file or iterable.
+
+        The input is streamed in chunks of `chunk_size` edges, so parsing
+        memory is bounded by the chunk size rather than the input size.
+
+        Parameters
+        ----------
+        source : str, path-like or iterable
+            A file with one ``src dst`` pair per line, an iterable of lines,
+            or an iterable of ``(src, dst)`` pairs. See
+            `edgelist.iter_edge_chunks` for the parsing options
+            `delimiter`, `comment`, `skip_header` and `convert`.
+        dedupe : bool, optional
+            If True, repeated edges are loaded once.
+        freeze : bool, optional
+            If True, build a `CSRGraph` directly from the parsed edges
+            without creating the intermediate adjacency lists.
+        chunk_size : int, optional
+            The number of edges parsed and inserted at a time.
+        pause_gc : bool, optional
+            If True, the cyclic garbage collector is disabled while loading,
+            which saves it from rescanning every new adjacency list as the
+            graph grows. The collector is process-wide, so this also pauses
+            it for other threads until the load finishes.
+        **options
+            Passed to the `Graph` constructor, e.g. ``reverse_index=True``.
+
+        Returns
+        -------
+        Graph or CSRGraph
+            The loaded graph; a `CSRGraph` if `freeze` is True.
+
+        Raises
+        ------
+        TypeError
+            If constructor `options` are given with `freeze`, as a
+            `CSRGraph` takes none.
+
+        Examples
+        --------
+        >>> g = Graph.from_edgelist("parents.tsv", skip_header=True, reverse_index=True)
+        """
+        from .edgelist import iter_edge_chunks
+
+        if freeze and options:
+            raise TypeError(f"freeze=True does not accept Graph options: {', '.join(sorted(options))}")
+        chunks = iter_edge_chunks(source, delimiter=delimiter, comment=comment, skip_header=skip_header,
+                                  convert=convert, chunk_size=chunk_size)
+        # None of the adjacency lists can form a cycle, so pausing the
+        # collector loses nothing but the rescans.
+        collecting = pause_gc and gc.isenabled()
+        if collecting:
+            gc.disable()
+        try:
+            if freeze:
+                from ._csr import CSRGraph
+
+                return CSRGraph.from_edge_chunks(chunks, dedupe=dedupe)
+            graph = cls(**options)
+            for sources, targets in chunks:
+                graph.bulk_add_edges(zip(sources, targets), dedupe=dedupe)
+            return graph
+        finally:
+            if collecting:
+                gc.enable()
 
     def remove_edge(self, src_vertex, dst_vertex):
         """
@@ -78,8 +606,36 @@ class Graph:
         dst_vertex : any hashable type
             The destination vertex to which the edge points.
         """
+        if self._batch is not None:
+            return self._defer("remove_edge", (src_vertex, dst_vertex), (src_vertex, dst_vertex))
         if src_vertex in self._graph and dst_vertex in self._graph[src_vertex]:
-            self._graph[src_vertex].remove(dst_vertex)
+            if self._snapshots is not None:
+                self._writable()
+            self._unlink(self._private(self._graph, self._owned, src_vertex), dst_vertex)
+            if self._pred is not None:
+                self._unlink(self._private(self._pred, self._owned_pred, dst_vertex), src_vertex)
+            self._version += 1
+            if self._observers:
+                self._notify("remove_edge", src_vertex, dst_vertex)
+
+    def has_edge(self, src_vertex, dst_vertex) -> bool:
+        """
+        Checks whether the edge from `src_vertex` to `dst_vertex` exists.
+
+        Parameters
+        ----------
+        src_vertex : any hashable type
+            The source vertex from which the edge starts.
+        dst_vertex : any hashable type
+            The destination vertex to which the edge points.
+
+        Returns
+        -------
+        bool
+            True if the edge exists. O(1) in set mode, linear in the degree
+            of `src_vertex` otherwise.
+        """
+        return dst_vertex in self._graph.get(src_vertex, ())
 
     def add_vertex(self, vertex):
         """
@@ -90,9 +646,22 @@ class Graph:
         vertex : any hashable type
             The vertex to be added.
         """
+        if self._batch is not None:
+            return self._defer("add_vertex", (vertex,), (vertex,))
         if vertex not in self._graph:
-            self._graph[vertex] = []
+            self._new_vertex(vertex)
+            if self._observers:
+                self._notify("add_vertex", vertex)
 
+    def _new_vertex(self, vertex):
+        if self._snapshots is not None:
+            self._writable()
+        self._graph[vertex] = [] if self._adjacency == "list" else {}
+        if self._owned is not None:
+            self._owned.add(vertex)
+        self._version += 1
+
+    @instrumentation.timed("Graph.remove_vertex")
     def remove_vertex(self, vertex):
         """
         Remove a `vertex` from graph.
@@ -101,12 +670,77 @@ class Graph:
         ----------
         vertex : any hashable type
             The vertex to be removed.
+
+        Notes
+        -----
+        Every edge to and from the vertex is dropped, parallel edges
+        included. Without a reverse index every adjacency list is scanned;
+        with one, only the lists of the vertex's neighbours are touched. To
+        remove many vertices, remove them inside `batch`, which scans the
+        lists once.
         """
-        if vertex in self._graph:
-            del self._graph[vertex]
-            for v in self._graph:
-                if vertex in self._graph[v]:
-                    self._graph[v].remove(vertex)
+        if self._batch is not None:
+            return self._defer("remove_vertex", (vertex,), (vertex,))
+        if vertex not in self._graph:
+            return
+        if instrumentation._recorder is not None:
+            instrumentation._recorder.count("Graph.vertices_removed")
+        if self._snapshots is not None:
+            self._writable()
+        successors = self._graph.pop(vertex)
+        self._version += 1
+        if self._pred is None:
+            affected = [v for v, edges in self._graph.items() if vertex in edges]
+            for v in affected:
+                self._unlink_all(self._private(self._graph, self._owned, v), vertex)
+        else:
+            for src in set(self._pred.pop(vertex, ())):
+                if src in self._graph:
+                    self._unlink_all(self._private(self._graph, self._owned, src), vertex)
+            for dst in set(successors):
+                if dst in self._pred:
+                    self._unlink_all(self._private(self._pred, self._owned_pred, dst), vertex)
+        if self._observers:
+            self._notify("remove_vertex", vertex)
+
+    def predecessors(self, vertex) -> List:
+        """
+        Returns the vertices with an edge pointing to `vertex`.
+
+        Parameters
+        ----------
+        vertex : any hashable type
+            The vertex to get the predecessors for.
+
+        Returns
+        -------
+        list
+            A new list of source vertices, with one entry per incoming edge.
+            Without a reverse index this scans every adjacency list.
+        """
+        if self._pred is not None:
+            return list(self._pred.get(vertex, []))
+        return [src for src, edges in self._graph.items() for dst in edges if dst == vertex]
+
+    def in_degree(self, vertex) -> int:
+        """
+        Returns the number of edges pointing to `vertex`.
+
+        Parameters
+        ----------
+        vertex : any hashable type
+            The vertex to count incoming edges for.
+
+        Returns
+        -------
+        int
+            The number of incoming edges, counting parallel edges.
+        """
+        if self._pred is not None:
+            return len(self._pred.get(vertex, []))
+        if self._adjacency == "set":
+            return sum(vertex in edges for edges in self._graph.values())
+        return sum(edges.count(vertex) for edges in self._graph.values())
 
     def get(self, vertex: Any, default: Any = None) -> List:
         """
@@ -122,9 +756,12 @@ class Graph:
         Returns
         -------
         list
-            A list of adjacent vertices or the default value.
+            A list of adjacent vertices or the default value, see
+            `__getitem__`.
         """
-        return self._graph.get(vertex, default)
+        if vertex not in self._graph:
+            return default
+        return self._as_list(self._graph[vertex])
     
     def keys(self) -> List:
         """
@@ -146,7 +783,75 @@ class Graph:
         list
             A list of lists of destination vertices.
         """
-        return list(self._graph.values())
+        return [self._as_list(edges) for edges in self._graph.values()]
+
+    def freeze(self) -> 'CSRGraph':
+        """
+        Returns an immutable, array-backed copy of the graph.
+
+        Returns
+        -------
+        CSRGraph
+            A compressed sparse row copy exposing the same read API.
+            Integer labels are stored in NumPy arrays, other labels in a
+            label table.
+        """
+        from ._csr import CSRGraph
+
+        return CSRGraph.from_graph(self)
+
+    def save(self, path, fsync: bool = False):
+        """
+        Writes the graph to a binary file, see `CSRGraph.save`.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The file to write.
+        fsync : bool, optional
+            If True, the data is flushed to disk before the file replaces
+            `path`. `save` does not fsync by default, so a crash shortly
+            after it returns may lose the new file.
+        """
+        self.freeze().save(path, fsync=fsync)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> 'CSRGraph':
+        """
+        Reads a graph written by `save`.
+
+        The graph is returned frozen, so it is ready to query as soon as the
+        file is mapped; call `CSRGraph.thaw` on it to modify it.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The file to read.
+        mmap : bool, optional
+            If True, memory-map the file instead of reading it, see
+            `CSRGraph.load`.
+
+        Returns
+        -------
+        CSRGraph
+            The saved graph, with the same `keys`, `values` and
+            `all_nodes` as the graph that was saved.
+
+        Warnings
+        --------
+        Labels other than integers and strings are stored pickled, and
+        unpickling can run arbitrary code. Only load files from a trusted
+        source.
+
+        Examples
+        --------
+        >>> g.save("pedigree.graph")
+        >>> Graph.load("pedigree.graph").keys() == g.keys()
+        True
+        """
+        from ._csr import CSRGraph
+
+        return CSRGraph.load(path, mmap=mmap)
 
     def all_nodes(self):
         """Get all nodes in the graph.
@@ -170,4 +875,109 @@ class Graph:
         >>> g.all_nodes()
         {0, 1, 2, 3}
         """
-        return set(self._graph.keys()).union({edge for edges in self._graph.values() for edge in edges})
\ No newline at end of file
+        return set(self._graph.keys()).union({edge for edges in self._graph.values() for edge in edges})
+
+class GraphSnapshot(Graph):
+    """
+    An immutable state of a `Graph`, returned by `Graph.snapshot`.
+
+    It has the read API of `Graph`, including `predecessors` and
+    `ReversedGraph` when the graph keeps a reverse index, and can be passed
+    wherever a `Graph` is read. Reading a vertex that is not in the
+    snapshot does not add it. Every method that would modify the snapshot
+    raises TypeError.
+
+    Parameters
+    ----------
+    graph : Graph
+        The graph whose current containers are shared. Use
+        `Graph.snapshot` rather than this constructor, which does not tell
+        the graph to copy them before writing.
+    """
+
+    def __init__(self, graph: Graph):
+        self._adjacency = graph._adjacency
+        self._graph = graph._graph
+        self._pred = graph._pred
+        self._version = graph._version
+        self._observers = None
+        self._batch = None
+        self._init_snapshots()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("graph snapshots are read-only")
+
+    __setitem__ = add_edge = bulk_add_edges = add_vertex = remove_edge = remove_vertex = _read_only
+
+    def __getitem__(self, vertex):
+        """
+        Returns the adjacent vertices of `vertex`, or an empty list if it is
+        not in the snapshot.
+
+        In list mode the returned list is shared with the snapshot and must
+        not be modified.
+        """
+        edges = self._graph.get(vertex)
+        return [] if edges is None else self._as_list(edges)
+
+    def snapshot(self) -> 'GraphSnapshot':
+        """
+        Returns the snapshot itself, which never changes.
+        """
+        return self
+
+class ReversedGraph:
+    """
+    A read-only view of a graph with every edge reversed.
+
+    The view shares the predecessor index of the underlying graph, so it is
+    created in constant time and always reflects the current edges.
+
+    Parameters
+    ----------
+    graph : Graph
+        A graph created with ``reverse_index=True``.
+    """
+
+    def __init__(self, graph: Graph):
+        if not graph.reverse_index:
+            raise ValueError("ReversedGraph requires a graph with reverse_index=True")
+        self._base = graph
+
+    def __getitem__(self, vertex):
+        """
+        Returns the predecessors of `vertex` in the underlying graph.
+
+        In list mode the returned list is shared with the underlying graph
+        and must not be modified.
+        """
+        return self._base._as_list(self._base._pred.get(vertex, []))
+
+    def __contains__(self, vertex) -> bool:
+        return vertex in self._base._graph
+
+    def get(self, vertex: Any, default: Any = None) -> List:
+        """
+        Returns the predecessors of `vertex` or `default` if the vertex is not found.
+        """
+        if vertex not in self._base._graph:
+            return default
+        return self[vertex]
+
+    def keys(self) -> List:
+        """
+        Returns the vertices of the underlying graph.
+        """
+        return self._base.keys()
+
+    def values(self) -> List:
+        """
+        Returns the predecessor lists, in the order of `keys`.
+        """
+        return [self[vertex] for vertex in self._base._graph]
+
+    def all_nodes(self) -> Set:
+        """
+        Returns all unique nodes of the underlying graph.
+        """
+        return self._base.all_nodes()
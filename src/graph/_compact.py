@@ -0,0 +1,627 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Set
+
+import numpy as np
+
+
+def _zeros(n: int) -> array:
+    return array("i", bytes(4 * n))
+
+
+def _empty_table(size: int) -> array:
+    return array("i", [-1]) * size
+
+
+class CompactGraph:
+    """
+    A directed graph storing all edges in one integer array, for processes
+    that have to hold large graphs in little memory.
+
+    Vertex labels are mapped to dense integer ids, as in `InternedGraph`,
+    but through an open-addressing hash table of ids held in an array rather
+    than a dict, and without one array object per vertex: every vertex owns
+    a block of a single shared ``array('i')`` arena, described by its
+    offset, length and capacity in three more arrays. A block that runs out
+    of room moves to the end of the arena with twice its capacity, so
+    appending an edge is amortized constant time; the space it leaves
+    behind is reclaimed by compacting the arena once more than half of it
+    is unused. The class has ``__slots__`` and holds no per-vertex or
+    per-edge Python objects besides the labels.
+
+    The API is that of a list-backed `Graph`, except that reading an
+    unknown vertex with ``graph[vertex]`` returns an empty list without
+    adding the vertex.
+
+    Notes
+    -----
+    Every label lookup probes the table in Python, so building and reading
+    the graph is several times slower than with `Graph`: the class trades
+    speed for memory; `InternedGraph` keeps the same arena with a dict for
+    the labels. Removing a vertex drops every edge pointing to it, like
+    `Graph`. Predecessors are found by scanning the arena, which runs at C
+    speed and costs Python work only for the blocks holding a match.
+
+    Examples
+    --------
+    >>> g = CompactGraph()
+    >>> g.add_edge('A', 'B')
+    >>> g['A'], g['X'], 'X' in g
+    (['B'], [], False)
+    """
+
+    __slots__ = ("_table", "_labels", "_offset", "_length", "_capacity", "_arena", "_garbage",
+                 "_num_edges", "_is_key", "_key_order", "_key_position", "_removed_keys", "_version")
+
+    def __init__(self):
+        """
+        Initializes an empty graph.
+        """
+        self._table = _empty_table(8)
+        self._labels = []
+        self._offset = array("I")
+        self._length = array("I")
+        self._capacity = array("I")
+        self._arena = array("i")
+        self._garbage = 0
+        self._num_edges = 0
+        self._is_key = bytearray()
+        self._key_order = array("i")
+        self._key_position = array("i")
+        self._removed_keys = 0
+        self._version = 0
+
+    @property
+    def reverse_index(self) -> bool:
+        """
+        Always False; predecessors are found by scanning.
+        """
+        return False
+
+    @property
+    def version(self) -> int:
+        """
+        A counter increased by every change to the graph, see `Graph.version`.
+        """
+        return self._version
+
+    @property
+    def adjacency(self) -> str:
+        """
+        Always ``"list"``: parallel edges are kept, as in a list-backed `Graph`.
+        """
+        return "list"
+
+    def _slot(self, vertex) -> int:
+        """
+        Returns the table slot holding the id of `vertex`, or the empty slot
+        where it would go.
+        """
+        table, labels = self._table, self._labels
+        mask = len(table) - 1
+        perturb = hash(vertex) & 0xFFFFFFFFFFFFFFFF
+        i = perturb & mask
+        while True:
+            vertex_id = table[i]
+            if vertex_id < 0:
+                return i
+            label = labels[vertex_id]
+            if label is vertex or label == vertex:
+                return i
+            # The probe sequence of CPython's dict, which mixes in the high
+            # bits of the hash so that regular integer labels do not cluster.
+            perturb >>= 5
+            i = (5 * i + 1 + perturb) & mask
+
+    def _find(self, vertex) -> int:
+        return self._table[self._slot(vertex)]
+
+    def _intern(self, vertex) -> int:
+        slot = self._slot(vertex)
+        vertex_id = self._table[slot]
+        if vertex_id < 0:
+            vertex_id = self._table[slot] = self._new_id(vertex)
+            if 3 * len(self._labels) > 2 * len(self._table):
+                self._rehash(2 * len(self._table))
+        return vertex_id
+
+    def _new_id(self, vertex) -> int:
+        vertex_id = len(self._labels)
+        self._labels.append(vertex)
+        self._offset.append(0)
+        self._length.append(0)
+        self._capacity.append(0)
+        self._is_key.append(0)
+        self._key_position.append(-1)
+        return vertex_id
+
+    def _rehash(self, size: int):
+        self._table = _empty_table(size)
+        for vertex_id, vertex in enumerate(self._labels):
+            self._table[self._slot(vertex)] = vertex_id
+
+    def __getstate__(self):
+        # The table is left out because string hashes differ between
+        # processes; it is rebuilt on unpickling.
+        return {name: getattr(self, name) for name in CompactGraph.__slots__ if name != "_table"}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._index_labels()
+
+    def _index_labels(self):
+        size = 8
+        while 3 * len(self._labels) > 2 * size:
+            size *= 2
+        self._rehash(size)
+
+    def _make_key(self, vertex_id: int):
+        if not self._is_key[vertex_id]:
+            self._is_key[vertex_id] = 1
+            self._key_position[vertex_id] = len(self._key_order)
+            self._key_order.append(vertex_id)
+
+    def _unmake_key(self, vertex_id: int):
+        # The key's place in the order is overwritten rather than removed,
+        # and the order is compacted when it is next read.
+        self._is_key[vertex_id] = 0
+        self._key_order[self._key_position[vertex_id]] = -1
+        self._key_position[vertex_id] = -1
+        self._removed_keys += 1
+
+    def _keys(self) -> array:
+        # Returns the ids of the keys in insertion order.
+        if self._removed_keys:
+            order = array("i", [vertex_id for vertex_id in self._key_order if vertex_id >= 0])
+            position = self._key_position
+            for i, vertex_id in enumerate(order):
+                position[vertex_id] = i
+            self._key_order = order
+            self._removed_keys = 0
+        return self._key_order
+
+    def _key_id(self, vertex) -> int:
+        vertex_id = self._find(vertex)
+        if vertex_id >= 0 and self._is_key[vertex_id]:
+            return vertex_id
+        return -1
+
+    def _block(self, vertex_id: int) -> array:
+        offset = self._offset[vertex_id]
+        return self._arena[offset:offset + self._length[vertex_id]]
+
+    def _labels_of(self, ids: Iterable[int]) -> List:
+        return list(map(self._labels.__getitem__, ids))
+
+    def _append(self, src: int, dst: int):
+        arena = self._arena
+        offset, length, capacity = self._offset[src], self._length[src], self._capacity[src]
+        if length == capacity:
+            new_capacity = 2 * capacity or 1
+            if offset + capacity == len(arena) and capacity:
+                # The block is the last one in the arena and grows in place.
+                arena.extend(_zeros(new_capacity - capacity))
+            else:
+                new_offset = len(arena)
+                arena.extend(arena[offset:offset + length])
+                arena.extend(_zeros(new_capacity - length))
+                self._offset[src] = offset = new_offset
+                self._garbage += capacity
+            self._capacity[src] = new_capacity
+        arena[offset + length] = dst
+        self._length[src] = length + 1
+        self._num_edges += 1
+
+    def _release(self, vertex_id: int):
+        self._garbage += self._capacity[vertex_id]
+        self._num_edges -= self._length[vertex_id]
+        self._length[vertex_id] = self._capacity[vertex_id] = 0
+        if self._garbage > len(self._arena) // 2:
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrites the arena without unused space, every block at its length.
+
+        This happens on its own when more than half of the arena is unused,
+        and at the end of `bulk_add_edges`. Call it after adding many edges
+        one at a time to release the room blocks keep for growth.
+        """
+        old, arena = self._arena, array("i")
+        offsets, lengths = self._offset, self._length
+        for vertex_id in range(len(offsets)):
+            offset, length = offsets[vertex_id], lengths[vertex_id]
+            offsets[vertex_id] = len(arena)
+            arena.extend(old[offset:offset + length])
+        self._arena = arena
+        self._capacity = array("I", lengths)
+        self._garbage = 0
+
+    def __getitem__(self, vertex) -> List:
+        """
+        Returns the adjacent vertices for the given `vertex`.
+
+        Unlike `Graph`, reading an unknown vertex returns an empty list and
+        leaves the graph unchanged.
+        """
+        vertex_id = self._key_id(vertex)
+        if vertex_id < 0:
+            return []
+        return self._labels_of(self._block(vertex_id))
+
+    def __contains__(self, vertex) -> bool:
+        """
+        Checks whether `vertex` is a key (source vertex) of the graph.
+        """
+        return self._key_id(vertex) >= 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys (source vertices) of the graph.
+        """
+        return len(self._key_order) - self._removed_keys
+
+    def __setitem__(self, vertex, edges):
+        """
+        Sets the adjacent vertices for the given `vertex`.
+
+        Parameters
+        ----------
+        vertex : any hashable type
+            The vertex to set the adjacent vertices for.
+        edges : list
+            A list of adjacent vertices to set for the given vertex.
+        """
+        vertex_id = self._intern(vertex)
+        self._make_key(vertex_id)
+        ids = array("i", map(self._intern, edges))
+        self._release(vertex_id)
+        self._offset[vertex_id] = len(self._arena)
+        self._length[vertex_id] = self._capacity[vertex_id] = len(ids)
+        self._arena.extend(ids)
+        self._num_edges += len(ids)
+        self._version += 1
+
+    def add_edge(self, src_vertex, dst_vertex):
+        """
+        Adds a directed edge from `src_vertex` to `dst_vertex`.
+
+        Parameters
+        ----------
+        src_vertex : any hashable type
+            The source vertex from which the edge starts.
+        dst_vertex : any hashable type
+            The destination vertex to which the edge points.
+        """
+        src = self._intern(src_vertex)
+        dst = self._intern(dst_vertex)
+        self._make_key(src)
+        self._make_key(dst)
+        self._append(src, dst)
+        self._version += 1
+
+    def bulk_add_edges(self, edges, dedupe: bool = False):
+        """
+        Adds many directed edges at once, see `Graph.bulk_add_edges`.
+
+        Without `dedupe`, a load of at least a quarter as many edges as the
+        graph holds is merged into a new arena in one vectorized pass
+        instead of growing blocks edge by edge. Either way the arena is
+        compacted afterwards if more than a quarter of it is unused, so a
+        graph loaded in one call holds four bytes per edge.
+
+        Parameters
+        ----------
+        edges : iterable of tuple
+            ``(src_vertex, dst_vertex)`` pairs.
+        dedupe : bool, optional
+            If True, edges already in the graph are skipped.
+        """
+        intern, make_key, is_key = self._intern, self._make_key, self._is_key
+        if dedupe:
+            for src_vertex, dst_vertex in edges:
+                src = intern(src_vertex)
+                dst = intern(dst_vertex)
+                make_key(src)
+                make_key(dst)
+                if dst not in self._block(src):
+                    self._append(src, dst)
+        else:
+            sources, targets = array("i"), array("i")
+            for src_vertex, dst_vertex in edges:
+                src = intern(src_vertex)
+                dst = intern(dst_vertex)
+                if not is_key[src]:
+                    make_key(src)
+                if not is_key[dst]:
+                    make_key(dst)
+                sources.append(src)
+                targets.append(dst)
+            if 4 * len(sources) >= self._num_edges:
+                self._merge(sources, targets)
+            else:
+                for src, dst in zip(sources, targets):
+                    self._append(src, dst)
+        self._version += 1
+        if 4 * (len(self._arena) - self._num_edges) > len(self._arena):
+            self.compact()
+
+    def _merge(self, sources: array, targets: array):
+        """
+        Rewrites the arena with the edges from `sources` to `targets`
+        appended to the blocks of their sources, keeping their order.
+        """
+        lengths = np.frombuffer(self._length, dtype=np.uint32).astype(np.int64)
+        offsets = np.frombuffer(self._offset, dtype=np.uint32).astype(np.int64)
+        sources = np.frombuffer(sources, dtype=np.int32)
+        counts = np.bincount(sources, minlength=len(lengths))
+        new_lengths = lengths + counts
+        new_offsets = np.cumsum(new_lengths) - new_lengths
+        arena = np.empty(int(new_lengths.sum()), dtype=np.int32)
+
+        def runs(sizes):
+            # For every item of runs of `sizes` items, the run it is in and
+            # its position within the run.
+            run = np.repeat(np.arange(len(sizes)), sizes)
+            return run, np.arange(len(run)) - (np.cumsum(sizes) - sizes)[run]
+
+        owner, within = runs(lengths)
+        arena[new_offsets[owner] + within] = np.frombuffer(self._arena, dtype=np.int32)[offsets[owner] + within]
+        order = np.argsort(sources, kind="stable")
+        owner, within = runs(counts)
+        arena[new_offsets[owner] + lengths[owner] + within] = np.frombuffer(targets, dtype=np.int32)[order]
+
+        self._arena = array("i", arena.tobytes())
+        self._offset = array("I", new_offsets.astype(np.uint32).tobytes())
+        self._length = array("I", new_lengths.astype(np.uint32).tobytes())
+        self._capacity = array("I", self._length)
+        self._garbage = 0
+        self._num_edges += len(sources)
+
+    def remove_edge(self, src_vertex, dst_vertex):
+        """
+        Remove a directed edge from `src_vertex` to `dst_vertex`.
+
+        Parameters
+        ----------
+        src_vertex : any hashable type
+            The source vertex from which the edge starts.
+        dst_vertex : any hashable type
+            The destination vertex to which the edge points.
+        """
+        src = self._key_id(src_vertex)
+        dst = self._find(dst_vertex)
+        if src < 0 or dst < 0:
+            return
+        block = self._block(src)
+        if dst in block:
+            block.remove(dst)
+            offset = self._offset[src]
+            self._arena[offset:offset + len(block)] = block
+            self._length[src] = len(block)
+            self._num_edges -= 1
+            self._version += 1
+
+    def has_edge(self, src_vertex, dst_vertex) -> bool:
+        """
+        Checks whether the edge from `src_vertex` to `dst_vertex` exists.
+
+        Returns
+        -------
+        bool
+            True if the edge exists. Linear in the degree of `src_vertex`.
+        """
+        src = self._key_id(src_vertex)
+        dst = self._find(dst_vertex)
+        return src >= 0 and dst >= 0 and dst in self._block(src)
+
+    def add_vertex(self, vertex):
+        """
+        Add a `vertex` to graph.
+
+        Parameters
+        ----------
+        vertex : any hashable type
+            The vertex to be added.
+        """
+        vertex_id = self._intern(vertex)
+        if not self._is_key[vertex_id]:
+            self._make_key(vertex_id)
+            self._version += 1
+
+    def remove_vertex(self, vertex):
+        """
+        Remove a `vertex` from graph, with every edge to and from it.
+
+        The ids and label of the vertex are kept, so ids stay valid.
+
+        Parameters
+        ----------
+        vertex : any hashable type
+            The vertex to be removed.
+        """
+        vertex_id = self._key_id(vertex)
+        if vertex_id < 0:
+            return
+        self._unmake_key(vertex_id)
+        self._version += 1
+        self._release(vertex_id)
+        sources, _ = self._sources_of(vertex_id)
+        arena, offsets, lengths = self._arena, self._offset, self._length
+        for src in sources:
+            offset, length = offsets[src], lengths[src]
+            kept = array("i", [dst for dst in arena[offset:offset + length] if dst != vertex_id])
+            arena[offset:offset + len(kept)] = kept
+            self._num_edges -= length - len(kept)
+            lengths[src] = len(kept)
+
+    def _sources_of(self, target: int):
+        """
+        Returns the ids of the vertices with an edge to `target`, and the
+        number of such edges from each.
+
+        The arena is searched with `array.index`, and the blocks holding
+        the matches are found with one vectorized pass over the offsets, so
+        only those blocks cost Python work. Matches in unused slots belong
+        to no block and are ignored.
+        """
+        arena = self._arena
+        hits = []
+        position = -1
+        try:
+            while True:
+                position = arena.index(target, position + 1)
+                hits.append(position)
+        except ValueError:
+            pass
+        if not hits:
+            return [], []
+        # The views share the buffers of the arrays, which cannot be
+        # resized while the views exist; they are dropped on return.
+        offsets = np.frombuffer(self._offset, dtype=np.uint32).astype(np.int64)
+        ends = offsets + np.frombuffer(self._length, dtype=np.uint32)
+        hits = np.array(hits, dtype=np.int64)
+        counts = np.searchsorted(hits, ends) - np.searchsorted(hits, offsets)
+        sources = np.flatnonzero(counts)
+        return sources.tolist(), counts[sources].tolist()
+
+    def predecessors(self, vertex) -> List:
+        """
+        Returns the vertices with an edge pointing to `vertex`, one entry per
+        edge, in the order of `keys`.
+        """
+        target = self._find(vertex)
+        if target < 0:
+            return []
+        sources, counts = self._sources_of(target)
+        self._keys()
+        position = self._key_position
+        pairs = sorted(zip(sources, counts), key=lambda pair: position[pair[0]])
+        return self._labels_of(src for src, count in pairs for _ in range(count))
+
+    def in_degree(self, vertex) -> int:
+        """
+        Returns the number of edges pointing to `vertex`, counting parallel edges.
+        """
+        target = self._find(vertex)
+        if target < 0:
+            return 0
+        return sum(self._sources_of(target)[1])
+
+    def get(self, vertex: Any, default: Any = None) -> List:
+        """
+        Returns the adjacent vertices for the given `vertex` or `default` if the vertex is not found.
+        """
+        vertex_id = self._key_id(vertex)
+        if vertex_id < 0:
+            return default
+        return self._labels_of(self._block(vertex_id))
+
+    def keys(self) -> List:
+        """
+        Returns the keys (source vertices) of the graph, in insertion order.
+        """
+        return self._labels_of(self._keys())
+
+    def values(self) -> List:
+        """
+        Returns the destination vertices lists, in the order of `keys`.
+        """
+        return [self._labels_of(self._block(vertex_id)) for vertex_id in self._keys()]
+
+    def all_nodes(self) -> Set:
+        """
+        Returns a set of all unique nodes in the graph.
+        """
+        present = bytearray(self._is_key)
+        for vertex_id in self._keys():
+            for dst in self._block(vertex_id):
+                present[dst] = 1
+        labels = self._labels
+        return {labels[i] for i, flag in enumerate(present) if flag}
+
+    @property
+    def num_edges(self) -> int:
+        """
+        The number of edges, counting parallel edges.
+        """
+        return self._num_edges
+
+    def id_of(self, vertex) -> int:
+        """
+        Returns the integer id of `vertex`, or -1 if it was never added.
+        """
+        return self._find(vertex)
+
+    def label_of(self, vertex_id: int):
+        """
+        Returns the label of the vertex with id `vertex_id`.
+        """
+        return self._labels[vertex_id]
+
+    def neighbor_ids(self, vertex_id: int) -> array:
+        """
+        Returns a copy of the neighbour ids of the vertex with id `vertex_id`.
+        """
+        return self._block(vertex_id)
+
+    def is_key_id(self, vertex_id: int) -> bool:
+        """
+        Checks whether the vertex with id `vertex_id` is a key of the graph.
+        """
+        return bool(self._is_key[vertex_id])
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Reports the bytes held by the graph's containers.
+
+        Labels themselves are not counted, since they are usually shared
+        with the caller, but the references to them are.
+
+        Returns
+        -------
+        dict
+            Bytes by component: ``"table"`` (the label to id hash table),
+            ``"labels"`` (the id to label list), ``"index"``
+            (offsets, lengths, capacities, key flags and key order),
+            ``"arena"`` (the
+            edge array, allocated but unused slots included), and their
+            ``"total"``. ``"unused_slots"`` is the number of arena slots
+            not holding an edge.
+        """
+        index = sum(sys.getsizeof(part) for part in
+                    (self._offset, self._length, self._capacity, self._is_key, self._key_order,
+                     self._key_position))
+        usage = {
+            "table": sys.getsizeof(self._table),
+            "labels": sys.getsizeof(self._labels),
+            "index": index,
+            "arena": sys.getsizeof(self._arena),
+        }
+        usage["total"] = sum(usage.values())
+        usage["unused_slots"] = len(self._arena) - self.num_edges
+        return usage
+
+    def freeze(self) -> 'CSRGraph':
+        """
+        Returns an immutable, array-backed copy of the graph, see `Graph.freeze`.
+        """
+        from ._csr import CSRGraph
+
+        return CSRGraph.from_graph(self)
+
+    def save(self, path, fsync: bool = False):
+        """
+        Writes the graph to a binary file, see `CSRGraph.save`.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The file to write.
+        fsync : bool, optional
+            If True, the data is flushed to disk before the file replaces
+            `path`. `save` does not fsync by default, so a crash shortly
+            after it returns may lose the new file.
+        """
+        self.freeze().save(path, fsync=fsync)
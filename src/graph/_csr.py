@@ -0,0 +1,414 @@
+from array import array
+from typing import Any, Iterable, List, Set
+
+import numpy as np
+
+
+def _index_dtype(n: int):
+    """
+    Returns the smallest signed integer dtype able to index `n` elements.
+    """
+    return np.int32 if n < 2**31 else np.int64
+
+
+class _ObjectLabels:
+    """
+    Label table for arbitrary hashable vertex labels.
+    """
+
+    def __init__(self, labels: List):
+        self._labels = labels
+        self._ids = {label: i for i, label in enumerate(labels)}
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def id_of(self, label) -> int:
+        return self._ids.get(label, -1)
+
+    def label_of(self, vertex_id: int):
+        return self._labels[vertex_id]
+
+    def labels_of(self, ids) -> List:
+        labels = self._labels
+        return [labels[i] for i in ids.tolist()]
+
+    def tolist(self) -> List:
+        return list(self._labels)
+
+
+class _IntLabels:
+    """
+    Label table for integer vertex labels.
+
+    Labels live in an int64 array and are looked up by binary search through
+    a sorting permutation, which avoids holding a Python object and a dict
+    entry per vertex.
+    """
+
+    def __init__(self, labels: np.ndarray, order: np.ndarray = None):
+        self._labels = labels
+        if order is None:
+            order = np.argsort(labels, kind="stable").astype(_index_dtype(len(labels)))
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def id_of(self, label) -> int:
+        if type(label) is not int and not isinstance(label, np.integer):
+            return -1
+        pos = int(np.searchsorted(self._labels, label, sorter=self._order))
+        if pos < len(self._order) and self._labels[self._order[pos]] == label:
+            return int(self._order[pos])
+        return -1
+
+    def label_of(self, vertex_id: int):
+        return int(self._labels[vertex_id])
+
+    def labels_of(self, ids) -> List:
+        return self._labels[ids].tolist()
+
+    def tolist(self) -> List:
+        return self._labels.tolist()
+
+
+def _label_table(labels: List):
+    """
+    Builds the most compact label table able to represent `labels`.
+    """
+    if labels and all(type(label) is int for label in labels):
+        try:
+            return _IntLabels(np.array(labels, dtype=np.int64))
+        except OverflowError:
+            pass
+    return _ObjectLabels(labels)
+
+
+class CSRGraph:
+    """
+    An immutable directed graph in compressed sparse row (CSR) form.
+
+    Vertices are numbered ``0 .. n-1``. The neighbours of vertex ``i`` are
+    ``indices[indptr[i]:indptr[i + 1]]``, and a label table maps the
+    original vertex labels to these ids and back. The class exposes the
+    read API of `Graph` (`__getitem__`, `get`, `keys`, `values`,
+    `all_nodes`), so functions such as `dfs` and
+    `extract_genealogical_subgraph` accept it unchanged.
+
+    Instances are usually created with `Graph.freeze`.
+
+    Attributes
+    ----------
+    indptr : numpy.ndarray
+        Offsets into `indices`, of length ``n + 1``.
+    indices : numpy.ndarray
+        Concatenated neighbour ids of every vertex.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, labels, n_keys: int = None):
+        """
+        Initializes a CSR graph from its arrays.
+
+        Parameters
+        ----------
+        indptr : numpy.ndarray
+            Offsets into `indices`, of length ``len(labels) + 1``.
+        indices : numpy.ndarray
+            Concatenated neighbour ids.
+        labels : list or label table
+            The label of every vertex id.
+        n_keys : int, optional
+            How many of the first vertices are source vertices, as reported
+            by `keys`. Defaults to all of them.
+        """
+        if not isinstance(labels, (_ObjectLabels, _IntLabels)):
+            labels = _label_table(list(labels))
+        if len(indptr) != len(labels) + 1:
+            raise ValueError("indptr must have one more entry than there are vertices")
+        self.indptr = indptr
+        self.indices = indices
+        self._labels = labels
+        self._n_keys = len(labels) if n_keys is None else n_keys
+        self._transpose = None
+
+    @classmethod
+    def from_graph(cls, graph) -> 'CSRGraph':
+        """
+        Builds a CSR graph from any object with the `Graph` read API.
+
+        Vertex ids follow the order of ``graph.keys()``, followed by the
+        destination vertices that are not keys, in order of appearance.
+
+        Parameters
+        ----------
+        graph : Graph
+            The graph to convert.
+
+        Returns
+        -------
+        CSRGraph
+            The frozen copy of `graph`.
+        """
+        keys = graph.keys()
+        adjacency = [graph.get(vertex, []) for vertex in keys]
+        ids = {vertex: i for i, vertex in enumerate(keys)}
+        labels = list(keys)
+        for edges in adjacency:
+            for dst in edges:
+                if dst not in ids:
+                    ids[dst] = len(labels)
+                    labels.append(dst)
+
+        degrees = np.fromiter((len(edges) for edges in adjacency), dtype=np.int64, count=len(adjacency))
+        degrees = np.concatenate([degrees, np.zeros(len(labels) - len(keys), dtype=np.int64)])
+        num_edges = int(degrees.sum())
+        indptr = np.zeros(len(labels) + 1, dtype=_index_dtype(num_edges))
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.fromiter(
+            (ids[dst] for edges in adjacency for dst in edges),
+            dtype=_index_dtype(len(labels)),
+            count=num_edges,
+        )
+        del ids
+        return cls(indptr, indices, labels, n_keys=len(keys))
+
+    @classmethod
+    def from_edge_chunks(cls, chunks, dedupe: bool = False) -> 'CSRGraph':
+        """
+        Builds a CSR graph from chunks of edges.
+
+        Vertex ids are assigned in order of first appearance, as `add_edge`
+        would add them, and each chunk is converted to integer arrays right
+        away, so no per-edge Python objects outlive their chunk.
+
+        Parameters
+        ----------
+        chunks : iterable of tuple of list
+            ``(sources, targets)`` pairs of equally long label lists, as
+            yielded by `edgelist.iter_edge_chunks`.
+        dedupe : bool, optional
+            If True, keep only the first occurrence of every edge.
+
+        Returns
+        -------
+        CSRGraph
+            The same graph as loading the edges into a `Graph` and freezing it.
+        """
+        ids = {}
+        labels = []
+        sources, targets = [], []
+        for chunk_sources, chunk_targets in chunks:
+            pairs = array("q")
+            append = pairs.append
+            for edge in zip(chunk_sources, chunk_targets):
+                for vertex in edge:
+                    vertex_id = ids.get(vertex)
+                    if vertex_id is None:
+                        vertex_id = ids[vertex] = len(labels)
+                        labels.append(vertex)
+                    append(vertex_id)
+            pairs = np.frombuffer(pairs, dtype=np.int64)
+            sources.append(pairs[0::2])
+            targets.append(pairs[1::2])
+        del ids
+
+        n = len(labels)
+        src = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64)
+        dst = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int64)
+        if dedupe and len(src):
+            _, first = np.unique(src * n + dst, return_index=True)
+            keep = np.sort(first)
+            src, dst = src[keep], dst[keep]
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(n + 1, dtype=_index_dtype(len(src)))
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        indices = dst[order].astype(_index_dtype(n))
+        return cls(indptr, indices, labels)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, vertex) -> bool:
+        vertex_id = self._labels.id_of(vertex)
+        return 0 <= vertex_id < self._n_keys
+
+    def __getitem__(self, vertex) -> List:
+        """
+        Returns the adjacent vertices for the given `vertex`.
+
+        Unknown vertices have no neighbours; unlike `Graph`, reading them
+        does not add them to the graph.
+        """
+        vertex_id = self._labels.id_of(vertex)
+        if vertex_id < 0:
+            return []
+        return self._labels.labels_of(self.neighbor_ids(vertex_id))
+
+    def get(self, vertex: Any, default: Any = None) -> List:
+        """
+        Returns the adjacent vertices for the given `vertex` or `default` if the vertex is not found.
+        """
+        if vertex not in self:
+            return default
+        return self[vertex]
+
+    def keys(self) -> List:
+        """
+        Returns the keys (source vertices) of the graph.
+        """
+        return self._labels.tolist()[:self._n_keys]
+
+    def values(self) -> List:
+        """
+        Returns the destination vertices lists, in the order of `keys`.
+        """
+        return [self._labels.labels_of(self.neighbor_ids(i)) for i in range(self._n_keys)]
+
+    def all_nodes(self) -> Set:
+        """
+        Returns a set of all unique nodes in the graph.
+        """
+        return set(self._labels.tolist())
+
+    @property
+    def version(self) -> int:
+        """
+        Always 0, since a frozen graph never changes.
+        """
+        return 0
+
+    @property
+    def num_edges(self) -> int:
+        """
+        The number of edges, counting parallel edges.
+        """
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes held by the `indptr` and `indices` arrays.
+        """
+        return self.indptr.nbytes + self.indices.nbytes
+
+    def id_of(self, vertex) -> int:
+        """
+        Returns the integer id of `vertex`, or -1 if it is not in the graph.
+        """
+        return self._labels.id_of(vertex)
+
+    def label_of(self, vertex_id: int):
+        """
+        Returns the label of the vertex with id `vertex_id`.
+        """
+        return self._labels.label_of(vertex_id)
+
+    def labels_of(self, vertex_ids: Iterable[int]) -> List:
+        """
+        Returns the labels of several vertex ids at once.
+        """
+        return self._labels.labels_of(np.asarray(vertex_ids, dtype=np.int64))
+
+    def neighbor_ids(self, vertex_id: int) -> np.ndarray:
+        """
+        Returns the neighbour ids of the vertex with id `vertex_id`, as a view.
+        """
+        return self.indices[self.indptr[vertex_id]:self.indptr[vertex_id + 1]]
+
+    def transpose(self) -> 'CSRGraph':
+        """
+        Returns the graph with every edge reversed.
+
+        The result shares the label table of this graph, has every vertex as
+        a key, and is computed once and cached.
+        """
+        if self._transpose is None:
+            n = len(self._labels)
+            sources = np.repeat(np.arange(n, dtype=self.indices.dtype), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(n + 1, dtype=self.indptr.dtype)
+            np.cumsum(np.bincount(self.indices, minlength=n), out=indptr[1:])
+            self._transpose = CSRGraph(indptr, sources[order], self._labels)
+            self._transpose._transpose = self
+        return self._transpose
+
+    def freeze(self) -> 'CSRGraph':
+        """
+        Returns the graph itself, which is already immutable.
+        """
+        return self
+
+    def thaw(self, **options):
+        """
+        Returns a mutable `Graph` with the same keys and edges.
+
+        Parameters
+        ----------
+        **options
+            Passed to the `Graph` constructor, e.g. ``reverse_index=True``.
+        """
+        from ._base import Graph
+
+        graph = Graph(**options)
+        for vertex, edges in zip(self.keys(), self.values()):
+            graph[vertex] = edges
+        return graph
+
+    def save(self, path, fsync: bool = False):
+        """
+        Writes the graph to a binary file.
+
+        The file holds a versioned header, the `indptr` and `indices`
+        arrays and the label table, laid out so `load` can map it without
+        copying. Integer and string labels are stored natively, any other
+        hashable labels are pickled.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The file to write. An existing file is replaced atomically.
+        fsync : bool, optional
+            If True, the data is flushed to disk before the file replaces
+            `path`. By default it is left to the operating system, so a
+            crash shortly after `save` returns may lose the new file.
+        """
+        from ._storage import save
+
+        save(self, path, fsync=fsync)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> 'CSRGraph':
+        """
+        Reads a graph written by `save`.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The file to read.
+        mmap : bool, optional
+            If True, `indptr`, `indices` and integer labels are read-only
+            views of the memory-mapped file: loading copies no edge, and
+            processes loading the same file share its pages. If False, the
+            file is read into memory.
+
+        Returns
+        -------
+        CSRGraph
+            The saved graph.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a saved graph or uses an unsupported format
+            version.
+
+        Warnings
+        --------
+        Labels other than integers and strings are stored pickled, and
+        unpickling can run arbitrary code. Only load files from a trusted
+        source.
+        """
+        from ._storage import load
+
+        return load(path, mmap=mmap)
@@ -0,0 +1,122 @@
+# Level-synchronous traversal over CSR arrays.
+#
+# Instead of visiting one vertex at a time, every level expands the whole
+# frontier at once: the neighbour slices of all frontier vertices are
+# gathered into one array, already visited vertices are masked out with a
+# boolean bitmap, and the remaining unique ids become the next frontier.
+
+import numpy as np
+
+
+def gather_neighbors(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """
+    Concatenates the neighbour ids of every vertex in `frontier`.
+
+    Parameters
+    ----------
+    indptr : numpy.ndarray
+        CSR offsets.
+    indices : numpy.ndarray
+        CSR neighbour ids.
+    frontier : numpy.ndarray
+        Vertex ids whose neighbours are gathered.
+
+    Returns
+    -------
+    numpy.ndarray
+        The neighbour ids, with duplicates, in frontier order.
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return indices[:0]
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[np.arange(total, dtype=shift.dtype) + shift]
+
+
+def frontier_bfs(indptr: np.ndarray, indices: np.ndarray, sources, return_depth: bool = False, max_depth: int = None):
+    """
+    Computes the vertices reachable from `sources` one frontier at a time.
+
+    Parameters
+    ----------
+    indptr : numpy.ndarray
+        CSR offsets.
+    indices : numpy.ndarray
+        CSR neighbour ids.
+    sources : array_like of int
+        Vertex ids to start from.
+    return_depth : bool, optional
+        If True, also compute the BFS level of every vertex.
+    max_depth : int, optional
+        Stop expanding after this many levels.
+
+    Returns
+    -------
+    visited : numpy.ndarray
+        Boolean mask of the reachable vertices.
+    depth : numpy.ndarray or None
+        The level of every vertex, -1 where unreachable, if `return_depth`.
+    """
+    n = len(indptr) - 1
+    frontier = np.unique(np.asarray(sources, dtype=indices.dtype))
+    visited = np.zeros(n, dtype=bool)
+    visited[frontier] = True
+    depth = None
+    if return_depth:
+        depth = np.full(n, -1, dtype=np.int32)
+        depth[frontier] = 0
+
+    level = 0
+    while frontier.size and (max_depth is None or level < max_depth):
+        level += 1
+        neighbors = gather_neighbors(indptr, indices, frontier)
+        neighbors = neighbors[~visited[neighbors]]
+        if not neighbors.size:
+            break
+        frontier = np.unique(neighbors)
+        visited[frontier] = True
+        if depth is not None:
+            depth[frontier] = level
+    return visited, depth
+
+
+def frontier_reach_masks(indptr: np.ndarray, indices: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """
+    Computes reachability from up to 64 sources at once with bit-parallel masks.
+
+    Every vertex carries a 64-bit word whose bit ``j`` is set when the
+    vertex is reachable from ``sources[j]``. Words are OR-ed along the
+    edges of the frontier until no word changes.
+
+    Parameters
+    ----------
+    indptr : numpy.ndarray
+        CSR offsets.
+    indices : numpy.ndarray
+        CSR neighbour ids.
+    sources : numpy.ndarray
+        At most 64 distinct vertex ids.
+
+    Returns
+    -------
+    numpy.ndarray
+        The uint64 reachability word of every vertex.
+    """
+    if len(sources) > 64:
+        raise ValueError("at most 64 sources fit in one mask word")
+    masks = np.zeros(len(indptr) - 1, dtype=np.uint64)
+    masks[sources] = np.left_shift(np.uint64(1), np.arange(len(sources), dtype=np.uint64))
+    frontier = np.unique(np.asarray(sources, dtype=indices.dtype))
+    while frontier.size:
+        counts = indptr[frontier + 1] - indptr[frontier]
+        neighbors = gather_neighbors(indptr, indices, frontier)
+        if not neighbors.size:
+            break
+        incoming = np.repeat(masks[frontier], counts)
+        targets = np.unique(neighbors)
+        before = masks[targets]
+        np.bitwise_or.at(masks, neighbors, incoming)
+        frontier = targets[masks[targets] != before]
+    return masks
@@ -0,0 +1,89 @@
+import sys
+from typing import Dict, List
+
+from ._compact import CompactGraph
+
+
+class InternedGraph(CompactGraph):
+    """
+    A directed graph that maps vertex labels to dense integer ids.
+
+    Every label is hashed once, when it is first seen, and given the next
+    id. Edges are stored as ids in the shared ``array('i')`` arena of
+    `CompactGraph`, four bytes per edge with no Python object per vertex
+    or neighbour, and labels are only looked up again at the API boundary.
+    Unlike `CompactGraph`, labels are mapped to ids by a dict, so lookups
+    run at the speed of `Graph`'s. The class exposes the same API as a
+    list-backed `Graph`, so it can be used in its place, and is what
+    ``Graph(intern=True)`` returns; `searching.dfs` recognises it and
+    tracks visited vertices in a bytearray indexed by id.
+
+    Ids are never reused: a removed vertex keeps its id, so ids stay valid
+    for the lifetime of the graph.
+
+    Notes
+    -----
+    Each vertex costs a dict entry, an int object and about 20 bytes of
+    arena bookkeeping, some 80 bytes on top of its edges. On a synthetic
+    pedigree of a million edges with string labels, see
+    ``benchmarks/interned.py``, the graph holds 7% less memory than `Graph`
+    when built one `add_edge` at a time and 15% less when loaded with
+    `bulk_add_edges`, and `dfs` runs about 2.5 times faster. Adding edges
+    one at a time is about twice as slow as with `Graph`. `CompactGraph`
+    holds half as much again, but is much slower to build.
+
+    Examples
+    --------
+    >>> g = InternedGraph()
+    >>> g.add_edge('A', 'B')
+    >>> g['A'], g.id_of('B')
+    (['B'], 1)
+    """
+
+    __slots__ = ("_ids",)
+
+    def __init__(self):
+        """
+        Initializes an empty graph.
+        """
+        super().__init__()
+        self._table = None
+        self._ids = {}
+
+    def _find(self, vertex) -> int:
+        return self._ids.get(vertex, -1)
+
+    def _intern(self, vertex) -> int:
+        vertex_id = self._ids.get(vertex)
+        if vertex_id is None:
+            vertex_id = self._ids[vertex] = self._new_id(vertex)
+        return vertex_id
+
+    def _index_labels(self):
+        self._table = None
+        self._ids = {label: vertex_id for vertex_id, label in enumerate(self._labels)}
+
+    def __getitem__(self, vertex) -> List:
+        """
+        Returns the adjacent vertices for the given `vertex`.
+
+        As with `Graph`, reading an unknown vertex adds it with no edges.
+        """
+        vertex_id = self._intern(vertex)
+        if not self._is_key[vertex_id]:
+            self._make_key(vertex_id)
+            self._version += 1
+        return self._labels_of(self._block(vertex_id))
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Reports the bytes held by the graph's containers, see
+        `CompactGraph.memory_usage`.
+
+        ``"table"`` is the label to id dict, not counting the id objects
+        it holds.
+        """
+        usage = super().memory_usage()
+        usage["total"] += sys.getsizeof(self._ids) - usage["table"]
+        usage["table"] = sys.getsizeof(self._ids)
+        return usage
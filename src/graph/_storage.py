@@ -0,0 +1,165 @@
+# Binary on-disk format of a CSRGraph.
+#
+# All integers are little-endian. The file starts with a fixed header
+#
+#   magic             8 bytes   b"GRAPHCSR"
+#   format version    uint16
+#   label kind        uint8     0 = int64, 1 = utf-8 strings, 2 = pickle
+#   indptr itemsize   uint8
+#   indices itemsize  uint8
+#   padding           3 bytes
+#   vertices          uint64
+#   keys              uint64    see `CSRGraph.keys`
+#   edges             uint64
+#   label bytes       uint64    size of the label section
+#
+# followed by the `indptr` array, the `indices` array and the label section,
+# each starting at a multiple of 8 bytes so they can be mapped in place:
+#
+#   int64    the labels as int64, then their sorting permutation
+#   strings  int64 character offsets of every label into the decoded text,
+#            then the utf-8 encoded concatenation of all labels
+#   pickle   the pickled list of labels
+#
+# Loading a file with pickled labels unpickles them, which can run arbitrary
+# code: files are trusted like any other pickle.
+
+import mmap as _mmap
+import os
+import pickle
+import struct
+
+import numpy as np
+
+from ._csr import CSRGraph, _IntLabels, _ObjectLabels, _index_dtype
+
+MAGIC = b"GRAPHCSR"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHBBB3xQQQQ")
+_INT, _STR, _PICKLE = 0, 1, 2
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _little_endian(array: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+
+
+def _label_sections(labels):
+    """
+    Returns the label kind and the arrays or bytes making up the label section.
+    """
+    if isinstance(labels, _IntLabels):
+        return _INT, [_little_endian(labels._labels), _little_endian(labels._order)]
+    values = labels._labels
+    if all(type(label) is str for label in values):
+        offsets = np.zeros(len(values) + 1, dtype="<i8")
+        np.cumsum([len(label) for label in values], out=offsets[1:])
+        return _STR, [offsets, "".join(values).encode("utf-8")]
+    return _PICKLE, [pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)]
+
+
+def layout(graph: CSRGraph):
+    """
+    Returns the size of the saved form of `graph` and its ``(offset, bytes)`` parts.
+    """
+    indptr = _little_endian(graph.indptr)
+    indices = _little_endian(graph.indices)
+    kind, sections = _label_sections(graph._labels)
+    sections = [memoryview(section).cast("B") for section in sections]
+    label_nbytes = 0
+    for section in sections:
+        label_nbytes = _aligned(label_nbytes) + len(section)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, kind, indptr.itemsize, indices.itemsize,
+        len(graph), graph._n_keys, len(indices), label_nbytes,
+    )
+    parts = [(0, header)]
+    offset = len(header)
+    for section in [memoryview(indptr).cast("B"), memoryview(indices).cast("B")] + sections:
+        offset = _aligned(offset)
+        parts.append((offset, section))
+        offset += len(section)
+    return offset, parts
+
+
+def save(graph: CSRGraph, path, fsync: bool = False):
+    """
+    Writes `graph` to `path`.
+
+    The file is written next to `path` and renamed over it at the end, so
+    readers never see a partially written graph. With `fsync`, the data
+    reaches the disk before the rename.
+    """
+    _, parts = layout(graph)
+    path = os.fspath(path)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for offset, part in parts:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(part)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path, mmap: bool = True) -> CSRGraph:
+    """
+    Reads a graph written by `save`.
+
+    With `mmap`, the arrays are read-only views of the mapped file: nothing
+    is copied, and processes loading the same file share its pages. Pickled
+    labels are unpickled, so `path` must come from a trusted source.
+    """
+    with open(path, "rb") as f:
+        if mmap:
+            buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+        else:
+            buffer = f.read()
+    return from_buffer(buffer, repr(os.fspath(path)))
+
+
+def from_buffer(buffer, name: str = "buffer") -> CSRGraph:
+    """
+    Reads a graph laid out by `layout` from a buffer, without copying its arrays.
+    """
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{name} is not a saved graph")
+    magic, version, kind, indptr_size, indices_size, n, n_keys, n_edges, label_nbytes = (
+        _HEADER.unpack_from(buffer)
+    )
+    if magic != MAGIC:
+        raise ValueError(f"{name} is not a saved graph")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported graph format version {version}")
+
+    offset = _HEADER.size
+
+    def take(dtype, count):
+        nonlocal offset
+        offset = _aligned(offset)
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    indptr = take(f"<i{indptr_size}", n + 1)
+    indices = take(f"<i{indices_size}", n_edges)
+    end = _aligned(offset) + label_nbytes
+    if kind == _INT:
+        values = take("<i8", n)
+        order = take(np.dtype(_index_dtype(n)).newbyteorder("<"), n)
+        labels = _IntLabels(values, order)
+    elif kind == _STR:
+        bounds = take("<i8", n + 1).tolist()
+        text = bytes(buffer[_aligned(offset):end]).decode("utf-8")
+        labels = _ObjectLabels([text[a:b] for a, b in zip(bounds, bounds[1:])])
+    elif kind == _PICKLE:
+        labels = _ObjectLabels(pickle.loads(buffer[_aligned(offset):end]))
+    else:
+        raise ValueError(f"unknown label kind {kind}")
+    return CSRGraph(indptr, indices, labels, n_keys=n_keys)
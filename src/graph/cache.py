@@ -0,0 +1,103 @@
+from collections import OrderedDict, namedtuple
+
+from . import instrumentation
+from .utils import extract_genealogical_subgraph
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "invalidations", "maxsize", "currsize"])
+
+
+class SubgraphCache:
+    """
+    A bounded LRU cache of genealogical subgraphs of one graph.
+
+    Entries are keyed by the graph's mutation `version` and the start
+    vertex, so a subgraph computed before an edge was added or removed is
+    never returned afterwards. When the version changes, all entries are
+    dropped at the next lookup since none of them can be served again.
+
+    Parameters
+    ----------
+    graph : Graph
+        The graph to extract subgraphs from.
+    maxsize : int, optional
+        The maximum number of subgraphs kept. The least recently used one
+        is evicted when the cache is full.
+
+    Examples
+    --------
+    >>> cache = SubgraphCache(g, maxsize=1024)
+    >>> tree = cache.get('Alice')
+    >>> cache.cache_info()
+    CacheInfo(hits=0, misses=1, evictions=0, invalidations=0, maxsize=1024, currsize=1)
+    """
+
+    def __init__(self, graph, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._graph = graph
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._version = graph.version
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, start_vertex):
+        """
+        Returns the genealogical subgraph of `start_vertex`.
+
+        Parameters
+        ----------
+        start_vertex : hashable
+            The vertex the genealogical tree is built around.
+
+        Returns
+        -------
+        Graph
+            The result of ``extract_genealogical_subgraph(graph, start_vertex)``.
+            The same object is returned to every caller and must not be
+            modified.
+        """
+        version = self._graph.version
+        if version != self._version:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._version = version
+
+        key = (version, start_vertex)
+        subgraph = self._entries.get(key)
+        recorder = instrumentation._recorder
+        if subgraph is not None:
+            self._hits += 1
+            if recorder is not None:
+                recorder.count("SubgraphCache.hits")
+            self._entries.move_to_end(key)
+            return subgraph
+
+        self._misses += 1
+        if recorder is not None:
+            recorder.count("SubgraphCache.misses")
+        subgraph = extract_genealogical_subgraph(self._graph, start_vertex)
+        self._entries[key] = subgraph
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+            if recorder is not None:
+                recorder.count("SubgraphCache.evictions")
+        return subgraph
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns hit, miss, eviction and invalidation counts and the current size.
+        """
+        return CacheInfo(
+            self._hits, self._misses, self._evictions, self._invalidations, self._maxsize, len(self._entries)
+        )
+
+    def cache_clear(self):
+        """
+        Drops every entry and resets the statistics.
+        """
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = self._invalidations = 0
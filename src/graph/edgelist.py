@@ -0,0 +1,137 @@
+import os
+from itertools import islice
+from typing import Callable, Iterator, List, Tuple
+
+_DELIMITERS = {".csv": ",", ".tsv": "\t"}
+
+
+def _lines(source, encoding: str) -> Iterator:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding) as f:
+            yield from f
+    else:
+        yield from source
+
+
+def _split_lines(batch: List[str], delimiter: str, comment: str, first_line: int) -> Tuple[List, List]:
+    """
+    Splits a batch of lines into source and target labels.
+
+    Batches without comments or padding take a fast path with a single
+    split per line; anything else is parsed line by line.
+    """
+    text = "\n".join(batch)
+    padded = delimiter is not None and (" " in text or (delimiter != "\t" and "\t" in text))
+    sources, targets = [], []
+    add_source, add_target = sources.append, targets.append
+    if not padded and not (comment and comment in text):
+        try:
+            if delimiter is None:
+                for line in batch:
+                    fields = line.split()
+                    add_source(fields[0])
+                    add_target(fields[1])
+            else:
+                for line in batch:
+                    fields = line.split(delimiter)
+                    add_source(fields[0])
+                    add_target(fields[1].rstrip("\r\n"))
+            return sources, targets
+        except IndexError:
+            sources, targets = [], []
+            add_source, add_target = sources.append, targets.append
+
+    for number, row in enumerate(batch, start=first_line):
+        row = row.strip()
+        if not row or (comment and row.startswith(comment)):
+            continue
+        fields = row.split(delimiter)
+        if len(fields) < 2:
+            raise ValueError(f"line {number}: expected two columns, got {row!r}")
+        add_source(fields[0].strip())
+        add_target(fields[1].strip())
+    return sources, targets
+
+
+def _intern(labels: dict, values: List) -> List:
+    """
+    Replaces every value by the first equal object seen by `labels`.
+    """
+    labels.update({value: value for value in dict.fromkeys(values) if value not in labels})
+    return list(map(labels.__getitem__, values))
+
+
+def iter_edge_chunks(
+    source,
+    delimiter: str = None,
+    comment: str = "#",
+    skip_header: bool = False,
+    convert: Callable = None,
+    chunk_size: int = 65536,
+    encoding: str = "utf-8",
+) -> Iterator[Tuple[List, List]]:
+    """
+    Streams the edges of an edge list in chunks.
+
+    Only one chunk of parsed rows is held at a time, so memory does not
+    depend on the size of the input. Every distinct label is interned:
+    repeated labels share a single object.
+
+    Parameters
+    ----------
+    source : str, path-like or iterable
+        A path to a text file with one ``src dst`` pair per line, an
+        iterable of such lines, or an iterable of ``(src, dst)`` pairs.
+    delimiter : str, optional
+        The column separator. Defaults to ``","`` for ``.csv`` files,
+        ``"\\t"`` for ``.tsv`` files and any whitespace otherwise.
+    comment : str, optional
+        Lines starting with this prefix are skipped, as are blank lines.
+    skip_header : bool, optional
+        If True, the first line is skipped.
+    convert : callable, optional
+        Applied to every label, for example ``int``.
+    chunk_size : int, optional
+        The number of edges per chunk.
+    encoding : str, optional
+        The encoding used to read files.
+
+    Yields
+    ------
+    tuple of list
+        A ``(sources, targets)`` pair of lists holding up to `chunk_size`
+        edges in input order. Parallel lists of labels, unlike a list of
+        pairs, create no objects the garbage collector has to track.
+
+    Raises
+    ------
+    ValueError
+        If a line does not have at least two columns.
+    """
+    if delimiter is None and isinstance(source, (str, os.PathLike)):
+        delimiter = _DELIMITERS.get(os.path.splitext(os.fspath(source))[1].lower())
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    labels = {}
+    rows = _lines(source, encoding)
+    number = 1
+    if skip_header:
+        next(rows, None)
+        number = 2
+
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        if isinstance(batch[0], str):
+            sources, targets = _split_lines(batch, delimiter, comment, number)
+        else:
+            sources = [src for src, _ in batch]
+            targets = [dst for _, dst in batch]
+        number += len(batch)
+        del batch
+        if convert is not None:
+            sources, targets = list(map(convert, sources)), list(map(convert, targets))
+        if sources:
+            yield _intern(labels, sources), _intern(labels, targets)
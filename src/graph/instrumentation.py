@@ -0,0 +1,194 @@
+"""
+Opt-in counters and timings for graph operations.
+
+Instrumented operations check a single module-level variable and do
+nothing more unless a recording is active. When nothing is recorded the
+cost is one global lookup per call, plus one function call for the
+operations wrapped with `timed`; loops over vertices and edges are never
+instrumented directly.
+
+Recorded names
+--------------
+Timings (calls and seconds):
+    ``dfs``, ``shortest_path``, ``reverse``, ``extract_genealogical_subgraph``,
+    ``Graph.remove_vertex``, ``Graph.batch``
+Counters:
+    ``dfs.vertices_visited``, ``dfs.edges_scanned``,
+    ``Graph.edges_added``, ``Graph.vertices_removed``,
+    ``extract_genealogical_subgraph.vertices``,
+    ``SubgraphCache.hits``, ``SubgraphCache.misses``,
+    ``SubgraphCache.evictions``
+High-water marks:
+    ``dfs.stack``
+
+The ``dfs.*`` counters are recorded by the generic search; on a
+`CSRGraph`, `InternedGraph` or `CompactGraph` only the ``dfs`` timing is.
+
+Examples
+--------
+>>> with record() as recorder:
+...     extract_genealogical_subgraph(g, 'Alice')
+>>> recorder.counters['Graph.edges_added']
+118
+>>> pstats.Stats(recorder).sort_stats('cumulative').print_stats()
+"""
+
+import functools
+import json
+import marshal
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterator
+
+_recorder = None
+
+
+class Recorder:
+    """
+    Collects the counters, high-water marks and timings of one recording.
+
+    Attributes
+    ----------
+    counters : collections.Counter
+        Event counts by name.
+    maxima : dict
+        The largest value reported for every high-water mark.
+    timings : dict
+        ``[calls, seconds]`` for every timed operation. Time spent in
+        nested operations is included, e.g. `reverse` inside
+        `extract_genealogical_subgraph`.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.maxima = {}
+        self.timings = {}
+
+    def count(self, name: str, n: int = 1):
+        """
+        Adds `n` to the counter `name`.
+        """
+        self.counters[name] += n
+
+    def high_water(self, name: str, value: int):
+        """
+        Records `value` for the high-water mark `name` if it is the largest so far.
+        """
+        if value > self.maxima.get(name, value - 1):
+            self.maxima[name] = value
+
+    def add_time(self, name: str, seconds: float):
+        """
+        Records one call of the operation `name` that took `seconds`.
+        """
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = [1, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+
+    def reset(self):
+        """
+        Discards everything recorded so far.
+        """
+        self.counters.clear()
+        self.maxima.clear()
+        self.timings.clear()
+
+    def as_dict(self) -> Dict:
+        """
+        Returns the recording as plain dicts, ready to be serialized.
+        """
+        return {
+            "counters": dict(self.counters),
+            "maxima": dict(self.maxima),
+            "timings": {name: {"calls": calls, "seconds": seconds}
+                        for name, (calls, seconds) in self.timings.items()},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Returns the recording as a JSON string. `kwargs` are passed to `json.dumps`.
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def create_stats(self):
+        """
+        Fills `stats` in the format of `cProfile.Profile`, so that
+        ``pstats.Stats(recorder)`` works.
+
+        Every timed operation becomes one function entry named after it,
+        with its calls and its total time as both own and cumulative time.
+        """
+        self.stats = {
+            ("src/graph", 0, name): (calls, calls, seconds, seconds, {})
+            for name, (calls, seconds) in self.timings.items()
+        }
+
+    def dump_stats(self, path):
+        """
+        Writes the timings to `path` in the `cProfile` file format, readable
+        with ``pstats.Stats(path)`` and profile viewers.
+        """
+        self.create_stats()
+        with open(path, "wb") as f:
+            marshal.dump(self.stats, f)
+
+
+def active() -> Recorder:
+    """
+    Returns the recorder of the active recording, or None.
+    """
+    return _recorder
+
+
+@contextmanager
+def record(recorder: Recorder = None) -> Iterator[Recorder]:
+    """
+    Records instrumented operations for the duration of the block.
+
+    Recordings are global to the process and not thread-aware: every
+    instrumented call from any thread lands in the active recorder. A
+    nested recording takes over until its block ends.
+
+    Parameters
+    ----------
+    recorder : Recorder, optional
+        A recorder to add to, e.g. to accumulate over several blocks. By
+        default a new one is created.
+
+    Yields
+    ------
+    Recorder
+        The recorder receiving the events.
+    """
+    global _recorder
+    if recorder is None:
+        recorder = Recorder()
+    previous, _recorder = _recorder, recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorates a function so that its calls are timed under `name` while a
+    recording is active.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.add_time(name, perf_counter() - start)
+        return wrapper
+    return decorate
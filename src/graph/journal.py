@@ -0,0 +1,478 @@
+"""
+A write-ahead log keeping a `Graph` durable on disk.
+
+Every change to the graph is appended to a log as a compact binary
+record, so the cost of durability follows the rate of change rather than
+the size of the graph. Records are buffered and written in groups with a
+single ``fsync`` each. A checkpoint saves the whole graph and starts an
+empty log; on startup the latest checkpoint is loaded and the log
+replayed on top of it.
+
+A journal directory holds, for its current generation ``N``::
+
+    checkpoint-N.graph   the graph as saved by `Graph.save`
+    journal-N.log        the changes made since
+
+The log starts with a header (magic ``b"GRAPHWAL"``, a uint16 format
+version, padding to 16 bytes), followed by frames. A frame is one group
+commit: its payload length and CRC-32 as little-endian uint32, then the
+records. A frame that was cut short or does not match its checksum ends
+the log, and is dropped on the next open.
+
+A record is a uint8 opcode followed by its operands. Vertices are encoded
+as a tag byte and a value: 0 and an int64, 1 and a uint32 length and
+utf-8 text, or 2 and a uint32 length and a pickle for any other label.
+Pickles are loaded on recovery, so a journal directory must be trusted.
+
+Examples
+--------
+>>> journal = Journal.open("pedigree.journal", reverse_index=True)
+>>> graph = journal.graph
+>>> graph.add_edge('Alice', 'Bob')
+>>> journal.flush()
+"""
+import os
+import pickle
+import re
+import struct
+import time
+import zlib
+from typing import List, Tuple
+
+from ._base import Graph
+from ._storage import load, save
+
+MAGIC = b"GRAPHWAL"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sH6x")
+_FRAME = struct.Struct("<II")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_INT, _STR, _PICKLE = 0, 1, 2
+
+# The opcode of every record is the position of the `Graph` method it
+# replays in this tuple, plus one.
+_METHODS = ("add_edge", "remove_edge", "add_vertex", "remove_vertex", "__setitem__", "bulk_add_edges", "batch")
+_OPCODES = {method: opcode for opcode, method in enumerate(_METHODS, 1)}
+_EVENTS = {"add_edge": "add_edge", "remove_edge": "remove_edge", "add_vertex": "add_vertex",
+           "remove_vertex": "remove_vertex", "reset": "__setitem__", "batch": "batch"}
+
+_FILE = re.compile(r"(checkpoint|journal)-(\d+)\.(graph|log)$")
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _encode_vertex(out: bytearray, vertex):
+    if type(vertex) is int and -2**63 <= vertex < 2**63:
+        out.append(_INT)
+        out += _I64.pack(vertex)
+        return
+    if type(vertex) is str:
+        kind, data = _STR, vertex.encode("utf-8")
+    else:
+        kind, data = _PICKLE, pickle.dumps(vertex, protocol=pickle.HIGHEST_PROTOCOL)
+    out.append(kind)
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _encode(out: bytearray, method: str, args):
+    out.append(_OPCODES[method])
+    if method == "__setitem__":
+        vertex, edges = args
+        _encode_vertex(out, vertex)
+        out += _U32.pack(len(edges))
+        for dst in edges:
+            _encode_vertex(out, dst)
+    elif method == "bulk_add_edges":
+        edges, _ = args
+        out += _U32.pack(len(edges))
+        for src, dst in edges:
+            _encode_vertex(out, src)
+            _encode_vertex(out, dst)
+    elif method == "batch":
+        out += _U32.pack(len(args))
+        for operation, operation_args in args:
+            _encode(out, operation, operation_args)
+    else:
+        for vertex in args:
+            _encode_vertex(out, vertex)
+
+
+def _decode_vertex(data, pos: int):
+    kind = data[pos]
+    if kind == _INT:
+        return _I64.unpack_from(data, pos + 1)[0], pos + 9
+    size = _U32.unpack_from(data, pos + 1)[0]
+    start = pos + 5
+    raw = bytes(data[start:start + size])
+    if kind == _STR:
+        return raw.decode("utf-8"), start + size
+    return pickle.loads(raw), start + size
+
+
+def _decode(data, pos: int) -> Tuple[Tuple[str, tuple], int]:
+    method = _METHODS[data[pos] - 1]
+    pos += 1
+    if method in ("add_edge", "remove_edge"):
+        src, pos = _decode_vertex(data, pos)
+        dst, pos = _decode_vertex(data, pos)
+        return (method, (src, dst)), pos
+    if method in ("add_vertex", "remove_vertex"):
+        vertex, pos = _decode_vertex(data, pos)
+        return (method, (vertex,)), pos
+    if method == "__setitem__":
+        vertex, pos = _decode_vertex(data, pos)
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        edges = []
+        for _ in range(count):
+            dst, pos = _decode_vertex(data, pos)
+            edges.append(dst)
+        return (method, (vertex, edges)), pos
+    count = _U32.unpack_from(data, pos)[0]
+    pos += 4
+    if method == "bulk_add_edges":
+        edges = []
+        for _ in range(count):
+            src, pos = _decode_vertex(data, pos)
+            dst, pos = _decode_vertex(data, pos)
+            edges.append((src, dst))
+        return (method, (edges, True)), pos
+    operations = []
+    for _ in range(count):
+        operation, pos = _decode(data, pos)
+        operations.append(operation)
+    return (method, operations), pos
+
+
+def _read_log(path) -> Tuple[List[Tuple[str, tuple]], int]:
+    """
+    Returns the records of every complete frame of the log at `path`, and
+    the offset where the last of them ends.
+    """
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+    if len(data) < _HEADER.size:
+        return [], 0
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{os.fspath(path)!r} is not a graph journal")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported journal format version {version}")
+
+    records = []
+    end = pos = _HEADER.size
+    while pos + _FRAME.size <= len(data):
+        size, checksum = _FRAME.unpack_from(data, pos)
+        start = pos + _FRAME.size
+        payload = data[start:start + size]
+        if len(payload) < size or zlib.crc32(payload) != checksum:
+            break
+        offset = 0
+        while offset < size:
+            record, offset = _decode(payload, offset)
+            records.append(record)
+        end = pos = start + size
+    return records, end
+
+
+def _replay(graph: Graph, records):
+    # A batch leaves the graph exactly as the changes applied one at a time
+    # would, and applies them much faster.
+    with graph.batch():
+        for method, args in records:
+            if method == "batch":
+                for operation, operation_args in args:
+                    getattr(graph, operation)(*operation_args)
+            else:
+                getattr(graph, method)(*args)
+
+
+def _sync_directory(directory):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class Journal:
+    """
+    Appends every change of a `Graph` to a write-ahead log.
+
+    The journal subscribes to the graph, see `Graph.subscribe`, and
+    encodes each change as it happens. Records are buffered and written
+    as one frame with a single ``fsync`` when `max_pending` of them are
+    waiting, when a change comes more than `max_delay` seconds after the
+    oldest waiting one, and on `flush`, `checkpoint` and `close`. A crash
+    loses at most the records not yet flushed; call `flush` before
+    reporting a change as saved. A `Graph.batch` is written as one record,
+    so it is recovered entirely or not at all.
+
+    Use `Journal.open` to create or recover a journal rather than this
+    constructor.
+
+    Parameters
+    ----------
+    graph : Graph
+        The graph whose changes are logged.
+    directory : str or path-like
+        The journal directory.
+    generation : int
+        The generation of the checkpoint `graph` was loaded from.
+    max_pending : int, optional
+        The number of buffered records that triggers a write.
+    max_delay : float, optional
+        The age in seconds of the oldest buffered record that triggers a
+        write on the next change.
+    max_log_size : int, optional
+        Take a checkpoint once the log grows past this many bytes, on the
+        next change or on `flush` or `close`. Never by default.
+
+    Notes
+    -----
+    The graph holds its observers by weak reference: keep a reference to
+    the journal for as long as the graph is changed, or changes stop being
+    logged. Vertices created by reading ``graph[vertex]`` are not logged;
+    use `Graph.add_vertex`. The graph must be reopened with the same
+    ``adjacency`` option, which decides whether parallel edges are kept.
+
+    Warnings
+    --------
+    Labels other than integers and strings are pickled, in the log and in
+    checkpoints, and recovering a journal unpickles them. Unpickling can
+    run arbitrary code: anyone able to write to the journal directory can
+    run code in the process that opens it. Only open directories that are
+    as trusted as the code itself.
+    """
+
+    def __init__(self, graph: Graph, directory, generation: int, max_pending: int = 1024,
+                 max_delay: float = 0.05, max_log_size: int = None):
+        self._graph = graph
+        self._directory = os.fspath(directory)
+        self._generation = generation
+        self._max_pending = max_pending
+        self._max_delay = max_delay
+        self._max_log_size = max_log_size
+        self._buffer = bytearray()
+        self._pending = 0
+        self._oldest = 0.0
+        self._checkpoint_due = False
+        self._log = open(self._path("journal", generation), "ab")
+        self._log_size = self._log.seek(0, os.SEEK_END)
+        graph.subscribe(self)
+
+    @classmethod
+    def open(cls, directory, graph: Graph = None, max_pending: int = 1024, max_delay: float = 0.05,
+             max_log_size: int = None, **options) -> 'Journal':
+        """
+        Recovers the graph kept in `directory`, or starts journaling one there.
+
+        If the directory holds a checkpoint, the latest one is loaded and
+        its log replayed; an incomplete frame at the end of the log is cut
+        off. Otherwise the directory is created if needed and `graph`, or
+        a new empty graph, is saved as the first checkpoint.
+
+        Parameters
+        ----------
+        directory : str or path-like
+            The journal directory.
+        graph : Graph, optional
+            The graph to start from when the directory is new.
+        max_pending, max_delay, max_log_size
+            See `Journal`.
+        **options
+            Passed to the `Graph` constructor of the recovered or new
+            graph, e.g. ``reverse_index=True``.
+
+        Returns
+        -------
+        Journal
+            The journal, with the graph in its `graph` attribute.
+
+        Raises
+        ------
+        ValueError
+            If `graph` is given but the directory already holds a graph,
+            or if the log is not a journal this version can read.
+
+        Warnings
+        --------
+        Recovery unpickles every label that is not an integer or a string,
+        which can run arbitrary code. Only open trusted directories; see
+        `Journal`.
+        """
+        directory = os.fspath(directory)
+        os.makedirs(directory, exist_ok=True)
+        generations = sorted(int(match.group(2)) for match in map(_FILE.match, os.listdir(directory))
+                             if match and match.group(1) == "checkpoint")
+        if not generations:
+            if graph is None:
+                graph = Graph(**options)
+            journal = cls._create(graph, directory, 1, max_pending, max_delay, max_log_size)
+            journal._remove_stale()
+            return journal
+        if graph is not None:
+            raise ValueError(f"{directory!r} already holds a graph")
+
+        generation = generations[-1]
+        journal_path = os.path.join(directory, f"journal-{generation}.log")
+        graph = load(os.path.join(directory, f"checkpoint-{generation}.graph"), mmap=False).thaw(**options)
+        if os.path.exists(journal_path):
+            records, end = _read_log(journal_path)
+            _replay(graph, records)
+        else:
+            end = 0
+        if end < _HEADER.size:
+            # The checkpoint was saved but its log was never written.
+            cls._new_log(journal_path)
+            _sync_directory(directory)
+        else:
+            with open(journal_path, "r+b") as f:
+                f.truncate(end)
+                os.fsync(f.fileno())
+        journal = cls(graph, directory, generation, max_pending, max_delay, max_log_size)
+        journal._remove_stale()
+        return journal
+
+    @classmethod
+    def _create(cls, graph: Graph, directory: str, generation: int, max_pending, max_delay,
+                max_log_size) -> 'Journal':
+        save(graph.freeze(), os.path.join(directory, f"checkpoint-{generation}.graph"), fsync=True)
+        cls._new_log(os.path.join(directory, f"journal-{generation}.log"))
+        _sync_directory(directory)
+        return cls(graph, directory, generation, max_pending, max_delay, max_log_size)
+
+    @staticmethod
+    def _new_log(path):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+            os.fsync(f.fileno())
+
+    def _path(self, kind: str, generation: int) -> str:
+        extension = "graph" if kind == "checkpoint" else "log"
+        return os.path.join(self._directory, f"{kind}-{generation}.{extension}")
+
+    def _remove_stale(self):
+        for name in os.listdir(self._directory):
+            match = _FILE.match(name)
+            if (match and int(match.group(2)) < self._generation) or name.endswith(".graph.tmp"):
+                os.remove(os.path.join(self._directory, name))
+
+    @property
+    def graph(self) -> Graph:
+        """
+        The journaled graph.
+        """
+        return self._graph
+
+    @property
+    def generation(self) -> int:
+        """
+        The number of the current checkpoint, incremented by `checkpoint`.
+        """
+        return self._generation
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of records buffered and not yet written.
+        """
+        return self._pending
+
+    @property
+    def log_size(self) -> int:
+        """
+        The size in bytes of the log written since the last checkpoint.
+        """
+        return self._log_size
+
+    def graph_changed(self, event: str, src_vertex, dst_vertex):
+        """
+        Records one change of the graph, see `Graph.subscribe`.
+        """
+        if self._checkpoint_due:
+            # The graph already holds this change, so the checkpoint covers
+            # it and it is not logged.
+            self.checkpoint()
+            return
+        method = _EVENTS[event]
+        if method == "__setitem__":
+            args = (src_vertex, self._graph.get(src_vertex, []))
+        elif method == "batch":
+            args = src_vertex
+        elif method in ("add_vertex", "remove_vertex"):
+            args = (src_vertex,)
+        else:
+            args = (src_vertex, dst_vertex)
+        now = time.monotonic()
+        if not self._pending:
+            self._oldest = now
+        _encode(self._buffer, method, args)
+        self._pending += 1
+        if self._pending >= self._max_pending or now - self._oldest >= self._max_delay:
+            # A checkpoint taken here could run while the graph is still
+            # sending events for one change, so it waits for the next one.
+            self._write()
+            self._checkpoint_due = self._log_too_large()
+
+    def flush(self):
+        """
+        Writes the buffered records as one frame and waits until they are
+        on disk, then takes a checkpoint if the log has grown past
+        `max_log_size`.
+        """
+        self._write()
+        if self._log_too_large():
+            self.checkpoint()
+
+    def _log_too_large(self) -> bool:
+        return self._max_log_size is not None and self._log_size > self._max_log_size
+
+    def _write(self):
+        if self._pending:
+            payload = self._buffer
+            self._log.write(_FRAME.pack(len(payload), zlib.crc32(payload)))
+            self._log.write(payload)
+            self._log.flush()
+            _fdatasync(self._log.fileno())
+            self._log_size += _FRAME.size + len(payload)
+            self._buffer = bytearray()
+            self._pending = 0
+
+    def checkpoint(self):
+        """
+        Saves the whole graph and starts an empty log.
+
+        The new checkpoint and log are durable before the old ones are
+        removed, so a crash at any point recovers either generation.
+        """
+        self._write()
+        generation = self._generation + 1
+        save(self._graph.freeze(), self._path("checkpoint", generation), fsync=True)
+        self._new_log(self._path("journal", generation))
+        _sync_directory(self._directory)
+        self._log.close()
+        self._generation = generation
+        self._log = open(self._path("journal", generation), "ab")
+        self._log_size = self._log.seek(0, os.SEEK_END)
+        self._checkpoint_due = False
+        self._remove_stale()
+
+    def close(self):
+        """
+        Flushes the buffered records and stops logging changes.
+        """
+        if self._log.closed:
+            return
+        self.flush()
+        self._graph.unsubscribe(self)
+        self._log.close()
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
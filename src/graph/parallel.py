@@ -0,0 +1,175 @@
+"""
+Per-vertex batch jobs on a process pool.
+
+The graph is frozen once and copied into a `multiprocessing.shared_memory`
+block in the binary layout of `CSRGraph.save`. Every worker maps that block
+when it starts, so the edges are neither pickled per task nor copied per
+worker: tasks carry only a chunk of start vertices, and only the results
+travel back.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import chain, islice
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from . import _storage
+from ._csr import CSRGraph
+from .searching import dfs
+from .utils import extract_genealogical_subgraph
+
+_worker_graph = None
+_worker_func = None
+_worker_memory = None
+
+
+def _init_worker(name: str, func: Callable):
+    global _worker_graph, _worker_func, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_graph = _storage.from_buffer(_worker_memory.buf, f"shared memory block {name!r}")
+    _worker_func = func
+
+
+def _run_chunk(vertices: List) -> List:
+    return [_worker_func(_worker_graph, vertex) for vertex in vertices]
+
+
+def _share(graph: CSRGraph) -> shared_memory.SharedMemory:
+    size, parts = _storage.layout(graph)
+    memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for offset, part in parts:
+        memory.buf[offset:offset + len(part)] = part
+    return memory
+
+
+def map_vertices(func: Callable, graph, vertices: Iterable, workers: int = None, chunk_size: int = 64,
+                 ordered: bool = True, mp_context=None) -> Iterator[Tuple[Any, Any]]:
+    """
+    Applies ``func(graph, vertex)`` to many vertices on a pool of processes.
+
+    Parameters
+    ----------
+    func : callable
+        A picklable function, e.g. defined at module level or a
+        `functools.partial` of one, taking the frozen graph and a vertex.
+        It is sent to each worker once.
+    graph : Graph or CSRGraph
+        The graph to share with the workers. A `Graph` is frozen first.
+    vertices : iterable
+        The vertices to process. They are read lazily, as tasks are
+        submitted.
+    workers : int, optional
+        The number of processes. Defaults to the number of CPUs.
+    chunk_size : int, optional
+        How many vertices each task processes. Larger chunks lower the
+        per-task overhead, smaller ones balance uneven work better.
+    ordered : bool, optional
+        If True, results are yielded in the order of `vertices`. Otherwise
+        each chunk is yielded as soon as it completes.
+    mp_context : multiprocessing context, optional
+        Passed to `concurrent.futures.ProcessPoolExecutor`.
+
+    Yields
+    ------
+    tuple
+        ``(vertex, func(graph, vertex))`` pairs.
+
+    Notes
+    -----
+    At most two tasks per worker are submitted ahead of the results being
+    consumed, so a slow consumer holds back the pool instead of letting
+    finished results pile up in memory. The shared memory block is released
+    once the iteration finishes or the generator is closed.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    vertices = iter(vertices)
+    chunks = iter(lambda: list(islice(vertices, chunk_size)), [])
+    return _map_chunks(func, graph.freeze(), chunks, workers, ordered, mp_context)
+
+
+def _map_chunks(func, graph, chunks, workers, ordered, mp_context):
+    first = next(chunks, None)
+    if first is None:
+        return
+    workers = workers or os.cpu_count()
+    memory = _share(graph)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(memory.name, func),
+        ) as pool:
+            # Futures in submission order, so the oldest comes first.
+            in_flight = {}
+            for chunk in chain([first], islice(chunks, 2 * workers - 1)):
+                in_flight[pool.submit(_run_chunk, chunk)] = chunk
+            while in_flight:
+                if ordered:
+                    done = [next(iter(in_flight))]
+                else:
+                    done = wait(in_flight, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    for waiting in islice(chunks, 1):
+                        in_flight[pool.submit(_run_chunk, waiting)] = waiting
+                    yield from zip(chunk, future.result())
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def map_subgraphs(graph, vertices: Iterable, depth: int = None, **options) -> Iterator[Tuple[Any, Any]]:
+    """
+    Runs `extract_genealogical_subgraph` for many start vertices in parallel.
+
+    Parameters
+    ----------
+    graph : Graph or CSRGraph
+        The original graph.
+    vertices : iterable
+        The start vertices.
+    depth : int, optional
+        Passed to `extract_genealogical_subgraph`.
+    **options
+        Passed to `map_vertices`, e.g. ``workers`` or ``ordered``.
+
+    Yields
+    ------
+    tuple
+        ``(vertex, subgraph)`` pairs.
+
+    Examples
+    --------
+    >>> for vertex, subgraph in map_subgraphs(g, g.keys(), workers=8):
+    ...     store(vertex, subgraph)
+    """
+    return map_vertices(partial(_subgraph, depth=depth), graph, vertices, **options)
+
+
+def map_descendants(graph, vertices: Iterable, **options) -> Iterator[Tuple[Any, Any]]:
+    """
+    Runs `dfs` for many start vertices in parallel.
+
+    Parameters
+    ----------
+    graph : Graph or CSRGraph
+        The graph to search.
+    vertices : iterable
+        The start vertices.
+    **options
+        Passed to `map_vertices`, e.g. ``workers`` or ``ordered``.
+
+    Yields
+    ------
+    tuple
+        ``(vertex, discovered)`` pairs, with the set `dfs` returns.
+    """
+    return map_vertices(dfs, graph, vertices, **options)
+
+
+def _subgraph(graph, vertex, depth=None):
+    return extract_genealogical_subgraph(graph, vertex, depth)
@@ -14,9 +14,18 @@
 #         else
 #             S.pop()
 
-from typing import Dict, List, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
 from collections import deque
 
+import numpy as np
+
+from . import instrumentation
+from ._base import Graph, ReversedGraph
+from ._compact import CompactGraph
+from ._csr import CSRGraph
+from ._frontier import frontier_bfs, frontier_reach_masks
+
+@instrumentation.timed("dfs")
 def dfs(G: Dict[str, List[str]], start_vertex: str) -> Set[str]:
     """
     Perform an iterative depth-first search (DFS) on a graph.
@@ -38,10 +47,25 @@ def dfs(G: Dict[str, List[str]], start_vertex: str) -> Set[str]:
     >>> G = {'A': ['B', 'C'], 'B': ['D', 'E'], 'C': ['F'], 'D': [], 'E': ['F'], 'F': []}
     >>> dfs(G, 'A')
     {'A', 'B', 'C', 'D', 'E', 'F'}
+
+    Notes
+    -----
+    When `G` is a `CSRGraph` the search is delegated to `bfs_reachable`,
+    which visits the same vertices level by level with NumPy. When `G` is
+    an `InternedGraph` or a `CompactGraph` the search runs on integer ids
+    with a bytearray of visited flags, and labels are looked up only for
+    the result.
     """
 
-    if start_vertex not in G.keys():
+    if isinstance(G, CSRGraph):
+        return bfs_reachable(G, start_vertex)
+    if isinstance(G, CompactGraph):
+        return _dfs_compact(G, start_vertex)
+
+    if start_vertex not in G:
         return set()
+    if instrumentation._recorder is not None:
+        return _dfs_recorded(G, start_vertex, instrumentation._recorder)
 
     S = deque()
     discovered = set()
@@ -61,3 +85,647 @@ def dfs(G: Dict[str, List[str]], start_vertex: str) -> Set[str]:
             S.pop()
     return discovered
 
+
+def _dfs_recorded(G, start_vertex, recorder) -> Set:
+    # The loop of `dfs`, counting as it goes; kept apart so that the plain
+    # search pays nothing for instrumentation.
+    S = deque()
+    discovered = {start_vertex}
+    S.append(iter(G[start_vertex]))
+    scanned = 0
+    peak = 1
+    while S:
+        try:
+            w = next(S[-1])
+            scanned += 1
+            if w not in discovered:
+                discovered.add(w)
+                S.append(iter(G[w]))
+                if len(S) > peak:
+                    peak = len(S)
+        except StopIteration:
+            S.pop()
+    recorder.count("dfs.vertices_visited", len(discovered))
+    recorder.count("dfs.edges_scanned", scanned)
+    recorder.high_water("dfs.stack", peak)
+    return discovered
+
+
+def _dfs_compact(G: CompactGraph, start_vertex) -> Set:
+    start = G.id_of(start_vertex)
+    if start < 0 or not G.is_key_id(start):
+        return set()
+    arena, offsets, lengths = G._arena, G._offset, G._length
+    visited = bytearray(len(offsets))
+    visited[start] = 1
+    found = [start]
+    stack = [start]
+    while stack:
+        vertex_id = stack.pop()
+        offset = offsets[vertex_id]
+        for w in arena[offset:offset + lengths[vertex_id]]:
+            if not visited[w]:
+                visited[w] = 1
+                found.append(w)
+                stack.append(w)
+    return set(G._labels_of(found))
+
+
+def iter_dfs(G: Dict[str, List[str]], start_vertex, max_depth: int = None, max_nodes: int = None,
+             until: Callable[[Any], bool] = None, edges: bool = False) -> Iterator:
+    """
+    Lazily walk a graph depth-first, yielding vertices as they are discovered.
+
+    Unlike `dfs`, nothing beyond the current search path and the visited set
+    is built up front, and the search stops as soon as the caller stops
+    iterating, so finding a first match costs O(answer) rather than
+    O(component).
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+    start_vertex : hashable
+        The starting vertex, always yielded first.
+    max_depth : int, optional
+        Do not expand vertices this many edges away from `start_vertex`.
+        Depths are measured along the search tree, which for a depth-first
+        search is not always the shortest path; see `iter_bfs`.
+    max_nodes : int, optional
+        Stop after yielding this many vertices.
+    until : callable, optional
+        Stop right after yielding the first vertex for which ``until(vertex)``
+        is true.
+    edges : bool, optional
+        If True, yield ``(parent, child, depth)`` discovery events instead of
+        vertices. The event of `start_vertex` is ``(None, start_vertex, 0)``.
+
+    Yields
+    ------
+    vertex or tuple
+        The discovered vertices in pre-order, or their discovery events.
+
+    Examples
+    --------
+    >>> G = {'A': ['B', 'C'], 'B': ['D'], 'C': [], 'D': []}
+    >>> list(iter_dfs(G, 'A'))
+    ['A', 'B', 'D', 'C']
+    >>> list(iter_dfs(G, 'A', edges=True, max_depth=1))
+    [(None, 'A', 0), ('A', 'B', 1), ('A', 'C', 1)]
+    """
+    if max_depth is not None and max_depth < 0:
+        raise ValueError("max_depth must be non-negative")
+    if start_vertex not in G:
+        return iter(())
+    return _limit(_dfs_events(G, start_vertex, max_depth), max_nodes, until, edges)
+
+
+def iter_bfs(G: Dict[str, List[str]], start_vertex, max_depth: int = None, max_nodes: int = None,
+             until: Callable[[Any], bool] = None, edges: bool = False) -> Iterator:
+    """
+    Lazily walk a graph breadth-first, yielding vertices as they are discovered.
+
+    Vertices come out level by level, so the first vertex matching a
+    condition is also one of the closest, and the reported depth is the
+    length of the shortest path from `start_vertex`. Only the current and
+    next levels are held besides the visited set.
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+    start_vertex : hashable
+        The starting vertex, always yielded first.
+    max_depth : int, optional
+        Do not expand vertices this many edges away from `start_vertex`.
+    max_nodes : int, optional
+        Stop after yielding this many vertices.
+    until : callable, optional
+        Stop right after yielding the first vertex for which ``until(vertex)``
+        is true.
+    edges : bool, optional
+        If True, yield ``(parent, child, depth)`` discovery events instead of
+        vertices. The event of `start_vertex` is ``(None, start_vertex, 0)``.
+
+    Yields
+    ------
+    vertex or tuple
+        The discovered vertices in breadth-first order, or their discovery
+        events.
+
+    Examples
+    --------
+    Find the closest ancestor born before 1900 without walking the whole
+    pedigree:
+
+    >>> parents = reverse(pedigree)
+    >>> next((v for v in iter_bfs(parents, 'Alice') if born[v] < 1900), None)
+    """
+    if max_depth is not None and max_depth < 0:
+        raise ValueError("max_depth must be non-negative")
+    if start_vertex not in G:
+        return iter(())
+    return _limit(_bfs_events(G, start_vertex, max_depth), max_nodes, until, edges)
+
+
+def _dfs_events(G, start_vertex, max_depth):
+    discovered = {start_vertex}
+    yield None, start_vertex, 0
+    if max_depth == 0:
+        return
+    stack = [(start_vertex, iter(G.get(start_vertex, ())), 1)]
+    while stack:
+        parent, neighbors, depth = stack[-1]
+        for w in neighbors:
+            if w not in discovered:
+                discovered.add(w)
+                yield parent, w, depth
+                if max_depth is None or depth < max_depth:
+                    stack.append((w, iter(G.get(w, ())), depth + 1))
+                break
+        else:
+            stack.pop()
+
+
+def _bfs_events(G, start_vertex, max_depth):
+    discovered = {start_vertex}
+    yield None, start_vertex, 0
+    frontier = [start_vertex]
+    depth = 0
+    while frontier and (max_depth is None or depth < max_depth):
+        depth += 1
+        level = []
+        for parent in frontier:
+            for w in G.get(parent, ()):
+                if w not in discovered:
+                    discovered.add(w)
+                    level.append(w)
+                    yield parent, w, depth
+        frontier = level
+
+
+def _limit(events, max_nodes, until, edges):
+    if max_nodes is not None and max_nodes <= 0:
+        return
+    count = 0
+    for event in events:
+        yield event if edges else event[1]
+        count += 1
+        if count == max_nodes or (until is not None and until(event[1])):
+            return
+
+
+def bfs_reachable(G: CSRGraph, start_vertex, return_depth: bool = False, max_depth: int = None):
+    """
+    Find the vertices reachable from a vertex with a vectorized breadth-first search.
+
+    Each level expands the whole frontier at once by gathering the neighbour
+    slices of the CSR arrays and masking them against a visited bitmap, so
+    the per-vertex work happens in NumPy rather than in Python.
+
+    Parameters
+    ----------
+    G : CSRGraph
+        The frozen graph to search.
+    start_vertex : hashable
+        The starting vertex for the search.
+    return_depth : bool, optional
+        If True, also return the BFS level of every vertex.
+    max_depth : int, optional
+        Only follow paths of at most this many edges.
+
+    Returns
+    -------
+    discovered : set
+        The vertices reachable from `start_vertex`, the same set `dfs` returns.
+    depth : numpy.ndarray
+        Only if `return_depth` is True. The level of every vertex, indexed by
+        vertex id (see `CSRGraph.id_of`), with -1 for unreachable vertices.
+
+    Examples
+    --------
+    >>> G = Graph()
+    >>> G.add_edge('A', 'B')
+    >>> G.add_edge('B', 'C')
+    >>> bfs_reachable(G.freeze(), 'A')
+    {'A', 'B', 'C'}
+    """
+    if start_vertex not in G:
+        discovered = set()
+        if return_depth:
+            return discovered, np.full(len(G), -1, dtype=np.int32)
+        return discovered
+
+    visited, depth = frontier_bfs(G.indptr, G.indices, [G.id_of(start_vertex)], return_depth, max_depth)
+    discovered = set(G.labels_of(np.flatnonzero(visited)))
+    if return_depth:
+        return discovered, depth
+    return discovered
+
+
+def dfs_many(G: Dict[str, List[str]], sources: Iterable, batch_size: int = 4096) -> Dict[Any, Set]:
+    """
+    Find the vertices reachable from many start vertices in a shared pass.
+
+    Instead of one search per source, every vertex carries a bitmask with
+    one bit per source, and masks are propagated along the edges until they
+    stop changing. A subtree shared by many sources is therefore walked
+    once per batch rather than once per source.
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+    sources : iterable
+        The starting vertices.
+    batch_size : int, optional
+        How many sources share one pass. Larger batches share more work
+        but hold wider masks per vertex. A `CSRGraph` is always processed
+        in batches of 64 sources, one machine word per vertex.
+
+    Returns
+    -------
+    dict
+        Maps every source to the set that ``dfs(G, source)`` returns.
+
+    Examples
+    --------
+    >>> G = {'A': ['C'], 'B': ['C'], 'C': ['D'], 'D': []}
+    >>> dfs_many(G, ['A', 'B'])
+    {'A': {'A', 'C', 'D'}, 'B': {'B', 'C', 'D'}}
+    """
+    sources = list(dict.fromkeys(sources))
+    result = {source: set() for source in sources}
+    roots = [source for source in sources if source in G]
+
+    if isinstance(G, CSRGraph):
+        batch_size = 64
+    for offset in range(0, len(roots), batch_size):
+        batch = roots[offset:offset + batch_size]
+        if isinstance(G, CSRGraph):
+            _reach_csr_batch(G, batch, result)
+        else:
+            _reach_batch(G, batch, result)
+    return result
+
+
+def _reach_batch(G, batch: List, result: Dict[Any, Set]):
+    # Python integers serve as arbitrarily wide bitsets.
+    reach = {}
+    for bit, source in enumerate(batch):
+        reach[source] = 1 << bit
+    queue = deque(batch)
+    queued = set(batch)
+    while queue:
+        u = queue.popleft()
+        queued.discard(u)
+        mask = reach[u]
+        for w in G[u]:
+            old = reach.get(w, 0)
+            new = old | mask
+            if new != old:
+                reach[w] = new
+                if w not in queued:
+                    queued.add(w)
+                    queue.append(w)
+
+    for vertex, mask in reach.items():
+        while mask:
+            low = mask & -mask
+            result[batch[low.bit_length() - 1]].add(vertex)
+            mask ^= low
+
+
+def _reach_csr_batch(G: CSRGraph, batch: List, result: Dict[Any, Set]):
+    ids = np.array([G.id_of(source) for source in batch], dtype=np.int64)
+    masks = frontier_reach_masks(G.indptr, G.indices, ids)
+    reached = np.flatnonzero(masks)
+    bits = np.unpackbits(masks[reached].astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    for bit, source in enumerate(batch):
+        result[source].update(G.labels_of(reached[bits[:, bit].astype(bool)]))
+
+
+@instrumentation.timed("shortest_path")
+def shortest_path(G: Dict[str, List[str]], src_vertex, dst_vertex, directed: bool = True,
+                  max_hops: int = None) -> List:
+    """
+    Find a shortest path between two vertices by bidirectional breadth-first search.
+
+    One search starts from `src_vertex` along the edges and one from
+    `dst_vertex` against them, and the smaller frontier is expanded by one
+    level at a time until the two meet. With branching factor ``b`` and a
+    path of length ``d``, this explores about ``2 * b ** (d / 2)`` vertices
+    instead of the ``b ** d`` of a search from one end.
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+    src_vertex : hashable
+        The first vertex of the path.
+    dst_vertex : hashable
+        The last vertex of the path.
+    directed : bool, optional
+        If True, the path follows the direction of the edges. If False,
+        edges can be walked both ways, e.g. to connect two cousins through
+        their grandparents.
+    max_hops : int, optional
+        The maximum number of edges of the path. The search stops once no
+        path within this budget can exist.
+
+    Returns
+    -------
+    list or None
+        The vertices of a shortest path, from `src_vertex` to `dst_vertex`
+        inclusive, or None if there is no path within `max_hops`.
+
+    Examples
+    --------
+    >>> G = {'Grandma': ['Mom', 'Uncle'], 'Mom': ['Alice'], 'Uncle': ['Cousin']}
+    >>> shortest_path(G, 'Grandma', 'Cousin')
+    ['Grandma', 'Uncle', 'Cousin']
+    >>> shortest_path(G, 'Alice', 'Cousin', directed=False)
+    ['Alice', 'Mom', 'Grandma', 'Uncle', 'Cousin']
+
+    Notes
+    -----
+    Searching against the edges needs the predecessors of a vertex. A
+    `Graph` with ``reverse_index=True`` and a `CSRGraph` provide them
+    directly. For other graphs a directed search runs from `src_vertex`
+    only, and an undirected one first builds the reversed graph, which
+    costs a pass over every edge.
+    """
+    if max_hops is not None and max_hops < 0:
+        raise ValueError("max_hops must not be negative")
+    if src_vertex == dst_vertex:
+        return [src_vertex]
+
+    if isinstance(G, Graph) and G.reverse_index:
+        parents = ReversedGraph(G)
+    elif isinstance(G, CSRGraph):
+        parents = G.transpose()
+    elif not directed:
+        from .utils import reverse
+
+        parents = reverse(G)
+    else:
+        parents = None
+
+    if directed:
+        def forward(v):
+            return G.get(v, ())
+
+        def backward(v):
+            return parents.get(v, ())
+    else:
+        def forward(v):
+            return (*G.get(v, ()), *parents.get(v, ()))
+        backward = forward
+
+    # Every side maps the vertices it reached to the one it came from.
+    came_from = ({src_vertex: None}, {dst_vertex: None})
+    frontiers = ([src_vertex], [dst_vertex])
+    neighbors = (forward, backward)
+    depths = [0, 0]
+    while frontiers[0] and (parents is None or frontiers[1]):
+        if max_hops is not None and depths[0] + depths[1] >= max_hops:
+            return None
+        side = 0 if parents is None or len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = came_from[side], came_from[1 - side]
+        frontier = []
+        meeting = None
+        for v in frontiers[side]:
+            for w in neighbors[side](v):
+                if w not in mine:
+                    mine[w] = v
+                    frontier.append(w)
+                    if meeting is None and w in other:
+                        meeting = w
+        depths[side] += 1
+        frontiers[side][:] = frontier
+        if meeting is not None:
+            # Every vertex of the other side met in this level is at the
+            # same depth, since that side's BFS levels are complete, so the
+            # first one found gives a shortest path.
+            break
+    else:
+        return None
+
+    path = []
+    vertex = meeting
+    while vertex is not None:
+        path.append(vertex)
+        vertex = came_from[0][vertex]
+    path.reverse()
+    vertex = came_from[1][meeting]
+    while vertex is not None:
+        path.append(vertex)
+        vertex = came_from[1][vertex]
+    return path
+
+
+class CycleError(ValueError):
+    """
+    Raised by `topological_sort` when the graph has a cycle.
+
+    Attributes
+    ----------
+    cycle : list
+        The vertices of one cycle, in edge order: each vertex has an edge to
+        the next one and the last vertex has an edge to the first.
+    """
+
+    def __init__(self, message: str, cycle: List):
+        super().__init__(message)
+        self.cycle = cycle
+
+
+def strongly_connected_components(G: Dict[str, List[str]], vertices: Iterable = None) -> List[List]:
+    """
+    Find the strongly connected components of a graph with Tarjan's algorithm.
+
+    The search keeps its own stack instead of recursing, so it handles
+    arbitrarily long paths without hitting the recursion limit, and runs
+    in O(V + E).
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+    vertices : iterable, optional
+        The vertices to start searches from. Defaults to ``G.keys()``;
+        vertices that only appear as destinations are reached through
+        their edges.
+
+    Returns
+    -------
+    list of list
+        The components in reverse topological order: every edge between
+        two components points to one that comes earlier in the list.
+
+    Examples
+    --------
+    >>> G = {'A': ['B'], 'B': ['C', 'D'], 'C': ['A'], 'D': []}
+    >>> strongly_connected_components(G)
+    [['D'], ['C', 'B', 'A']]
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in G.keys() if vertices is None else vertices:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(G.get(root, [])))]
+        while work:
+            v, neighbors = work[-1]
+            for w in neighbors:
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(G.get(w, []))))
+                    break
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+
+def condensation(G: Dict[str, List[str]]) -> Tuple[Graph, List[List]]:
+    """
+    Collapse every strongly connected component of a graph into one vertex.
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+
+    Returns
+    -------
+    dag : Graph
+        A directed acyclic graph over the component ids ``0 .. k-1``, with an
+        edge ``i -> j`` whenever some member of component ``i`` has an edge
+        to a member of component ``j``. Ids follow a topological order, so
+        every edge goes from a smaller to a larger id.
+    components : list of list
+        The members of every component, indexed by component id.
+
+    Examples
+    --------
+    >>> G = {'A': ['B'], 'B': ['A', 'C'], 'C': []}
+    >>> dag, components = condensation(G)
+    >>> dag.values(), components
+    ([[1], []], [['B', 'A'], ['C']])
+    """
+    components = strongly_connected_components(G)
+    components.reverse()
+    component_of = {}
+    for c, members in enumerate(components):
+        for vertex in members:
+            component_of[vertex] = c
+
+    edges = []
+    for c, members in enumerate(components):
+        for vertex in members:
+            for w in G.get(vertex, []):
+                d = component_of[w]
+                if d != c:
+                    edges.append((c, d))
+    dag = Graph(adjacency="set")
+    for c in range(len(components)):
+        dag.add_vertex(c)
+    dag.bulk_add_edges(edges)
+    return dag, components
+
+
+def topological_sort(G: Dict[str, List[str]]) -> List:
+    """
+    Order the vertices of a graph so that every edge points forward.
+
+    Uses Kahn's algorithm in O(V + E). Vertices without incoming edges
+    come out in the order of ``G.keys()``.
+
+    Parameters
+    ----------
+    G : dict
+        The graph represented as an adjacency list, a `Graph` or a `CSRGraph`.
+
+    Returns
+    -------
+    list
+        Every vertex of the graph, each after all of its predecessors.
+
+    Raises
+    ------
+    CycleError
+        If the graph has a cycle, including a self-loop. The `cycle`
+        attribute of the exception lists the vertices of one cycle.
+
+    Examples
+    --------
+    >>> topological_sort({'A': ['C'], 'B': ['C'], 'C': []})
+    ['A', 'B', 'C']
+    """
+    in_degree = {}
+    for vertex in G.keys():
+        in_degree.setdefault(vertex, 0)
+        for w in G.get(vertex, []):
+            in_degree[w] = in_degree.get(w, 0) + 1
+
+    ready = deque(vertex for vertex, degree in in_degree.items() if degree == 0)
+    order = []
+    while ready:
+        vertex = ready.popleft()
+        order.append(vertex)
+        for w in G.get(vertex, []):
+            in_degree[w] -= 1
+            if in_degree[w] == 0:
+                ready.append(w)
+
+    if len(order) < len(in_degree):
+        cycle = _find_cycle(G, {vertex for vertex, degree in in_degree.items() if degree > 0})
+        raise CycleError(f"graph has a cycle: {' -> '.join(map(repr, cycle + cycle[:1]))}", cycle)
+    return order
+
+
+def _find_cycle(G, remaining: Set) -> List:
+    # Every vertex left over by Kahn's algorithm still has a predecessor among
+    # the leftovers, so walking predecessors must eventually repeat a vertex.
+    parent = {}
+    for vertex in remaining:
+        for w in G.get(vertex, []):
+            if w in remaining:
+                parent[w] = vertex
+    position = {}
+    path = []
+    vertex = next(iter(remaining))
+    while vertex not in position:
+        position[vertex] = len(path)
+        path.append(vertex)
+        vertex = parent[vertex]
+    cycle = path[position[vertex]:]
+    cycle.reverse()
+    return cycle
@@ -0,0 +1,195 @@
+"""
+An asyncio front end for graph queries.
+
+Traversals are CPU-bound and run in an executor, so the event loop stays
+responsive while they run. Identical requests arriving while one is in
+flight share its result instead of starting another traversal.
+
+Examples
+--------
+>>> async def handler(request):
+...     tree = await service.subgraph(request.person, timeout=2.0)
+...
+>>> service = GraphQueryService(graph.freeze(), max_concurrency=4)
+"""
+import asyncio
+import weakref
+from collections import namedtuple
+from functools import partial
+from typing import Callable, Dict, Set
+
+from .searching import dfs
+from .utils import extract_genealogical_subgraph
+
+ServiceInfo = namedtuple("ServiceInfo", ["requests", "coalesced", "timeouts", "running", "in_flight"])
+
+
+class GraphQueryService:
+    """
+    Runs traversals of one graph for asyncio callers, with request
+    coalescing, bounded concurrency and per-request deadlines.
+
+    Requests are keyed by the operation, its arguments and the graph's
+    `version`. A request whose key is already in flight awaits the same
+    future rather than starting a traversal, so a burst of requests for
+    one vertex costs one traversal. Requests made after the graph changed
+    never join a traversal started before.
+
+    At most `max_concurrency` traversals run at a time; the others wait
+    for a slot. A deadline bounds the whole wait of one caller, including
+    the wait for a slot. When it expires, `asyncio.TimeoutError` is raised
+    to that caller only: the traversal is shielded from the cancellation
+    and still completes for the other callers sharing it.
+
+    The service can be used from several event loops in turn, such as
+    successive `asyncio.run` calls: each loop gets its own concurrency
+    limit, and requests only join traversals started from the same loop.
+
+    Traversals run in other threads and read the graph while the event
+    loop keeps running, so the graph must not be modified while requests
+    are in flight. To keep writing to a `Graph`, serve ``graph.snapshot()``
+    and replace the service with a new one when a newer state should be
+    visible; a frozen `CSRGraph` avoids the question entirely.
+
+    Parameters
+    ----------
+    graph : Graph or CSRGraph
+        The graph to query.
+    max_concurrency : int, optional
+        The maximum number of traversals running at once.
+    executor : concurrent.futures.Executor, optional
+        Where traversals run. The event loop's default thread pool is used
+        by default.
+    timeout : float, optional
+        The default deadline of every request, in seconds. None waits
+        indefinitely.
+
+    Examples
+    --------
+    >>> async def main():
+    ...     service = GraphQueryService(g)
+    ...     trees = await asyncio.gather(*(service.subgraph('Alice') for _ in range(100)))
+    ...     return service.info()
+    >>> asyncio.run(main())
+    ServiceInfo(requests=100, coalesced=99, timeouts=0, running=0, in_flight=0)
+    """
+
+    def __init__(self, graph, max_concurrency: int = 4, executor=None, timeout: float = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._graph = graph
+        self._max_concurrency = max_concurrency
+        self._executor = executor
+        self._timeout = timeout
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._in_flight: Dict = {}
+        self._requests = 0
+        self._coalesced = 0
+        self._timeouts = 0
+        self._running = 0
+
+    async def subgraph(self, start_vertex, depth: int = None, timeout: float = None):
+        """
+        Returns ``extract_genealogical_subgraph(graph, start_vertex, depth)``.
+
+        Parameters
+        ----------
+        start_vertex : hashable
+            The vertex the genealogical tree is built around.
+        depth : int, optional
+            The maximum number of generations above and below
+            `start_vertex`, bounding both ancestors and relatives, see
+            `extract_genealogical_subgraph`.
+        timeout : float, optional
+            The deadline of this request in seconds, instead of the
+            service's default.
+
+        Returns
+        -------
+        Graph
+            The subgraph. Coalesced callers receive the same object, which
+            must not be modified.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the deadline expires first.
+        """
+        func = partial(extract_genealogical_subgraph, self._graph, start_vertex, depth)
+        return await self._query(("subgraph", start_vertex, depth), func, timeout)
+
+    async def descendants(self, start_vertex, timeout: float = None) -> Set:
+        """
+        Returns ``dfs(graph, start_vertex)``, the vertices reachable from
+        `start_vertex` including itself.
+
+        Parameters
+        ----------
+        start_vertex : hashable
+            The vertex to start from.
+        timeout : float, optional
+            The deadline of this request in seconds, instead of the
+            service's default.
+
+        Returns
+        -------
+        set
+            The reachable vertices. Coalesced callers receive the same
+            object, which must not be modified.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the deadline expires first.
+        """
+        return await self._query(("descendants", start_vertex), partial(dfs, self._graph, start_vertex), timeout)
+
+    def info(self) -> ServiceInfo:
+        """
+        Returns the number of requests, of requests that joined one already
+        in flight and of expired deadlines, and the current number of
+        running traversals and of distinct requests in flight.
+        """
+        return ServiceInfo(self._requests, self._coalesced, self._timeouts, self._running, len(self._in_flight))
+
+    async def _query(self, key, func: Callable, timeout: float):
+        self._requests += 1
+        # A future belongs to the loop that created it, so only requests
+        # from the same loop are coalesced.
+        key = (asyncio.get_running_loop(), getattr(self._graph, "version", None), *key)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(func))
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._finished, key))
+        else:
+            self._coalesced += 1
+
+        if timeout is None:
+            timeout = self._timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+
+    async def _run(self, func: Callable):
+        # A semaphore binds to the loop it is first used in, so every loop
+        # gets its own.
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        async with semaphore:
+            self._running += 1
+            try:
+                return await loop.run_in_executor(self._executor, func)
+            finally:
+                self._running -= 1
+
+    def _finished(self, key, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every caller timed out.
+        if not task.cancelled():
+            task.exception()
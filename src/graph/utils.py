@@ -1,15 +1,26 @@
-from ._base import Graph
-from .searching import dfs
+from . import instrumentation
+from ._base import Graph, ReversedGraph
+from ._csr import CSRGraph
+from .searching import iter_bfs
 
+@instrumentation.timed("reverse")
 def reverse(graph) -> 'Graph':
         """
         Reverse the directed graph.
 
         Returns
         -------
-        Graph
-            A new graph with all edges reversed.
+        Graph or ReversedGraph
+            A new graph with all edges reversed. If `graph` maintains a
+            reverse index, a read-only view over it is returned instead,
+            without copying any edge. A `CSRGraph` returns its cached
+            transpose.
         """
+        if isinstance(graph, Graph) and graph.reverse_index:
+            return ReversedGraph(graph)
+        if isinstance(graph, CSRGraph):
+            return graph.transpose()
+
         reversed_graph = Graph()
         
         for src in graph.keys():
@@ -18,14 +29,15 @@ def reverse(graph) -> 'Graph':
         
         return reversed_graph
 
-def extract_genealogical_subgraph(graph, start_vertex):
+@instrumentation.timed("extract_genealogical_subgraph")
+def extract_genealogical_subgraph(graph, start_vertex, depth=None):
     """
     Extracts a genealogical subgraph starting from a given vertex.
 
     This function constructs a subgraph representing the genealogical tree 
-    of a specified start vertex, including all descendant and ancestor nodes.
-    It uses depth-first search (DFS) to traverse the graph and builds a subgraph 
-    that includes both children and parent relationships.
+    of a specified start vertex: its ancestors, and every descendant of the
+    start vertex and of its ancestors (siblings, cousins, ...), together
+    with all edges leaving those vertices.
 
     Parameters
     ----------
@@ -33,36 +45,75 @@ def extract_genealogical_subgraph(graph, start_vertex):
         The original graph containing all nodes and edges.
     start_vertex : hashable
         The starting vertex from which the genealogical tree will be constructed.
+    depth : int, optional
+        Maximum number of generations to include above and below the start
+        vertex. Ancestors are kept up to `depth` generations up, and a
+        relative is kept if its generation, counted from the start vertex
+        along the shortest route through a common ancestor, is at most
+        `depth` generations down. By default the whole tree is extracted.
 
     Returns
     -------
     Graph
         A subgraph containing the genealogical tree of the given start vertex, 
         including both descendant and ancestor nodes.
+        The subgraph uses set-backed adjacency, so parallel edges of the
+        original graph appear once.
 
     Notes
     -----
-    - The `add_children` function adds child nodes of a given node to the subgraph.
-    - The `add_parents` function finds parent nodes by reversing the input graph
-      and adding their children to the subgraph.
-    - Uses an iterative DFS approach to traverse nodes.
+    - Ancestors are found with one lazy breadth-first search (`iter_bfs`)
+      over the reversed graph. When the graph was created with
+      ``reverse_index=True`` the reversal is a constant-time view.
+    - Relatives are found with one breadth-first search down from all
+      ancestors, sharing a single visited set, so every vertex and edge is
+      visited once: O(V + E) of the extracted tree instead of one full
+      search per ancestor.
+    - Ancestors enter the downward search at their own generation, so the
+      first visit of every vertex is at its smallest relative generation.
 
     """
-    sub_tree = Graph()
+    sub_tree = Graph(adjacency="set")
+    if depth is not None and depth < 0:
+        raise ValueError("depth must be non-negative")
 
-    def add_children(src_graph, dst_graph, start_node):
-        for node in dfs(src_graph, start_node):
-            for child in src_graph.get(node, []):
-                if child not in dst_graph[node]:
-                    dst_graph.add_edge(node, child)
+    # Generations up: ancestors[g] holds the ancestors first met g levels up.
+    ancestors = [[start_vertex]]
+    for _, parent, generation in iter_bfs(reverse(graph), start_vertex, max_depth=depth, edges=True):
+        if generation == len(ancestors):
+            ancestors.append([])
+        if generation:
+            ancestors[generation].append(parent)
 
-    def add_parents(src_graph, dst_graph, start_node):
-        reversed_g1 = reverse(src_graph)
-        for node in dfs(reversed_g1, start_node):
-            if node != start_node and node is not None:
-                add_children(src_graph, dst_graph, node)
+    # Generations down, starting at the oldest ancestors; each ancestor joins
+    # the frontier when the search reaches its generation.
+    members = []
+    seen = set()
+    frontier = []
+    generation = -(len(ancestors) - 1)
+    while frontier or generation <= 0:
+        if generation <= 0:
+            for vertex in ancestors[-generation]:
+                if vertex not in seen:
+                    seen.add(vertex)
+                    frontier.append(vertex)
+        members.extend(frontier)
+        if depth is not None and generation >= depth:
+            break
+        level = []
+        for vertex in frontier:
+            for child in graph.get(vertex, []):
+                if child not in seen:
+                    seen.add(child)
+                    level.append(child)
+        frontier = level
+        generation += 1
 
-    add_children(graph, sub_tree, start_node=start_vertex)
-    add_parents(graph, sub_tree, start_node=start_vertex)
+    if instrumentation._recorder is not None:
+        instrumentation._recorder.count("extract_genealogical_subgraph.vertices", len(members))
+    for vertex in members:
+        for child in graph.get(vertex, []):
+            if child in seen:
+                sub_tree.add_edge(vertex, child)
 
-    return sub_tree
\ No newline at end of file
+    return sub_tree
@@ -0,0 +1,191 @@
+from collections import deque
+from typing import FrozenSet
+
+from ._base import Graph
+from .utils import reverse
+
+
+class GenealogyView:
+    """
+    A genealogical subgraph that keeps itself up to date with its graph.
+
+    The view holds the result of ``extract_genealogical_subgraph(graph,
+    start_vertex)`` and subscribes to the graph (see `Graph.subscribe`).
+    Instead of recomputing the subgraph from scratch on every change, it
+    applies only the delta:
+
+    - An added edge from a member brings in the descendants of its target
+      that are not members yet. An added edge into an ancestor also makes
+      its source and the source's ancestors ancestors, along with all of
+      their descendants.
+    - A removed edge between members is dropped, and the ancestors and
+      members are recomputed inside the current subgraph only, since
+      removing an edge can only shrink them.
+    - Edges outside the subgraph that cannot reach it are ignored.
+
+    Vertex removals and item assignments mark the view stale, and it is
+    recomputed in full the next time it is read.
+
+    Finding new ancestors walks the reversed graph, so views are cheapest on
+    graphs created with ``reverse_index=True``.
+
+    Parameters
+    ----------
+    graph : Graph
+        The graph to follow.
+    start_vertex : hashable
+        The vertex the genealogical tree is built around.
+
+    Examples
+    --------
+    >>> g = Graph(reverse_index=True)
+    >>> g.add_edge('Mom', 'Alice')
+    >>> view = GenealogyView(g, 'Alice')
+    >>> g.add_edge('Mom', 'Bob')
+    >>> sorted(view.subgraph['Mom'])
+    ['Alice', 'Bob']
+    """
+
+    def __init__(self, graph: Graph, start_vertex):
+        self._graph = graph
+        self._start = start_vertex
+        self._recompute()
+        graph.subscribe(self)
+
+    @property
+    def start_vertex(self):
+        """
+        The vertex the genealogical tree is built around.
+        """
+        return self._start
+
+    @property
+    def subgraph(self) -> Graph:
+        """
+        The current genealogical subgraph, equal to what
+        `extract_genealogical_subgraph` returns for the graph as it is now.
+
+        It is updated in place and must not be modified.
+        """
+        if self._stale:
+            self._recompute()
+        return self._subgraph
+
+    @property
+    def ancestors(self) -> FrozenSet:
+        """
+        The vertices that reach the start vertex, including itself.
+        """
+        if self._stale:
+            self._recompute()
+        return frozenset(self._ancestors)
+
+    @property
+    def members(self) -> FrozenSet:
+        """
+        The ancestors and all of their descendants.
+        """
+        if self._stale:
+            self._recompute()
+        return frozenset(self._members)
+
+    def close(self):
+        """
+        Stops following the graph. The subgraph keeps its last state.
+        """
+        self._graph.unsubscribe(self)
+
+    def graph_changed(self, event: str, src_vertex, dst_vertex):
+        """
+        Applies one change of the graph, see `Graph.subscribe`.
+        """
+        if self._stale:
+            return
+        if event == "add_edge":
+            self._edge_added(src_vertex, dst_vertex)
+        elif event == "remove_edge":
+            self._edge_removed(src_vertex, dst_vertex)
+        elif event != "add_vertex":
+            # A vertex without edges is in no genealogy it was not already in.
+            self._stale = True
+
+    def _recompute(self):
+        graph = self._graph
+        ancestors = {self._start}
+        parents = reverse(graph)
+        stack = [self._start]
+        while stack:
+            for parent in parents.get(stack.pop(), []):
+                if parent not in ancestors:
+                    ancestors.add(parent)
+                    stack.append(parent)
+
+        self._ancestors = ancestors
+        self._members = set()
+        self._subgraph = Graph(adjacency="set", reverse_index=True)
+        self._stale = False
+        self._add_members(ancestors)
+
+    def _add_members(self, roots):
+        """
+        Adds `roots` and their descendants to the members, with all their edges.
+        """
+        graph, members, subgraph = self._graph, self._members, self._subgraph
+        queue = deque(vertex for vertex in roots if vertex not in members)
+        members.update(queue)
+        while queue:
+            vertex = queue.popleft()
+            for child in graph.get(vertex, []):
+                subgraph.add_edge(vertex, child)
+                if child not in members:
+                    members.add(child)
+                    queue.append(child)
+
+    def _edge_added(self, src_vertex, dst_vertex):
+        if dst_vertex in self._ancestors and src_vertex not in self._ancestors:
+            parents = reverse(self._graph)
+            added = [src_vertex]
+            self._ancestors.add(src_vertex)
+            stack = [src_vertex]
+            while stack:
+                for parent in parents.get(stack.pop(), []):
+                    if parent not in self._ancestors:
+                        self._ancestors.add(parent)
+                        added.append(parent)
+                        stack.append(parent)
+            self._add_members(added)
+        if src_vertex in self._members:
+            self._subgraph.add_edge(src_vertex, dst_vertex)
+            self._add_members([dst_vertex])
+
+    def _edge_removed(self, src_vertex, dst_vertex):
+        if src_vertex not in self._members or self._graph.has_edge(src_vertex, dst_vertex):
+            return
+        subgraph = self._subgraph
+        subgraph.remove_edge(src_vertex, dst_vertex)
+
+        # Every ancestor left reaches the start vertex through members, and
+        # every member left descends from an ancestor through members, so
+        # both can be recomputed inside the subgraph.
+        ancestors = {self._start}
+        stack = [self._start]
+        while stack:
+            for parent in subgraph.predecessors(stack.pop()):
+                if parent not in ancestors:
+                    ancestors.add(parent)
+                    stack.append(parent)
+        members = set(ancestors)
+        stack = list(ancestors)
+        while stack:
+            for child in subgraph.get(stack.pop(), []):
+                if child not in members:
+                    members.add(child)
+                    stack.append(child)
+
+        for vertex in self._members - members:
+            subgraph.remove_vertex(vertex)
+        for vertex in (src_vertex, dst_vertex):
+            if vertex in subgraph and not subgraph[vertex] and not subgraph.in_degree(vertex):
+                subgraph.remove_vertex(vertex)
+        self._ancestors = ancestors
+        self._members = members
@@ -0,0 +1,252 @@
+"""
+Streaming DOT output for graphs too large to build a `graphviz.Digraph` of.
+
+Statements are generated one at a time and written straight to a file or
+buffer, with the shared node and edge styles declared once in the header
+instead of on every statement. Large graphs can be cut down before they
+reach Graphviz:
+
+- `focus` and `hops` keep only the vertices within `hops` edges of a
+  vertex, following edges in both directions;
+- `max_nodes` stops adding vertices once the budget is reached. Drawn
+  vertices with successors that were left out get a dashed outline;
+- `collapse` folds the descendants of the given vertices into one summary
+  node, drawn in a cluster with the vertex it hangs from.
+
+Examples
+--------
+>>> with open('family.dot', 'w') as f:
+...     write_dot(g, f, focus='Alice', hops=2, max_nodes=500, edge_labels=False)
+"""
+import os
+from collections import deque
+from typing import IO, Dict, Iterable, Iterator, Tuple, Union
+
+from ..graph.utils import reverse
+
+NODE_ATTRS = {"shape": "box", "color": "black", "style": "filled", "fillcolor": "lightblue"}
+EDGE_ATTRS = {"color": "blue", "style": "solid"}
+SUMMARY_ATTRS = {"shape": "folder", "fillcolor": "lightgrey"}
+
+
+def _quote(value) -> str:
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{text}"'
+
+
+def _attrs(attrs: Dict) -> str:
+    return " ".join(f"{key}={_quote(value)}" for key, value in attrs.items())
+
+
+def _collapse(graph, roots: Iterable) -> Tuple[Dict, Dict]:
+    """
+    Returns the collapsed root owning every hidden vertex, and the number of
+    vertices hidden under every root.
+
+    A root that is itself a descendant of another root is folded into that
+    root's subtree.
+    """
+    owner = {}
+    sizes = {}
+    for root in roots:
+        if root in owner or root in sizes:
+            continue
+        seen = {root}
+        stack = [root]
+        while stack:
+            for child in graph.get(stack.pop(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        seen.discard(root)
+        for vertex in seen:
+            owner[vertex] = root
+            sizes.pop(vertex, None)
+        if seen:
+            sizes[root] = len(seen)
+    return owner, sizes
+
+
+def _neighborhood(graph, focus, hops, max_nodes, owner) -> Dict:
+    """
+    Returns the vertices within `hops` edges of `focus` in either direction,
+    in breadth-first order and at most `max_nodes` of them. Hidden vertices
+    are neither selected nor walked through.
+    """
+    parents = reverse(graph)
+    if focus not in graph and not parents.get(focus):
+        raise KeyError(focus)
+    selected = {focus: None}
+    queue = deque([(focus, 0)])
+    while queue and len(selected) != max_nodes:
+        vertex, depth = queue.popleft()
+        if depth == hops:
+            continue
+        for neighbor in (*graph.get(vertex, ()), *parents.get(vertex, ())):
+            if neighbor in selected or neighbor in owner:
+                continue
+            selected[neighbor] = None
+            if len(selected) == max_nodes:
+                break
+            queue.append((neighbor, depth + 1))
+    return selected
+
+
+def _first_vertices(graph, max_nodes, owner) -> Dict:
+    """
+    Returns the first `max_nodes` visible vertices in key order, each key
+    followed by its successors.
+    """
+    selected = {}
+    for vertex in graph.keys():
+        for candidate in (vertex, *graph.get(vertex, ())):
+            if candidate not in owner and candidate not in selected:
+                selected[candidate] = None
+                if len(selected) == max_nodes:
+                    return selected
+    return selected
+
+
+def dot_statements(graph, focus=None, hops: int = None, max_nodes: int = None, edge_labels: bool = True,
+                   collapse: Iterable = ()) -> Iterator[str]:
+    """
+    Generates the body statements of a DOT digraph drawing `graph`.
+
+    The statements rely on the node and edge defaults `NODE_ATTRS` and
+    `EDGE_ATTRS` being declared by the enclosing graph, as `write_dot` does.
+    Without `focus` or `max_nodes` the whole graph is streamed and nothing
+    but the collapsed subtrees is held in memory.
+
+    Parameters
+    ----------
+    graph : Graph or CSRGraph
+        The graph to draw.
+    focus : hashable, optional
+        Draw only the neighborhood of this vertex.
+    hops : int, optional
+        The number of edges, in either direction, the neighborhood extends
+        from `focus`. Unlimited by default.
+    max_nodes : int, optional
+        The maximum number of vertices drawn, not counting summary nodes.
+    edge_labels : bool, optional
+        Whether every edge is labelled with its endpoints.
+    collapse : iterable, optional
+        Vertices whose descendants are drawn as a single summary node.
+
+    Yields
+    ------
+    str
+        One tab-indented statement per line, ending with a newline.
+
+    Raises
+    ------
+    KeyError
+        If `focus` is not a vertex of `graph`.
+    ValueError
+        If `hops` is given without `focus`, if `hops` is negative or
+        `max_nodes` is not positive, or if `focus` is a collapsed descendant.
+    """
+    if hops is not None and focus is None:
+        raise ValueError("hops requires a focus vertex")
+    if hops is not None and hops < 0:
+        raise ValueError("hops must not be negative")
+    if max_nodes is not None and max_nodes < 1:
+        raise ValueError("max_nodes must be at least 1")
+
+    owner, sizes = _collapse(graph, collapse)
+    if focus is not None and focus in owner:
+        raise ValueError(f"focus vertex {focus!r} is inside the collapsed subtree of {owner[focus]!r}")
+    summaries = {root: f"collapsed {index}" for index, root in enumerate(sizes)}
+
+    if focus is not None:
+        selected = _neighborhood(graph, focus, hops, max_nodes, owner)
+    elif max_nodes is not None:
+        selected = _first_vertices(graph, max_nodes, owner)
+    else:
+        selected = None
+
+    def edge(src, dst, label):
+        if label:
+            return f"\t{_quote(src)} -> {_quote(dst)} [label={_quote(f'{src} → {dst}')}]\n"
+        return f"\t{_quote(src)} -> {_quote(dst)}\n"
+
+    def edges_of(vertex, truncated=None):
+        redirected = set()
+        for dst in graph.get(vertex, ()):
+            root = owner.get(dst)
+            if root is not None:
+                if root not in redirected:
+                    redirected.add(root)
+                    yield edge(vertex, summaries[root], False)
+            elif selected is None or dst in selected:
+                yield edge(vertex, dst, edge_labels)
+            elif truncated is not None:
+                truncated.add(vertex)
+
+    def cluster(root, index, drawn):
+        yield f"\tsubgraph {_quote(f'cluster_{index}')} {{\n"
+        yield '\t\tstyle="dashed"\n'
+        if drawn:
+            yield f"\t\t{_quote(root)}\n"
+        size = sizes[root]
+        label = f"{size} descendant" if size == 1 else f"{size} descendants"
+        yield f"\t\t{_quote(summaries[root])} [{_attrs({'label': label, **SUMMARY_ATTRS})}]\n"
+        yield "\t}\n"
+
+    if selected is None:
+        for index, root in enumerate(sizes):
+            yield from cluster(root, index, True)
+        for vertex in graph.keys():
+            if vertex in owner:
+                continue
+            if not graph.get(vertex, ()):
+                yield f"\t{_quote(vertex)}\n"
+            yield from edges_of(vertex)
+        return
+
+    # The selection is bounded, so its edges are collected first to learn
+    # which vertices have hidden successors before the vertices are written.
+    truncated = set()
+    lines = [line for vertex in selected for line in edges_of(vertex, truncated)]
+    reached = {owner[dst] for vertex in selected for dst in graph.get(vertex, ()) if dst in owner}
+    for index, root in enumerate(sizes):
+        if root in reached:
+            yield from cluster(root, index, root in selected)
+    for vertex in selected:
+        if vertex in truncated:
+            yield f'\t{_quote(vertex)} [style="filled,dashed"]\n'
+        elif vertex not in reached:
+            yield f"\t{_quote(vertex)}\n"
+    yield from lines
+
+
+def write_dot(graph, out: Union[str, os.PathLike, IO], name: str = "dot", **options):
+    """
+    Writes `graph` as a DOT digraph, one statement at a time.
+
+    Parameters
+    ----------
+    graph : Graph or CSRGraph
+        The graph to draw.
+    out : str, path-like or file object
+        A path, or a text file or buffer to write to.
+    name : str, optional
+        The name of the digraph.
+    **options
+        `focus`, `hops`, `max_nodes`, `edge_labels` and `collapse`, see
+        `dot_statements`.
+
+    Examples
+    --------
+    >>> write_dot(g, 'family.dot', focus='Alice', hops=3)
+
+    Render it with ``dot -Tpng family.dot -o family.png``.
+    """
+    if isinstance(out, (str, os.PathLike)):
+        with open(os.fspath(out), "w", encoding="utf-8") as f:
+            return write_dot(graph, f, name, **options)
+    out.write(f"digraph {_quote(name)} {{\n")
+    out.write(f"\tnode [{_attrs(NODE_ATTRS)}]\n")
+    out.write(f"\tedge [{_attrs(EDGE_ATTRS)}]\n")
+    out.writelines(dot_statements(graph, **options))
+    out.write("}\n")
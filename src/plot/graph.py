@@ -1,34 +1,42 @@
 from graphviz import Digraph
 
+from .dot import EDGE_ATTRS, NODE_ATTRS, dot_statements
 
-def plot_graph(graph, output_dir="./data"):
-    dot = Digraph("dot", format="png")
 
-    nodes = set(graph.keys()).union(
-        {edge for edges in graph.values() for edge in edges}
-    )
+def plot_graph(graph, output_dir="./data", focus=None, hops=None, max_nodes=None, edge_labels=True, collapse=()):
+    """
+    Builds a Graphviz digraph drawing `graph`.
 
-    # Explicitly add all nodes with consistent styling
-    for node in nodes:
-        dot.node(
-            str(node),
-            color="black",  # Outline color
-            shape="box",  # Shape of the node
-            style="filled",  # Fill the node with color
-            fillcolor="lightblue",
-        )  # Background color of the node
+    Vertices are drawn as light blue boxes and edges in blue, labelled with
+    their endpoints. The styles are declared once as graph defaults and the
+    statements are added to the digraph's body directly, see `dot_statements`
+    for the options limiting what is drawn. To skip the `Digraph` object
+    entirely, use `src.plot.dot.write_dot`.
 
-    # Add edges with square arrowhead style
-    for node in graph.keys():
-        for edge in graph.get(node):
-            dot.edge(
-                str(node),
-                str(edge),
-                color="blue",  # Color of the edge
-                style="solid",  # Style of the edge
-                label=f"{str(node)} → {str(edge)}",
-                
-            )  # Add a label to the edge
+    Parameters
+    ----------
+    graph : Graph or CSRGraph
+        The graph to draw.
+    focus : hashable, optional
+        Draw only the neighborhood of this vertex.
+    hops : int, optional
+        The number of edges, in either direction, the neighborhood extends
+        from `focus`.
+    max_nodes : int, optional
+        The maximum number of vertices drawn.
+    edge_labels : bool, optional
+        Whether every edge is labelled with its endpoints.
+    collapse : iterable, optional
+        Vertices whose descendants are drawn as a single summary node.
 
-        # Render the graph to the specified directory
+    Returns
+    -------
+    graphviz.Digraph
+        The digraph, ready to be rendered.
+    """
+    dot = Digraph("dot", format="png")
+    dot.node_attr.update(NODE_ATTRS)
+    dot.edge_attr.update(EDGE_ATTRS)
+    dot.body.extend(dot_statements(graph, focus=focus, hops=hops, max_nodes=max_nodes,
+                                   edge_labels=edge_labels, collapse=collapse))
     return dot
@@ -0,0 +1,56 @@
+import copy
+import random
+
+
+def state_of(graph):
+    """
+    Maps every key of `graph` to its successors, in the order the graph
+    stores them.
+    """
+    return {vertex: list(graph.get(vertex, [])) for vertex in graph.keys()}
+
+
+def predecessors_of(graph):
+    """
+    Maps every key of `graph` to its predecessors, sorted: their order
+    depends on the storage, not on the edges.
+    """
+    return {vertex: sorted(graph.predecessors(vertex), key=repr) for vertex in graph.keys()}
+
+
+def random_changes(rng: random.Random, count: int, size: int = 30):
+    """
+    Returns `count` random changes to the vertices ``0`` to ``size - 1``, as
+    ``(method, args)`` pairs for `apply_changes`.
+
+    Every mutating method shared by `Graph`, `InternedGraph` and
+    `CompactGraph` is drawn, with parallel edges and self-loops.
+    """
+    changes = []
+    for _ in range(count):
+        action = rng.random()
+        u, v = rng.randrange(size), rng.randrange(size)
+        if action < 0.45:
+            changes.append(("add_edge", (u, v)))
+        elif action < 0.55:
+            changes.append(("bulk_add_edges", ([(u, v), (v, rng.randrange(size))], rng.random() < 0.5)))
+        elif action < 0.7:
+            changes.append(("remove_edge", (u, v)))
+        elif action < 0.82:
+            changes.append(("remove_vertex", (u,)))
+        elif action < 0.88:
+            changes.append(("add_vertex", (rng.randrange(size),)))
+        else:
+            changes.append(("__setitem__", (u, [rng.randrange(size) for _ in range(rng.randrange(4))])))
+    return changes
+
+
+def apply_changes(graph, changes):
+    """
+    Applies ``(method, args)`` pairs from `random_changes` to `graph`.
+
+    The arguments are copied, so graphs given the same changes never share
+    the lists in them.
+    """
+    for method, args in changes:
+        getattr(graph, method)(*copy.deepcopy(args))
@@ -0,0 +1,182 @@
+import random
+
+import pytest
+from conftest import apply_changes, predecessors_of, random_changes, state_of
+from src.graph import Graph
+from src.graph.utils import extract_genealogical_subgraph
+from src.graph.views import GenealogyView
+
+
+@pytest.mark.parametrize("adjacency", ["list", "set"])
+@pytest.mark.parametrize("reverse_index", [False, True])
+def test_batch_matches_sequential_changes(adjacency, reverse_index):
+    """
+    Test that a batch leaves the graph in the same state as applying its
+    changes one at a time.
+    """
+    for seed in range(5):
+        rng = random.Random(seed)
+        g = Graph(reverse_index=reverse_index, adjacency=adjacency)
+        expected = Graph(adjacency=adjacency)
+        initial = [(rng.randrange(40), rng.randrange(40)) for _ in range(120)]
+        g.bulk_add_edges(initial)
+        expected.bulk_add_edges(initial)
+
+        changes = random_changes(rng, 300, size=40)
+        with g.batch():
+            apply_changes(g, changes)
+        apply_changes(expected, changes)
+        assert g.keys() == expected.keys(), seed
+        assert state_of(g) == state_of(expected), seed
+        assert predecessors_of(g) == predecessors_of(expected), seed
+
+
+def test_batch_is_applied_on_exit():
+    """
+    Test that reads inside the block see the graph as it was before it.
+    """
+    g = Graph()
+    g.add_edge('A', 'B')
+    version = g.version
+    with g.batch():
+        g.add_edge('B', 'C')
+        g.remove_vertex('A')
+        assert g.get('A') == ['B']
+        assert 'C' not in g
+        assert g.version == version
+    assert 'A' not in g
+    assert g['B'] == ['C']
+    assert g.version > version
+
+
+def test_batch_rollback():
+    """
+    Test that nothing is applied when the block raises, and that the graph
+    can be changed normally afterwards.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([('A', 'B'), ('B', 'C')])
+    before, version = state_of(g), g.version
+    with pytest.raises(RuntimeError):
+        with g.batch():
+            g.remove_vertex('B')
+            g.add_edge('C', 'D')
+            raise RuntimeError("diff is corrupt")
+    assert state_of(g) == before
+    assert g.version == version
+
+    with pytest.raises(TypeError):
+        with g.batch():
+            g.add_edge('C', 'D')
+            g.add_edge('C', ['unhashable'])
+    assert state_of(g) == before
+
+    g.add_edge('C', 'D')
+    assert g['C'] == ['D']
+
+
+def test_nested_batches():
+    """
+    Test that a nested batch joins the outer one.
+    """
+    g = Graph()
+    with g.batch():
+        g.add_edge(1, 2)
+        with g.batch():
+            g.add_edge(2, 3)
+        assert 2 not in g
+    assert state_of(g) == {1: [2], 2: [3], 3: []}
+
+
+def test_failed_nested_batch_is_rolled_back():
+    """
+    Test that a nested batch which raises discards only its own changes,
+    and that the outer batch can catch the exception and go on.
+    """
+    g = Graph()
+    with g.batch():
+        g.add_edge(1, 2)
+        with pytest.raises(RuntimeError):
+            with g.batch():
+                g.add_edge(2, 3)
+                g.remove_vertex(1)
+                raise RuntimeError
+        g.add_edge(1, 4)
+    assert state_of(g) == {1: [2, 4], 2: [], 4: []}
+
+
+def test_batch_removes_vertices_in_one_pass():
+    """
+    Test that removing vertices in a batch drops every edge to them,
+    parallel edges included, and leaves the predecessor index consistent.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([(0, 1), (0, 1), (1, 2), (2, 0), (3, 1), (3, 4)])
+    with g.batch():
+        g.remove_vertex(1)
+        g.remove_vertex(4)
+        g.remove_vertex(99)
+    assert state_of(g) == {0: [], 2: [0], 3: []}
+    assert g.predecessors(0) == [2]
+    assert g.predecessors(2) == []
+
+
+def test_batch_notifies_observers_once():
+    """
+    Test that observers receive one batch event listing the changes, and
+    that views are recomputed after it.
+    """
+    class Recorder:
+        def __init__(self):
+            self.events = []
+
+        def graph_changed(self, event, src_vertex, dst_vertex):
+            self.events.append((event, src_vertex, dst_vertex))
+
+    g = Graph()
+    g.bulk_add_edges([('Grandma', 'Mom'), ('Mom', 'Alice')])
+    recorder = Recorder()
+    g.subscribe(recorder)
+    view = GenealogyView(g, 'Alice')
+    with g.batch():
+        g.add_edge('Mom', 'Bob')
+        g.add_edge('Grandpa', 'Mom')
+        g.remove_vertex('Grandma')
+    assert recorder.events == [("batch", [("add_edge", ("Mom", "Bob")), ("add_edge", ("Grandpa", "Mom")),
+                                          ("remove_vertex", ("Grandma",))], None)]
+    assert state_of(view.subgraph) == state_of(extract_genealogical_subgraph(g, 'Alice'))
+
+
+def test_batch_event_keeps_assigned_lists():
+    """
+    Test that edges added after an item assignment in the same batch do not
+    change the list recorded in the batch event, nor the caller's list.
+    """
+    class Recorder:
+        def graph_changed(self, event, src_vertex, dst_vertex):
+            self.operations = src_vertex
+
+    g = Graph()
+    recorder = Recorder()
+    g.subscribe(recorder)
+    children = ['Alice']
+    with g.batch():
+        g['Mom'] = children
+        g.add_edge('Mom', 'Bob')
+    assert recorder.operations == [("__setitem__", ('Mom', ['Alice'])), ("add_edge", ('Mom', 'Bob'))]
+    assert children == ['Alice']
+    assert g['Mom'] == ['Alice', 'Bob']
+
+
+def test_batch_after_snapshot():
+    """
+    Test that a snapshot taken before a batch keeps its state.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([(0, 1), (1, 2), (2, 3)])
+    snapshot = g.snapshot()
+    with g.batch():
+        g.remove_vertex(1)
+        g.add_edge(3, 4)
+    assert state_of(snapshot) == {0: [1], 1: [2], 2: [3], 3: []}
+    assert state_of(g) == {0: [], 2: [3], 3: [4], 4: []}
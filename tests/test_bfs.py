@@ -0,0 +1,115 @@
+import random
+
+import numpy as np
+from src.graph import Graph
+from src.graph.searching import dfs, bfs_reachable, iter_bfs
+
+
+def random_graph(num_vertices, num_edges, seed):
+    rng = random.Random(seed)
+    g = Graph()
+    for vertex in range(num_vertices):
+        g.add_vertex(vertex)
+    for _ in range(num_edges):
+        g.add_edge(rng.randrange(num_vertices), rng.randrange(num_vertices))
+    return g
+
+
+def test_bfs_reachable_matches_dfs():
+    """
+    Test that the vectorized search finds the same vertices as dfs.
+
+    Compares both searches from every vertex of random graphs with
+    cycles, self-loops and parallel edges.
+    """
+    for seed in range(5):
+        g = random_graph(60, 90, seed)
+        csr = g.freeze()
+        for vertex in g.keys():
+            assert bfs_reachable(csr, vertex) == dfs(g, vertex)
+
+def test_dfs_dispatches_to_frozen_graph():
+    """
+    Test that dfs on a frozen graph returns the same set as on the original.
+    """
+    g = random_graph(30, 40, seed=7)
+    csr = g.freeze()
+    for vertex in g.keys():
+        assert dfs(csr, vertex) == dfs(g, vertex)
+    assert dfs(csr, "missing") == set()
+
+def test_bfs_reachable_depth():
+    """
+    Test the BFS levels reported by the vectorized search.
+
+    Ensures that every vertex gets its shortest distance from the
+    start vertex and unreachable vertices get -1.
+    """
+    g = Graph()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("B", "D")
+    g.add_edge("C", "D")
+    g.add_edge("D", "E")
+    g.add_edge("F", "A")
+    csr = g.freeze()
+    discovered, depth = bfs_reachable(csr, "A", return_depth=True)
+    assert discovered == {"A", "B", "C", "D", "E"}
+    levels = {vertex: int(depth[csr.id_of(vertex)]) for vertex in g.keys()}
+    assert levels == {"A": 0, "B": 1, "C": 1, "D": 2, "E": 3, "F": -1}
+
+def test_bfs_reachable_max_depth():
+    """
+    Test limiting the number of levels expanded.
+    """
+    g = Graph()
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    g.add_edge(2, 3)
+    assert bfs_reachable(g.freeze(), 0, max_depth=2) == {0, 1, 2}
+
+def test_bfs_reachable_missing_vertex():
+    """
+    Test searching from a vertex that is not in the graph.
+    """
+    csr = random_graph(5, 5, seed=1).freeze()
+    discovered, depth = bfs_reachable(csr, "X", return_depth=True)
+    assert discovered == set()
+    assert np.all(depth == -1)
+
+def test_iter_bfs_levels():
+    """
+    Test that iter_bfs yields vertices level by level with shortest depths.
+
+    Also checks the limits, and that a graph, its frozen form and a plain
+    dictionary give the same events.
+    """
+    G = {'A': ['B', 'C'], 'B': ['D'], 'C': ['D', 'E'], 'D': ['A'], 'E': ['F'], 'F': []}
+    assert list(iter_bfs(G, 'A')) == ['A', 'B', 'C', 'D', 'E', 'F']
+    events = list(iter_bfs(G, 'A', edges=True))
+    assert events == [
+        (None, 'A', 0), ('A', 'B', 1), ('A', 'C', 1), ('B', 'D', 2), ('C', 'E', 2), ('E', 'F', 3),
+    ]
+    assert list(iter_bfs(G, 'A', max_depth=1)) == ['A', 'B', 'C']
+    assert list(iter_bfs(G, 'A', max_depth=0)) == ['A']
+    assert list(iter_bfs(G, 'A', max_nodes=4)) == ['A', 'B', 'C', 'D']
+    assert list(iter_bfs(G, 'A', until=lambda v: v in 'DE')) == ['A', 'B', 'C', 'D']
+    assert list(iter_bfs(G, 'X')) == []
+
+    g = Graph()
+    for src, dsts in G.items():
+        for dst in dsts:
+            g.add_edge(src, dst)
+    assert list(iter_bfs(g, 'A', edges=True)) == events
+    assert list(iter_bfs(g.freeze(), 'A', edges=True)) == events
+
+def test_iter_bfs_matches_dfs():
+    """
+    Test that iter_bfs visits the same vertices as dfs on random graphs.
+    """
+    for seed in range(3):
+        g = random_graph(60, 90, seed)
+        for vertex in g.keys():
+            visited = list(iter_bfs(g, vertex))
+            assert len(visited) == len(set(visited))
+            assert set(visited) == dfs(g, vertex)
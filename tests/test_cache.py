@@ -0,0 +1,101 @@
+import pytest
+from src.graph import Graph
+from src.graph.cache import SubgraphCache
+from src.graph.utils import extract_genealogical_subgraph
+
+
+def edges(graph):
+    return {(src, dst) for src in graph.keys() for dst in graph[src]}
+
+
+def family():
+    g = Graph()
+    g.add_edge("grandma", "mom")
+    g.add_edge("mom", "me")
+    g.add_edge("mom", "sister")
+    g.add_edge("uncle", "cousin")
+    return g
+
+
+def test_version_counter():
+    """
+    Test that every mutation bumps the graph version.
+
+    Ensures that additions, removals and item assignment change the
+    version, while reads and no-op removals do not.
+    """
+    g = Graph()
+    versions = [g.version]
+    g.add_vertex("A")
+    versions.append(g.version)
+    g.add_edge("A", "B")
+    versions.append(g.version)
+    g["C"] = ["A"]
+    versions.append(g.version)
+    g.remove_edge("A", "B")
+    versions.append(g.version)
+    g.remove_vertex("C")
+    versions.append(g.version)
+    assert versions == sorted(set(versions))
+
+    version = g.version
+    g.get("A")
+    g.has_edge("A", "B")
+    g.remove_edge("A", "Z")
+    g.remove_vertex("Z")
+    g.add_vertex("A")
+    assert g.version == version
+
+def test_cache_hits_and_misses():
+    """
+    Test that repeated lookups are served from the cache.
+    """
+    g = family()
+    cache = SubgraphCache(g)
+    first = cache.get("me")
+    assert cache.get("me") is first
+    assert edges(first) == edges(extract_genealogical_subgraph(g, "me"))
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+def test_cache_invalidated_by_mutation():
+    """
+    Test that a mutation of the graph invalidates cached subgraphs.
+
+    Verifies that after adding an edge the subgraph is recomputed and
+    contains the new edge.
+    """
+    g = family()
+    cache = SubgraphCache(g)
+    before = cache.get("me")
+    g.add_edge("me", "daughter")
+    after = cache.get("me")
+    assert after is not before
+    assert ("me", "daughter") in edges(after)
+    info = cache.cache_info()
+    assert (info.misses, info.invalidations, info.currsize) == (2, 1, 1)
+
+def test_cache_lru_eviction():
+    """
+    Test that the least recently used subgraph is evicted first.
+    """
+    g = family()
+    cache = SubgraphCache(g, maxsize=2)
+    cache.get("me")
+    cache.get("sister")
+    cache.get("me")
+    cache.get("cousin")
+    assert cache.cache_info().evictions == 1
+    cache.get("me")
+    assert cache.cache_info().hits == 2
+    cache.get("sister")
+    assert cache.cache_info().misses == 4
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 0, 0, 2, 0)
+
+def test_cache_invalid_maxsize():
+    """
+    Test that a cache must hold at least one entry.
+    """
+    with pytest.raises(ValueError):
+        SubgraphCache(Graph(), maxsize=0)
@@ -0,0 +1,191 @@
+import pickle
+import random
+
+import pytest
+from conftest import apply_changes, random_changes, state_of
+from src.graph import CompactGraph, Graph
+from src.graph.searching import dfs
+from src.graph.utils import extract_genealogical_subgraph
+
+
+def test_add_edge():
+    """
+    Test adding directed edges, including to a vertex that already has some.
+    """
+    g = CompactGraph()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    assert g["A"] == ["B", "C"]
+    assert "B" in g
+    assert g["B"] == []
+
+def test_remove_edge():
+    """
+    Test removing existing, parallel and non-existent edges.
+    """
+    g = CompactGraph()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("A", "B")
+    g.remove_edge("A", "B")
+    assert g["A"] == ["C", "B"]
+    g.remove_edge("A", "X")
+    g.remove_edge("X", "A")
+    assert g["A"] == ["C", "B"]
+    assert "X" not in g
+
+def test_add_and_remove_vertex():
+    """
+    Test that removing a vertex drops it and every edge pointing to it.
+    """
+    g = CompactGraph()
+    g.add_vertex("Z")
+    g.add_edge("A", "B")
+    g.add_edge("C", "B")
+    g.add_edge("C", "B")
+    g.add_edge("B", "C")
+    g.remove_vertex("B")
+    assert "B" not in g
+    assert g["A"] == [] and g["C"] == []
+    assert set(g.keys()) == {"A", "C", "Z"}
+    assert g.in_degree("B") == 0
+
+def test_read_api():
+    """
+    Test get, keys, values, all_nodes, predecessors and in_degree.
+    """
+    g = CompactGraph()
+    g.add_edge("A", "B")
+    g.add_edge("B", "C")
+    g.add_edge("D", "C")
+    assert g.get("A") == ["B"]
+    assert g.get("X", "default") == "default"
+    assert g.keys() == ["A", "B", "C", "D"]
+    assert g.values() == [["B"], ["C"], [], ["C"]]
+    assert g.all_nodes() == {"A", "B", "C", "D"}
+    assert sorted(g.predecessors("C")) == ["B", "D"]
+    assert g.in_degree("C") == 2
+    assert g.num_edges == 3
+    assert len(g) == 4
+
+def test_setitem():
+    """
+    Test replacing the adjacency list of a vertex through item assignment.
+    """
+    g = CompactGraph()
+    g["A"] = ["B", "C"]
+    assert g["A"] == ["B", "C"]
+    g["A"] = ["D"]
+    assert g["A"] == ["D"]
+    assert g.has_edge("A", "D") and not g.has_edge("A", "B")
+
+def test_no_phantom_vertices():
+    """
+    Test that reading unknown vertices leaves the graph unchanged.
+    """
+    g = CompactGraph()
+    g.add_edge("A", "B")
+    version = g.version
+    assert g["X"] == []
+    assert not g.has_edge("X", "A")
+    assert g.predecessors("X") == []
+    assert "X" not in g
+    assert g.keys() == ["A", "B"]
+    assert g.version == version
+
+def test_matches_graph_under_random_changes():
+    """
+    Test that growth, relocation and compaction of the arena keep the same
+    edges as a list-backed Graph.
+    """
+    rng = random.Random(0)
+    g, reference = CompactGraph(), Graph()
+    for change in random_changes(rng, 3000, size=60):
+        apply_changes(g, [change])
+        apply_changes(reference, [change])
+        assert g.memory_usage()["unused_slots"] <= len(g._arena)
+    assert g.keys() == reference.keys()
+    assert state_of(g) == state_of(reference)
+    assert g.all_nodes() == reference.all_nodes()
+
+def test_bulk_add_edges_dedupe():
+    """
+    Test bulk insertion with and without skipping existing edges.
+    """
+    g = CompactGraph()
+    g.bulk_add_edges([("A", "B"), ("A", "B"), ("A", "C")])
+    assert g["A"] == ["B", "B", "C"]
+    g.bulk_add_edges([("A", "B"), ("A", "D")], dedupe=True)
+    assert g["A"] == ["B", "B", "C", "D"]
+
+def test_bulk_add_edges_into_a_graph():
+    """
+    Test that large loads, merged into the arena at once, append to the
+    existing blocks in order, after removals left unused space.
+    """
+    rng = random.Random(1)
+    g, reference = CompactGraph(), Graph()
+    for _ in range(5):
+        edges = [(rng.randrange(50), rng.randrange(80)) for _ in range(rng.randrange(100, 400))]
+        removed, src = rng.randrange(50), rng.randrange(50)
+        for target in (g, reference):
+            target.bulk_add_edges(edges)
+            target.remove_vertex(removed)
+            target.add_edge(src, -1)
+        assert g.keys() == reference.keys()
+        assert state_of(g) == state_of(reference)
+    assert g.num_edges == sum(map(len, reference.values()))
+
+def test_searches():
+    """
+    Test that searches and extraction give the same results as on a Graph.
+    """
+    family_edges = [("Grandma", "Mom"), ("Grandma", "Uncle"), ("Mom", "Alice"), ("Uncle", "Cousin")]
+    g, reference = CompactGraph(), Graph()
+    g.bulk_add_edges(family_edges)
+    reference.bulk_add_edges(family_edges)
+    assert dfs(g, "Grandma") == dfs(reference, "Grandma")
+    assert dfs(g, "Nobody") == set()
+    expected = extract_genealogical_subgraph(reference, "Alice")
+    assert extract_genealogical_subgraph(g, "Alice").all_nodes() == expected.all_nodes()
+    assert g.freeze()["Grandma"] == ["Mom", "Uncle"]
+
+def test_memory_usage_and_pickle():
+    """
+    Test the memory report and that the graph survives pickling.
+    """
+    g = CompactGraph()
+    g.bulk_add_edges((i, i + 1) for i in range(1000))
+    usage = g.memory_usage()
+    assert usage["total"] == usage["table"] + usage["labels"] + usage["index"] + usage["arena"]
+    assert usage["arena"] >= 4 * 1000
+    copy = pickle.loads(pickle.dumps(g))
+    assert copy[500] == [501]
+    with pytest.raises(AttributeError):
+        g.extra = 1
+
+def test_compact():
+    """
+    Test that compaction releases unused slots and keeps every edge.
+    """
+    g = CompactGraph()
+    for i in range(100):
+        g.add_edge(i % 10, i)
+    assert g.memory_usage()["unused_slots"] > 0
+    before = {vertex: g[vertex] for vertex in g.keys()}
+    g.compact()
+    assert g.memory_usage()["unused_slots"] == 0
+    assert {vertex: g[vertex] for vertex in g.keys()} == before
+    g.add_edge(0, "new")
+    assert g[0][-1] == "new"
+
+@pytest.mark.parametrize("fsync", [False, True])
+def test_save(tmp_path, fsync):
+    """
+    Test that a saved graph loads with the same edges, with and without fsync.
+    """
+    g = CompactGraph()
+    g.bulk_add_edges([("Mom", "Alice"), ("Mom", "Bob"), ("Dad", "Alice")])
+    path = tmp_path / "g.graph"
+    g.save(path, fsync=fsync)
+    assert state_of(Graph.load(path)) == state_of(g)
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from src.graph import Graph, CSRGraph
+from src.graph.searching import dfs
+from src.graph.utils import reverse, extract_genealogical_subgraph
+
+
+def build_graph():
+    g = Graph()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("B", "D")
+    g.add_edge("C", "D")
+    g.add_edge("E", "A")
+    g.add_vertex("F")
+    return g
+
+
+def test_freeze_read_api():
+    """
+    Test that a frozen graph exposes the same read API as the original.
+
+    Ensures that keys(), values(), get(), item access and all_nodes()
+    return the same results after freezing.
+    """
+    g = build_graph()
+    csr = g.freeze()
+    assert isinstance(csr, CSRGraph)
+    assert csr.keys() == g.keys()
+    assert csr.values() == g.values()
+    assert csr.all_nodes() == g.all_nodes()
+    assert csr["A"] == ["B", "C"]
+    assert csr.get("D") == []
+    assert csr.get("X", "default") == "default"
+    assert csr["X"] == []
+    assert "X" not in csr.keys()
+    assert csr.num_edges == 5
+
+def test_freeze_arrays():
+    """
+    Test the CSR arrays of a frozen graph.
+
+    Verifies that offsets and neighbour ids are stored in compact
+    integer arrays and that labels map to ids and back.
+    """
+    csr = build_graph().freeze()
+    assert csr.indptr.dtype == np.int32
+    assert csr.indices.dtype == np.int32
+    assert csr.indptr.tolist() == [0, 2, 3, 4, 4, 5, 5]
+    assert csr.label_of(csr.id_of("C")) == "C"
+    assert csr.id_of("X") == -1
+    assert csr.labels_of(csr.neighbor_ids(csr.id_of("A"))) == ["B", "C"]
+
+def test_freeze_integer_labels():
+    """
+    Test freezing a graph with integer labels.
+
+    Ensures that integer labels round-trip through the array-backed
+    label table, including destinations set without being keys.
+    """
+    g = Graph()
+    g.add_edge(10, 3)
+    g.add_edge(3, 7)
+    g[7] = [42]
+    csr = g.freeze()
+    assert csr.keys() == [10, 3, 7]
+    assert csr.values() == [[3], [7], [42]]
+    assert csr.all_nodes() == {3, 7, 10, 42}
+    assert csr.get(42, "missing") == "missing"
+    assert csr[42] == []
+    assert csr.id_of("10") == -1
+
+def test_dfs_on_frozen_graph():
+    """
+    Test that dfs gives the same result on a frozen graph.
+    """
+    g = build_graph()
+    csr = g.freeze()
+    for vertex in g.keys():
+        assert dfs(csr, vertex) == dfs(g, vertex)
+
+def test_reverse_frozen_graph():
+    """
+    Test reversing a frozen graph.
+
+    Verifies that the transpose reverses every edge and is cached.
+    """
+    g = build_graph()
+    csr = g.freeze()
+    reversed_csr = reverse(csr)
+    reversed_g = reverse(g)
+    for vertex in g.all_nodes():
+        assert sorted(reversed_csr[vertex]) == sorted(reversed_g[vertex])
+    assert reverse(csr) is reversed_csr
+    assert reversed_csr.transpose() is csr
+
+def test_extract_genealogical_subgraph_on_frozen_graph():
+    """
+    Test extracting a genealogical subgraph from a frozen graph.
+    """
+    g = build_graph()
+    expected = extract_genealogical_subgraph(g, "B")
+    result = extract_genealogical_subgraph(g.freeze(), "B")
+    edges = lambda sub: {(src, dst) for src in sub.keys() for dst in sub[src]}
+    assert edges(result) == edges(expected)
+
+def test_invalid_arrays():
+    """
+    Test that mismatched CSR arrays are rejected.
+    """
+    with pytest.raises(ValueError):
+        CSRGraph(np.array([0, 1]), np.array([0]), ["A", "B"])
@@ -1,5 +1,8 @@
+import random
+
 import pytest
-from src.graph.searching import dfs
+from src.graph import Graph
+from src.graph.searching import dfs, dfs_many, iter_dfs
 
 def test_dfs_typical_graph():
     """
@@ -86,3 +89,65 @@ def test_dfs_graph_with_multiple_edges():
     result = dfs(G, 'A')
     expected = {'A', 'B', 'C'}
     assert result == expected, f"Expected {expected}, got {result}"
+
+def test_dfs_many_matches_dfs():
+    """
+    Test that dfs_many returns, for every source, the same set as dfs.
+
+    Uses random graphs with cycles and parallel edges, small batches so
+    that several passes are needed, and the frozen form of each graph.
+    """
+    for seed in range(5):
+        rng = random.Random(seed)
+        g = Graph()
+        for vertex in range(80):
+            g.add_vertex(vertex)
+        for _ in range(120):
+            g.add_edge(rng.randrange(80), rng.randrange(80))
+        sources = list(range(80)) + [3, "missing"]
+        expected = {source: dfs(g, source) for source in sources}
+        assert dfs_many(g, sources, batch_size=7) == expected
+        assert dfs_many(g.freeze(), sources) == expected
+
+def test_dfs_many_dict_graph():
+    """
+    Test dfs_many on a plain adjacency dictionary.
+    """
+    G = {'A': ['C'], 'B': ['C'], 'C': ['D'], 'D': ['C'], 'E': []}
+    result = dfs_many(G, ['A', 'B', 'E', 'X'])
+    assert result == {
+        'A': {'A', 'C', 'D'},
+        'B': {'B', 'C', 'D'},
+        'E': {'E'},
+        'X': set(),
+    }
+
+def test_iter_dfs_order_and_limits():
+    """
+    Test that iter_dfs yields vertices in pre-order and honours its limits.
+    """
+    G = {'A': ['B', 'C'], 'B': ['D'], 'C': ['D', 'E'], 'D': ['A'], 'E': []}
+    assert list(iter_dfs(G, 'A')) == ['A', 'B', 'D', 'C', 'E']
+    assert set(iter_dfs(G, 'A')) == dfs(G, 'A')
+    assert list(iter_dfs(G, 'A', max_depth=1)) == ['A', 'B', 'C']
+    assert list(iter_dfs(G, 'A', max_nodes=2)) == ['A', 'B']
+    assert list(iter_dfs(G, 'A', until=lambda v: v == 'D')) == ['A', 'B', 'D']
+    assert list(iter_dfs(G, 'A', edges=True, max_depth=2)) == [
+        (None, 'A', 0), ('A', 'B', 1), ('B', 'D', 2), ('A', 'C', 1), ('C', 'E', 2),
+    ]
+    assert list(iter_dfs(G, 'X')) == []
+
+def test_iter_dfs_is_lazy():
+    """
+    Test that iter_dfs only reads the adjacency lists it needs.
+    """
+    class CountingGraph(dict):
+        reads = 0
+
+        def get(self, vertex, default=None):
+            CountingGraph.reads += 1
+            return super().get(vertex, default)
+
+    G = CountingGraph({v: [v + 1] for v in range(1000)})
+    assert next(v for v in iter_dfs(G, 0) if v == 3) == 3
+    assert CountingGraph.reads <= 4
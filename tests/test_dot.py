@@ -0,0 +1,129 @@
+import io
+import re
+
+import pytest
+from src.graph import Graph
+from src.plot.dot import dot_statements, write_dot
+
+
+@pytest.fixture
+def family():
+    g = Graph()
+    g.bulk_add_edges([
+        ("Grandma", "Mom"), ("Grandma", "Uncle"), ("Uncle", "Cousin1"), ("Uncle", "Cousin2"),
+        ("Cousin1", "Baby"), ("Mom", "Alice"), ("Alice", "Kid"),
+    ])
+    return g
+
+
+def edges_in(statements):
+    return set(re.findall(r'^\t"([^"]*)" -> "([^"]*)"', "".join(statements), re.M))
+
+
+def nodes_in(statements):
+    text = "".join(statements)
+    return set(re.findall(r'"([^"]*)"', text)) - {"dashed", "filled,dashed"} - {
+        label for label in re.findall(r'label="([^"]*)"', text)}
+
+
+def test_write_dot_whole_graph(family):
+    """
+    Test that every edge is written, with labels, inside a digraph declaring the styles once.
+    """
+    out = io.StringIO()
+    write_dot(family, out, name="family")
+    text = out.getvalue()
+    assert text.startswith('digraph "family" {\n\tnode [shape="box"')
+    assert text.endswith("}\n")
+    assert edges_in([text]) == {(src, dst) for src in family.keys() for dst in family[src]}
+    assert '"Mom" -> "Alice" [label="Mom → Alice"]' in text
+
+
+def test_write_dot_to_path(family, tmp_path):
+    """
+    Test writing to a file path, given as a string or a path object.
+    """
+    path = tmp_path / "family.dot"
+    write_dot(family, str(path), edge_labels=False)
+    text = path.read_text(encoding="utf-8")
+    assert "label" not in text
+    assert '"Alice" -> "Kid"' in text
+    path.unlink()
+    write_dot(family, path, edge_labels=False)
+    assert path.read_text(encoding="utf-8") == text
+
+
+def test_focus_and_hops(family):
+    """
+    Test that only vertices within `hops` edges of the focus, in both directions, are drawn.
+    """
+    statements = list(dot_statements(family, focus="Mom", hops=1))
+    assert edges_in(statements) == {("Grandma", "Mom"), ("Mom", "Alice")}
+    assert '\t"Alice" [style="filled,dashed"]\n' in statements
+    assert '\t"Grandma" [style="filled,dashed"]\n' in statements
+    assert "Kid" not in "".join(statements)
+
+
+def test_max_nodes(family):
+    """
+    Test that the node budget bounds the drawing, with or without a focus.
+    """
+    assert len(nodes_in(dot_statements(family, focus="Alice", max_nodes=3))) == 3
+    assert len(nodes_in(dot_statements(family, max_nodes=4))) == 4
+    assert nodes_in(dot_statements(family, focus="Alice", max_nodes=1)) == {"Alice"}
+
+
+def test_collapse(family):
+    """
+    Test that collapsed descendants become one summary node in a cluster with their root.
+    """
+    statements = list(dot_statements(family, collapse=["Uncle"]))
+    text = "".join(statements)
+    assert "Cousin1" not in text and "Baby" not in text
+    assert ("Uncle", "collapsed 0") in edges_in(statements)
+    assert 'subgraph "cluster_0" {' in text
+    assert 'label="3 descendants"' in text
+
+
+def test_nested_collapse(family):
+    """
+    Test that a collapsed vertex inside another collapsed subtree is folded into it.
+    """
+    text = "".join(dot_statements(family, collapse=["Cousin1", "Grandma"]))
+    assert text.count("subgraph") == 1
+    assert 'label="7 descendants"' in text
+
+
+def test_collapse_with_focus(family):
+    """
+    Test that collapsed subtrees are not walked through by the neighborhood.
+    """
+    statements = list(dot_statements(family, focus="Grandma", collapse=["Uncle"]))
+    assert edges_in(statements) == {
+        ("Grandma", "Mom"), ("Grandma", "Uncle"), ("Uncle", "collapsed 0"), ("Mom", "Alice"), ("Alice", "Kid")}
+    with pytest.raises(ValueError):
+        list(dot_statements(family, focus="Baby", collapse=["Uncle"]))
+
+
+def test_quoting():
+    """
+    Test that quotes and backslashes in vertex names are escaped.
+    """
+    g = Graph()
+    g.add_edge('say "hi"', "back\\slash")
+    text = "".join(dot_statements(g, edge_labels=False))
+    assert text.startswith('\t"say \\"hi\\"" -> "back\\\\slash"\n')
+
+
+def test_invalid_options(family):
+    """
+    Test the option checks.
+    """
+    with pytest.raises(ValueError):
+        list(dot_statements(family, hops=2))
+    with pytest.raises(ValueError):
+        list(dot_statements(family, focus="Mom", hops=-1))
+    with pytest.raises(ValueError):
+        list(dot_statements(family, max_nodes=0))
+    with pytest.raises(KeyError):
+        list(dot_statements(family, focus="Stranger"))
@@ -0,0 +1,87 @@
+import gc
+
+import pytest
+from src.graph import Graph, CSRGraph
+from src.graph.edgelist import iter_edge_chunks
+
+
+def test_bulk_add_edges():
+    """
+    Test that bulk_add_edges builds the same graph as add_edge.
+
+    Ensures that vertex order, neighbour order and the reverse index
+    match, and that duplicates are skipped when requested.
+    """
+    edges = [("A", "B"), ("C", "A"), ("A", "B"), ("B", "D")]
+    expected = Graph(reverse_index=True)
+    for src, dst in edges:
+        expected.add_edge(src, dst)
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges(edges)
+    assert g.keys() == expected.keys()
+    assert g.values() == expected.values()
+    assert g.predecessors("B") == ["A", "A"]
+
+    g = Graph()
+    g.bulk_add_edges(edges, dedupe=True)
+    assert g["A"] == ["B"]
+
+def test_from_edgelist_file(tmp_path):
+    """
+    Test loading a TSV file with a header, comments and blank lines.
+    """
+    path = tmp_path / "parents.tsv"
+    path.write_text("parent\tchild\n# comment\n1\t2\n\n1\t3\n2\t4\n")
+    g = Graph.from_edgelist(path, skip_header=True, convert=int, reverse_index=True)
+    assert g.keys() == [1, 2, 3, 4]
+    assert g.values() == [[2, 3], [4], [], []]
+    assert g.reverse_index
+
+def test_from_edgelist_chunks_and_freeze():
+    """
+    Test that loading in small chunks and loading straight into a CSR
+    graph give the same result as loading everything at once.
+    """
+    lines = [f"p{i % 7} c{i}" for i in range(50)] + ["p1 c1", "p1 c1"]
+    g = Graph.from_edgelist(lines, chunk_size=4)
+    assert g.values() == Graph.from_edgelist(lines).values()
+    csr = Graph.from_edgelist(lines, chunk_size=4, freeze=True)
+    assert isinstance(csr, CSRGraph)
+    assert csr.keys() == g.keys()
+    assert csr.values() == g.values()
+    deduped = Graph.from_edgelist(lines, dedupe=True, freeze=True)
+    assert deduped.values() == Graph.from_edgelist(lines, dedupe=True).values()
+    assert deduped["p1"].count("c1") == 1
+    with pytest.raises(TypeError):
+        Graph.from_edgelist(lines, freeze=True, reverse_index=True)
+
+
+def test_from_edgelist_pause_gc():
+    """
+    Test that the garbage collector is only paused on request, and is
+    enabled again once the load is done.
+    """
+    seen = []
+    lines = (seen.append(gc.isenabled()) or f"p c{i}" for i in range(3))
+    Graph.from_edgelist(lines)
+    assert seen == [True] * 3
+    seen.clear()
+    lines = (seen.append(gc.isenabled()) or f"p c{i}" for i in range(3))
+    g = Graph.from_edgelist(lines, pause_gc=True)
+    assert seen == [False] * 3
+    assert gc.isenabled()
+    assert g["p"] == ["c0", "c1", "c2"]
+
+def test_iter_edge_chunks():
+    """
+    Test the chunked edge list parser.
+
+    Verifies chunk sizes, label interning, CSV delimiters and that
+    malformed lines are reported.
+    """
+    chunks = list(iter_edge_chunks(["a,b", "b,c", "a,c"], delimiter=",", chunk_size=2))
+    assert chunks == [(["a", "b"], ["b", "c"]), (["a"], ["c"])]
+    assert chunks[0][0][0] is chunks[1][0][0]
+    assert list(iter_edge_chunks([(1, 2)])) == [([1], [2])]
+    with pytest.raises(ValueError):
+        list(iter_edge_chunks(["a"]))
@@ -0,0 +1,82 @@
+import pytest
+from src.graph import Graph
+from src.graph.utils import extract_genealogical_subgraph
+
+
+def edges(graph):
+    return {(src, dst) for src in graph.keys() for dst in graph[src]}
+
+
+def family():
+    """
+    grandpa -> dad -> me -> son -> grandson
+    grandpa -> uncle -> cousin -> cousin_son
+    grandma -> dad
+    mom -> me, mom -> sister
+    stranger -> stranger_child
+    """
+    g = Graph()
+    g.add_edge("grandpa", "dad")
+    g.add_edge("grandma", "dad")
+    g.add_edge("grandpa", "uncle")
+    g.add_edge("uncle", "cousin")
+    g.add_edge("cousin", "cousin_son")
+    g.add_edge("dad", "me")
+    g.add_edge("mom", "me")
+    g.add_edge("mom", "sister")
+    g.add_edge("me", "son")
+    g.add_edge("son", "grandson")
+    g.add_edge("stranger", "stranger_child")
+    return g
+
+
+def test_extract_full_tree():
+    """
+    Test extracting the whole genealogical tree of a vertex.
+
+    Ensures that ancestors, descendants and the descendants of every
+    ancestor are included, while unrelated vertices are not.
+    """
+    sub = extract_genealogical_subgraph(family(), "me")
+    assert sub.all_nodes() == {
+        "grandpa", "grandma", "dad", "mom", "uncle", "cousin", "cousin_son",
+        "me", "sister", "son", "grandson",
+    }
+    assert ("grandpa", "uncle") in edges(sub)
+    assert ("mom", "sister") in edges(sub)
+
+def test_extract_with_depth():
+    """
+    Test limiting the extracted tree to a number of generations.
+
+    Verifies that a depth of one keeps parents, children and siblings,
+    and that cousins appear once grandparents are in range.
+    """
+    g = family()
+    sub = extract_genealogical_subgraph(g, "me", depth=1)
+    assert sub.all_nodes() == {"dad", "mom", "me", "sister", "son"}
+    sub = extract_genealogical_subgraph(g, "me", depth=2)
+    assert {"grandpa", "uncle", "cousin", "grandson"} <= sub.all_nodes()
+    assert "cousin_son" in sub.all_nodes()
+    assert edges(extract_genealogical_subgraph(g, "me", depth=0)) == set()
+
+def test_extract_with_reverse_index_and_cycles():
+    """
+    Test extraction on an indexed graph containing a cycle.
+    """
+    g = Graph(reverse_index=True)
+    g.add_edge("A", "B")
+    g.add_edge("B", "C")
+    g.add_edge("C", "A")
+    g.add_edge("D", "B")
+    sub = extract_genealogical_subgraph(g, "B")
+    assert edges(sub) == {("A", "B"), ("B", "C"), ("C", "A"), ("D", "B")}
+
+def test_extract_unknown_vertex():
+    """
+    Test extracting the tree of a vertex that is not in the graph.
+    """
+    sub = extract_genealogical_subgraph(family(), "nobody")
+    assert sub.keys() == []
+    with pytest.raises(ValueError):
+        extract_genealogical_subgraph(family(), "me", depth=-1)
@@ -185,3 +185,121 @@ def test_getitem():
     g.add_edge("A", "B")
     assert g["A"] == ["B"]
     assert g["B"] == []
+
+def test_predecessors():
+    """
+    Test retrieving the predecessors of a vertex.
+
+    Ensures that predecessors() and in_degree() report the same
+    incoming edges with and without a reverse index.
+    """
+    for reverse_index in (False, True):
+        g = Graph(reverse_index=reverse_index)
+        g.add_edge("A", "C")
+        g.add_edge("B", "C")
+        g.add_edge("B", "C")
+        assert sorted(g.predecessors("C")) == ["A", "B", "B"]
+        assert g.in_degree("C") == 3
+        assert g.predecessors("A") == []
+        assert g.in_degree("X") == 0
+
+def test_reverse_index_follows_mutations():
+    """
+    Test that the reverse index is kept in sync with the adjacency lists.
+
+    Verifies that removing edges and vertices, and replacing an
+    adjacency list through item assignment, update the predecessors.
+    """
+    g = Graph(reverse_index=True)
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("C", "B")
+    g.remove_edge("A", "B")
+    assert g.predecessors("B") == ["C"]
+    g["A"] = ["B"]
+    assert g.predecessors("B") == ["C", "A"]
+    assert g.predecessors("C") == []
+    g.remove_vertex("B")
+    assert g["A"] == []
+    assert g["C"] == []
+    assert g.in_degree("B") == 0
+
+@pytest.mark.parametrize("reverse_index", [False, True])
+def test_remove_vertex_parallel_edges(reverse_index):
+    """
+    Test removing a vertex with self-loops and parallel edges.
+
+    Ensures that every edge touching the removed vertex disappears,
+    with or without the reverse index.
+    """
+    g = Graph(reverse_index=reverse_index)
+    g.add_edge("A", "B")
+    g.add_edge("A", "B")
+    g.add_edge("B", "B")
+    g.add_edge("B", "C")
+    g.add_edge("C", "B")
+    g.add_edge("C", "A")
+    g.add_edge("C", "B")
+    g.remove_vertex("B")
+    assert set(g.keys()) == {"A", "C"}
+    assert g["A"] == []
+    assert g["C"] == ["A"]
+    assert g.predecessors("C") == []
+    assert g.predecessors("A") == ["C"]
+
+def test_set_adjacency():
+    """
+    Test the set-backed adjacency storage mode.
+
+    Ensures that neighbours keep their insertion order, are exposed
+    as lists, and that parallel edges collapse into a single edge.
+    """
+    g = Graph(adjacency="set")
+    g.add_edge("A", "C")
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    assert g["A"] == ["C", "B"]
+    assert g.get("A") == ["C", "B"]
+    assert g.values() == [["C", "B"], [], []]
+    assert g.has_edge("A", "B")
+    assert not g.has_edge("B", "A")
+    g.remove_edge("A", "C")
+    assert g["A"] == ["B"]
+    g["B"] = ["A", "A"]
+    assert g["B"] == ["A"]
+
+def test_set_adjacency_remove_vertex():
+    """
+    Test removing vertices from a set-backed graph.
+
+    Verifies that removal drops incoming and outgoing edges with and
+    without a reverse index.
+    """
+    for reverse_index in (False, True):
+        g = Graph(reverse_index=reverse_index, adjacency="set")
+        g.add_edge("A", "B")
+        g.add_edge("B", "C")
+        g.add_edge("C", "B")
+        g.remove_vertex("B")
+        assert g.all_nodes() == {"A", "C"}
+        assert g["A"] == []
+        assert g["C"] == []
+        assert g.in_degree("C") == 0
+
+def test_invalid_adjacency():
+    """
+    Test that an unknown adjacency mode is rejected.
+    """
+    with pytest.raises(ValueError):
+        Graph(adjacency="tuple")
+
+def test_has_edge():
+    """
+    Test checking for edges in the default list-backed graph.
+    """
+    g = Graph()
+    g.add_edge("A", "B")
+    assert g.has_edge("A", "B")
+    assert not g.has_edge("A", "C")
+    assert not g.has_edge("X", "A")
+    assert "X" not in g._graph
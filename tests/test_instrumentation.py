@@ -0,0 +1,108 @@
+import json
+import pstats
+
+from src.graph import Graph
+from src.graph.cache import SubgraphCache
+from src.graph.instrumentation import Recorder, active, record
+from src.graph.searching import dfs
+from src.graph.utils import extract_genealogical_subgraph, reverse
+
+
+def build_graph():
+    g = Graph()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("B", "D")
+    g.add_edge("C", "D")
+    g.add_edge("E", "A")
+    return g
+
+
+def test_nothing_recorded_by_default():
+    """
+    Test that operations outside a recording leave no active recorder behind.
+    """
+    assert active() is None
+    with record() as recorder:
+        assert active() is recorder
+    assert active() is None
+    build_graph()
+    assert recorder.as_dict() == {"counters": {}, "maxima": {}, "timings": {}}
+
+def test_record_dfs_counters():
+    """
+    Test the counters and stack high-water mark of a recorded dfs.
+    """
+    g = build_graph()
+    with record() as recorder:
+        assert dfs(g, "E") == {"A", "B", "C", "D", "E"}
+    assert recorder.counters["dfs.vertices_visited"] == 5
+    assert recorder.counters["dfs.edges_scanned"] == 5
+    assert recorder.maxima["dfs.stack"] == 4
+    assert recorder.timings["dfs"][0] == 1
+
+def test_record_mutations_and_extraction():
+    """
+    Test that edge inserts, removals and nested operations are all recorded.
+    """
+    with record() as recorder:
+        g = build_graph()
+        g.bulk_add_edges([("D", "F"), ("D", "F")], dedupe=True)
+        extract_genealogical_subgraph(g, "B")
+        g.remove_vertex("F")
+        g.remove_vertex("missing")
+    counters = recorder.counters
+    assert counters["extract_genealogical_subgraph.vertices"] == 6
+    # 6 edges building the graph, 6 in the reversed copy, 6 in the subgraph.
+    assert counters["Graph.edges_added"] == 18
+    assert counters["Graph.vertices_removed"] == 1
+    assert recorder.timings["Graph.remove_vertex"][0] == 2
+    assert recorder.timings["reverse"][0] == 1
+    assert recorder.timings["extract_genealogical_subgraph"][0] == 1
+
+def test_record_cache_events():
+    """
+    Test that subgraph cache hits, misses and evictions are counted.
+    """
+    g = build_graph()
+    cache = SubgraphCache(g, maxsize=1)
+    with record() as recorder:
+        cache.get("A")
+        cache.get("A")
+        cache.get("B")
+    assert recorder.counters["SubgraphCache.hits"] == 1
+    assert recorder.counters["SubgraphCache.misses"] == 2
+    assert recorder.counters["SubgraphCache.evictions"] == 1
+
+def test_export(tmp_path):
+    """
+    Test the JSON export and the cProfile-compatible stats.
+    """
+    recorder = Recorder()
+    g = build_graph()
+    for _ in range(2):
+        with record(recorder):
+            reverse(g)
+    data = json.loads(recorder.to_json())
+    assert data["timings"]["reverse"]["calls"] == 2
+
+    stats = pstats.Stats(recorder)
+    assert [key[2] for key in stats.stats] == ["reverse"]
+    path = tmp_path / "graph.prof"
+    recorder.dump_stats(path)
+    assert pstats.Stats(str(path)).total_calls == 2
+
+    recorder.reset()
+    assert recorder.as_dict()["timings"] == {}
+
+def test_nested_recordings():
+    """
+    Test that a nested recording takes over and then hands back.
+    """
+    g = build_graph()
+    with record() as outer:
+        with record() as inner:
+            dfs(g, "A")
+        dfs(g, "B")
+    assert inner.timings["dfs"][0] == 1
+    assert outer.timings["dfs"][0] == 1
@@ -0,0 +1,147 @@
+import pickle
+import random
+import tracemalloc
+
+import pytest
+from conftest import apply_changes, random_changes, state_of
+from src.graph import Graph, InternedGraph
+from src.graph.searching import dfs, dfs_many, iter_bfs, topological_sort
+from src.graph.utils import reverse, extract_genealogical_subgraph
+
+
+def build(cls):
+    g = cls()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("B", "D")
+    g.add_edge("C", "D")
+    g.add_edge("E", "A")
+    g.add_vertex("F")
+    return g
+
+
+def test_interned_read_api():
+    """
+    Test that an interned graph answers the read API like a Graph.
+    """
+    g, interned = build(Graph), build(InternedGraph)
+    assert interned.keys() == g.keys()
+    assert interned.values() == g.values()
+    assert interned.all_nodes() == g.all_nodes()
+    assert interned["A"] == ["B", "C"]
+    assert interned.get("X", "default") == "default"
+    assert "X" not in interned
+    assert interned.has_edge("A", "C") and not interned.has_edge("C", "A")
+    assert interned.predecessors("D") == ["B", "C"]
+    assert interned.in_degree("D") == 2
+    assert interned.label_of(interned.id_of("C")) == "C"
+
+def test_interned_matches_graph_under_random_operations():
+    """
+    Test that random edits leave an interned graph equal to a Graph given the same edits.
+    """
+    rng = random.Random(0)
+    g, interned = Graph(), InternedGraph()
+    for change in random_changes(rng, 500):
+        apply_changes(g, [change])
+        apply_changes(interned, [change])
+        assert interned.keys() == g.keys()
+    assert state_of(interned) == state_of(g)
+    assert interned.all_nodes() == g.all_nodes()
+    for vertex in g.keys():
+        assert dfs(interned, vertex) == dfs(g, vertex)
+
+def test_interned_phantom_read_and_version():
+    """
+    Test that reading an unknown vertex adds it, as Graph does, and bumps the version.
+    """
+    g = InternedGraph()
+    g.add_edge(1, 2)
+    version = g.version
+    assert g[3] == []
+    assert g.keys() == [1, 2, 3]
+    assert g.version > version
+    version = g.version
+    g.remove_edge(5, 6)
+    g.add_vertex(1)
+    assert g.version == version
+
+def test_interned_with_library_functions():
+    """
+    Test that searches, reversal, extraction and freezing accept an interned graph.
+    """
+    g, interned = build(Graph), build(InternedGraph)
+    assert dfs(interned, "E") == dfs(g, "E")
+    assert dfs(interned, "X") == set()
+    assert dfs_many(interned, ["A", "E"]) == dfs_many(g, ["A", "E"])
+    assert list(iter_bfs(interned, "E")) == list(iter_bfs(g, "E"))
+    assert topological_sort(interned) == topological_sort(g)
+    assert reverse(interned)["D"] == ["B", "C"]
+    sub = extract_genealogical_subgraph(interned, "B")
+    assert sub.all_nodes() == extract_genealogical_subgraph(g, "B").all_nodes()
+    frozen = interned.freeze()
+    assert frozen.keys() == g.keys()
+    assert frozen.values() == g.values()
+
+def test_interned_bulk_add_edges():
+    """
+    Test bulk insertion with and without deduplication.
+    """
+    g = InternedGraph()
+    g.bulk_add_edges([("A", "B"), ("A", "B"), ("B", "C")], dedupe=True)
+    assert g.values() == [["B"], ["C"], []]
+    g.bulk_add_edges([("A", "B")])
+    assert g["A"] == ["B", "B"]
+
+def test_graph_intern_option():
+    """
+    Test that ``Graph(intern=True)`` builds an interned graph, also through
+    `from_edgelist`, and refuses options an interned graph does not have.
+    """
+    g = Graph(intern=True)
+    assert isinstance(g, InternedGraph)
+    assert isinstance(Graph.from_edgelist(["A B"], intern=True), InternedGraph)
+    assert type(Graph(intern=False)) is Graph
+    with pytest.raises(ValueError):
+        Graph(reverse_index=True, intern=True)
+    with pytest.raises(ValueError):
+        Graph(adjacency="set", intern=True)
+
+def test_interned_pickle_and_removal_order():
+    """
+    Test that keys keep their order through removals, re-additions and
+    pickling, and that the unpickled graph maps labels to the same ids.
+    """
+    g = InternedGraph()
+    g.bulk_add_edges((f"v{i}", f"v{i + 1}") for i in range(10))
+    g.remove_vertex("v3")
+    g.remove_vertex("v7")
+    g.add_edge("v3", "v0")
+    assert len(g) == 10
+    expected = [f"v{i}" for i in range(11) if i not in (3, 7)] + ["v3"]
+    assert g.keys() == expected
+    copy = pickle.loads(pickle.dumps(g))
+    assert copy.keys() == expected
+    assert copy.values() == g.values()
+    assert copy.id_of("v5") == g.id_of("v5")
+    assert copy.predecessors("v0") == ["v3"]
+    assert copy.memory_usage()["total"] > 0
+
+def test_interned_uses_less_memory_than_graph():
+    """
+    Test that an interned graph of string labels allocates less than a
+    list-backed Graph with the same edges.
+    """
+    labels = [f"person-{i:08d}" for i in range(20000)]
+    rng = random.Random(0)
+    edges = [(labels[rng.randrange(i)], labels[i]) for i in range(1, len(labels)) for _ in range(2)]
+    sizes = {}
+    for cls in (Graph, InternedGraph):
+        tracemalloc.start()
+        g = cls()
+        for src, dst in edges:
+            g.add_edge(src, dst)
+        sizes[cls] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del g
+    assert sizes[InternedGraph] < sizes[Graph]
@@ -0,0 +1,213 @@
+import os
+import random
+from contextlib import nullcontext
+
+import pytest
+from conftest import apply_changes, random_changes, state_of
+from src.graph import Graph
+from src.graph.journal import Journal
+
+
+def log_path(directory, journal):
+    return os.path.join(directory, f"journal-{journal.generation}.log")
+
+
+@pytest.mark.parametrize("options", [{}, {"reverse_index": True}, {"adjacency": "set"}])
+def test_replay_restores_the_graph(tmp_path, options):
+    """
+    Test that reopening a journal restores the graph exactly, through
+    random changes of every kind, batches and checkpoints.
+    """
+    rng = random.Random(3)
+    journal = Journal.open(tmp_path, max_pending=7, **options)
+    graph = journal.graph
+    for round in range(4):
+        for step in range(20):
+            changes = random_changes(rng, 10)
+            with graph.batch() if step % 4 == 0 else nullcontext():
+                apply_changes(graph, changes)
+        if round == 1:
+            journal.checkpoint()
+        expected = graph.keys(), state_of(graph)
+        journal.close()
+        journal = Journal.open(tmp_path, max_pending=7, **options)
+        graph = journal.graph
+        assert (graph.keys(), state_of(graph)) == expected, round
+
+
+def test_vertex_labels(tmp_path):
+    """
+    Test that integer, string and pickled labels survive the log.
+    """
+    labels = [0, -1, 2**63 - 1, 2**70, "Ann", "", "Zoë\n", ("Ann", 1), True, None, 2.5]
+    with Journal.open(tmp_path) as journal:
+        for src, dst in zip(labels, labels[1:]):
+            journal.graph.add_edge(src, dst)
+    with Journal.open(tmp_path) as journal:
+        edges = [(src, dst) for src in journal.graph.keys() for dst in journal.graph[src]]
+        assert edges == list(zip(labels, labels[1:]))
+        assert type(journal.graph.keys()[8]) is bool
+
+
+def test_group_commit(tmp_path):
+    """
+    Test that records are buffered until `max_pending` of them wait or
+    `flush` is called, and are then written in one frame.
+    """
+    journal = Journal.open(tmp_path, max_pending=3, max_delay=60)
+    empty = journal.log_size
+    journal.graph.add_edge(1, 2)
+    journal.graph.add_edge(2, 3)
+    assert journal.pending == 2
+    assert os.path.getsize(log_path(tmp_path, journal)) == empty
+    journal.graph.add_edge(3, 4)
+    assert journal.pending == 0
+    assert os.path.getsize(log_path(tmp_path, journal)) == journal.log_size > empty
+
+    journal.graph.remove_vertex(4)
+    journal.flush()
+    assert journal.pending == 0
+    journal.close()
+    assert state_of(Journal.open(tmp_path).graph) == {1: [2], 2: [3], 3: []}
+
+
+def test_max_delay(tmp_path):
+    """
+    Test that a zero delay writes every change at once.
+    """
+    journal = Journal.open(tmp_path, max_delay=0)
+    journal.graph.add_edge(1, 2)
+    assert journal.pending == 0
+
+
+def test_torn_frame_is_dropped(tmp_path):
+    """
+    Test that a frame cut short by a crash, or corrupted, is ignored on
+    recovery and cut off so that new frames follow the last good one.
+    """
+    journal = Journal.open(tmp_path)
+    journal.graph.add_edge('A', 'B')
+    journal.flush()
+    good = journal.log_size
+    journal.graph.add_edge('B', 'C')
+    journal.flush()
+    path = log_path(tmp_path, journal)
+    # Simulate a crash: the journal is abandoned without closing.
+    journal._log.close()
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    journal = Journal.open(tmp_path)
+    assert state_of(journal.graph) == {'A': ['B'], 'B': []}
+    assert os.path.getsize(path) == good
+    journal.graph.add_edge('B', 'D')
+    journal.close()
+
+    with open(path, "r+b") as f:
+        f.seek(good + 10)
+        f.write(b"\xff")
+    assert state_of(Journal.open(tmp_path).graph) == {'A': ['B'], 'B': []}
+
+
+def test_checkpoint_compacts_the_log(tmp_path):
+    """
+    Test that a checkpoint empties the log and removes the previous
+    generation, and that `max_log_size` triggers checkpoints.
+    """
+    journal = Journal.open(tmp_path, max_pending=1)
+    empty = journal.log_size
+    for i in range(100):
+        journal.graph.add_edge(i, i + 1)
+    assert journal.log_size > empty
+    journal.checkpoint()
+    assert journal.generation == 2
+    assert journal.log_size == empty
+    assert sorted(os.listdir(tmp_path)) == ["checkpoint-2.graph", "journal-2.log"]
+    journal.close()
+
+    journal = Journal.open(tmp_path, max_pending=1, max_log_size=1000)
+    for i in range(100, 200):
+        journal.graph.add_edge(i, i + 1)
+    assert journal.generation > 2
+    assert journal.log_size <= 1000
+    journal.close()
+    assert len(Journal.open(tmp_path).graph.keys()) == 201
+
+
+@pytest.mark.parametrize("options", [{}, {"reverse_index": True}])
+def test_checkpoint_during_bulk_add_edges(tmp_path, options):
+    """
+    Test that a checkpoint due while `bulk_add_edges` reports its edges
+    does not log the edges it already holds a second time.
+    """
+    journal = Journal.open(tmp_path, max_pending=1, max_log_size=150, **options)
+    journal.graph.bulk_add_edges([(i, i + 100) for i in range(8)])
+    expected = state_of(journal.graph)
+    journal.close()
+    assert journal.generation > 1
+    assert state_of(Journal.open(tmp_path, **options).graph) == expected
+
+
+@pytest.mark.parametrize("options", [{}, {"reverse_index": True}, {"adjacency": "set"}])
+def test_recovery_with_frequent_checkpoints(tmp_path, options):
+    """
+    Test that the graph recovered after a crash equals the live one when
+    checkpoints fall in the middle of bulk additions, vertex removals and
+    batches.
+    """
+    rng = random.Random(5)
+    journal = Journal.open(tmp_path, max_pending=1, max_log_size=400, **options)
+    for step in range(60):
+        graph = journal.graph
+        with graph.batch() if step % 3 == 0 else nullcontext():
+            apply_changes(graph, random_changes(rng, 5))
+            graph.bulk_add_edges([(rng.randrange(30), rng.randrange(30)) for _ in range(10)])
+        # Every record is written at once, so reopening the directory
+        # without closing the journal recovers what a crash would.
+        graph.unsubscribe(journal)
+        recovered = Journal.open(tmp_path, max_pending=1, max_log_size=400, **options)
+        assert (recovered.graph.keys(), state_of(recovered.graph)) == (graph.keys(), state_of(graph)), step
+        journal = recovered
+    assert journal.generation > 10
+    journal.close()
+
+
+def test_crash_during_checkpoint(tmp_path):
+    """
+    Test recovery when a checkpoint was saved but its log was never
+    created, with the previous generation still on disk.
+    """
+    journal = Journal.open(tmp_path)
+    journal.graph.add_edge(1, 2)
+    journal.flush()
+    journal.graph.freeze().save(os.path.join(tmp_path, "checkpoint-2.graph"))
+    journal._log.close()
+
+    journal = Journal.open(tmp_path)
+    assert journal.generation == 2
+    assert state_of(journal.graph) == {1: [2], 2: []}
+    assert sorted(os.listdir(tmp_path)) == ["checkpoint-2.graph", "journal-2.log"]
+
+
+def test_open_with_graph(tmp_path):
+    """
+    Test that an existing graph is saved as the first checkpoint, and that
+    a directory holding a graph refuses another one.
+    """
+    graph = Graph()
+    graph.add_edge('A', 'B')
+    Journal.open(tmp_path, graph=graph).close()
+    assert state_of(Journal.open(tmp_path).graph) == {'A': ['B'], 'B': []}
+    with pytest.raises(ValueError):
+        Journal.open(tmp_path, graph=Graph())
+
+
+def test_not_a_journal(tmp_path):
+    """
+    Test that a log with the wrong magic raises ValueError.
+    """
+    Journal.open(tmp_path).close()
+    with open(os.path.join(tmp_path, "journal-1.log"), "r+b") as f:
+        f.write(b"NOTAWAL!")
+    with pytest.raises(ValueError):
+        Journal.open(tmp_path)
@@ -0,0 +1,150 @@
+import random
+
+import pytest
+from src.graph import Graph
+from src.graph.kinship import AncestorIndex, Kinship
+
+
+def ancestry(g, vertex):
+    """Generations from every ancestor of `vertex` down to it, by plain BFS."""
+    generations = {vertex: 0}
+    frontier = [vertex]
+    while frontier:
+        below = []
+        for v in frontier:
+            for parent in g.predecessors(v):
+                if parent not in generations:
+                    generations[parent] = generations[v] + 1
+                    below.append(parent)
+        frontier = below
+    return generations
+
+
+def expected(g, a, b):
+    above_a, above_b = ancestry(g, a), ancestry(g, b)
+    common = set(above_a) & set(above_b)
+    lowest = {c for c in common if not any(child in common for child in g[c])}
+    if not lowest:
+        return common, lowest, None
+    best = min(above_a[c] + above_b[c] for c in lowest)
+    return common, lowest, best
+
+
+@pytest.fixture
+def family():
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([
+        ("Grandma", "Mom"), ("Grandpa", "Mom"), ("Grandma", "Uncle"), ("Grandpa", "Uncle"),
+        ("Mom", "Alice"), ("Dad", "Alice"), ("Mom", "Bob"), ("Dad", "Bob"), ("Uncle", "Cousin"),
+        ("Stranger", "Other"),
+    ])
+    return g
+
+
+def test_family_queries(family):
+    """
+    Test the relationship queries on a small pedigree.
+    """
+    index = AncestorIndex(family)
+    assert index.common_ancestors("Alice", "Cousin") == {"Grandma", "Grandpa"}
+    assert index.lowest_common_ancestors("Alice", "Bob") == {"Mom", "Dad"}
+    assert index.lowest_common_ancestors("Alice", "Cousin") == {"Grandma", "Grandpa"}
+    assert index.lowest_common_ancestors("Mom", "Alice") == {"Mom"}
+    assert index.generation_distance("Alice", "Bob") == (1, 1)
+    assert index.generation_distance("Alice", "Cousin") == (2, 2)
+    assert index.generation_distance("Grandma", "Alice") == (0, 2)
+    assert index.generation_distance("Alice", "Other") is None
+    assert index.kinship("Alice", "Other") == Kinship(set(), None)
+    assert index.version == family.version
+
+
+def test_unknown_vertex(family):
+    """
+    Test that vertices missing from the graph raise KeyError.
+    """
+    index = AncestorIndex(family)
+    with pytest.raises(KeyError):
+        index.lowest_common_ancestors("Alice", "Nobody")
+
+
+def test_forest_uses_binary_lifting():
+    """
+    Test LCA queries on a random forest, where every vertex is indexed by binary lifting.
+    """
+    rng = random.Random(1)
+    g = Graph(reverse_index=True)
+    for child in range(1, 400):
+        if rng.random() < 0.97:
+            g.add_edge(rng.randrange(child), child)
+        else:
+            g.add_vertex(child)
+    g.add_vertex(0)
+    index = AncestorIndex(g)
+    assert all(index._tree)
+    vertices = list(g.keys())
+    for _ in range(300):
+        a, b = rng.choice(vertices), rng.choice(vertices)
+        common, lowest, best = expected(g, a, b)
+        assert index.common_ancestors(a, b) == common
+        assert index.lowest_common_ancestors(a, b) == lowest
+        distance = index.generation_distance(a, b)
+        assert (distance is None) == (best is None)
+        if distance is not None:
+            assert sum(distance) == best
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pedigree_matches_search(seed):
+    """
+    Test that index answers match plain ancestor searches on a random
+    multi-parent DAG with some single-parent lines.
+    """
+    rng = random.Random(seed)
+    g = Graph(reverse_index=True)
+    g.add_vertex(0)
+    for child in range(1, 300):
+        for parent in rng.sample(range(child), min(child, rng.choice([1, 2, 2]))):
+            g.add_edge(parent, child)
+    index = AncestorIndex(g)
+    vertices = list(g.keys())
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(200)]
+    batch = index.kinship_many(pairs)
+    for (a, b), result in zip(pairs, batch):
+        common, lowest, best = expected(g, a, b)
+        assert index.common_ancestors(a, b) == common
+        assert result.lowest_common_ancestors == lowest == index.lowest_common_ancestors(a, b)
+        assert (result.generations is None) == (best is None)
+        if best is not None:
+            assert sum(result.generations) == best
+            assert result.generations == index.generation_distance(a, b)
+
+
+def test_cycles_do_not_break_the_index():
+    """
+    Test that vertices on or below a cycle are answered by search.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([("A", "B"), ("B", "A"), ("B", "C"), ("A", "D")])
+    index = AncestorIndex(g)
+    assert index.common_ancestors("C", "D") == {"A", "B"}
+    assert index.lowest_common_ancestors("C", "D") == set()
+    assert index.generation_distance("C", "D") is None
+
+
+def test_frozen_graph(family):
+    """
+    Test that a CSRGraph is indexed directly.
+    """
+    index = AncestorIndex(family.freeze())
+    assert index.lowest_common_ancestors("Bob", "Cousin") == {"Grandma", "Grandpa"}
+
+
+def test_kinship_many_reuses_answers(family):
+    """
+    Test that repeated and reversed pairs get consistent answers.
+    """
+    index = AncestorIndex(family)
+    results = index.kinship_many([("Grandma", "Alice"), ("Alice", "Grandma"), ("Grandma", "Alice")])
+    assert results[0] == Kinship({"Grandma"}, (0, 2))
+    assert results[1] == Kinship({"Grandma"}, (2, 0))
+    assert results[2] is results[0]
@@ -0,0 +1,84 @@
+import multiprocessing
+
+import pytest
+from src.graph import Graph
+from src.graph.parallel import map_vertices, map_subgraphs, map_descendants
+from src.graph.searching import dfs
+from src.graph.utils import extract_genealogical_subgraph
+
+
+def build_graph():
+    g = Graph()
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("B", "D")
+    g.add_edge("C", "D")
+    g.add_edge("E", "A")
+    g.add_edge("F", "G")
+    return g
+
+
+def out_degree(graph, vertex):
+    return len(graph[vertex])
+
+
+def test_map_descendants_matches_dfs():
+    """
+    Test that the parallel searches return what dfs returns, in input order.
+    """
+    g = build_graph()
+    vertices = g.keys() + ["X"]
+    result = list(map_descendants(g, vertices, workers=2, chunk_size=2))
+    assert [vertex for vertex, _ in result] == vertices
+    assert result == [(vertex, dfs(g, vertex)) for vertex in vertices]
+
+def test_map_subgraphs_matches_serial():
+    """
+    Test that parallel subgraph extraction matches the serial function.
+
+    Results may arrive out of order when `ordered` is False, but every
+    vertex is reported once.
+    """
+    g = build_graph()
+    result = dict(map_subgraphs(g, g.keys(), depth=1, workers=2, chunk_size=3, ordered=False))
+    assert set(result) == set(g.keys())
+    for vertex, subgraph in result.items():
+        expected = extract_genealogical_subgraph(g, vertex, depth=1)
+        assert subgraph.all_nodes() == expected.all_nodes()
+        assert {v: set(subgraph[v]) for v in subgraph.keys()} == {v: set(expected[v]) for v in expected.keys()}
+
+def test_map_vertices_spawned_workers():
+    """
+    Test that workers started without fork attach to the shared graph.
+    """
+    g = Graph()
+    for i in range(50):
+        g.add_edge(i, i + 1)
+        g.add_edge(i, i + 2)
+    context = multiprocessing.get_context("spawn")
+    result = list(map_vertices(out_degree, g.freeze(), range(60), workers=2, chunk_size=16, mp_context=context))
+    assert result == [(i, len(g.get(i, []))) for i in range(60)]
+
+def test_map_vertices_empty_and_invalid():
+    """
+    Test that no pool is needed for no vertices and that chunk_size is validated.
+    """
+    assert list(map_vertices(out_degree, build_graph(), [])) == []
+    with pytest.raises(ValueError):
+        map_vertices(out_degree, build_graph(), ["A"], chunk_size=0)
+
+def test_map_vertices_bounded_window():
+    """
+    Test that vertices are read only as the window of tasks in flight
+    moves, in both result orders.
+    """
+    g = build_graph()
+    for ordered in (True, False):
+        read = []
+        vertices = (read.append(i) or "A" for i in range(1000))
+        results = map_vertices(out_degree, g, vertices, workers=1, chunk_size=10, ordered=ordered)
+        assert next(results) == ("A", 2)
+        # Two chunks submitted up front, plus one refilling the window.
+        assert len(read) == 30
+        assert len(list(results)) == 999
+        assert len(read) == 1000
@@ -0,0 +1,107 @@
+import random
+
+from src.graph import Graph
+from src.graph.reachability import ReachabilityIndex
+from src.graph.searching import dfs
+
+
+def random_graph(num_vertices, num_edges, seed, acyclic=False):
+    rng = random.Random(seed)
+    g = Graph()
+    for vertex in range(num_vertices):
+        g.add_vertex(vertex)
+    for _ in range(num_edges):
+        src, dst = rng.randrange(num_vertices), rng.randrange(num_vertices)
+        if acyclic and src >= dst:
+            continue
+        g.add_edge(src, dst)
+    return g
+
+
+def assert_matches_dfs(index, g):
+    for src in g.keys():
+        reachable = dfs(g, src)
+        for dst in g.keys():
+            assert index.is_reachable(src, dst) == (dst in reachable), (src, dst)
+
+
+def test_reachability_dag():
+    """
+    Test reachability queries on random DAGs against dfs.
+    """
+    for seed in range(4):
+        g = random_graph(40, 70, seed, acyclic=True)
+        for hubs in (0, 3, 64):
+            assert_matches_dfs(ReachabilityIndex(g, hubs=hubs), g)
+
+def test_reachability_with_cycles():
+    """
+    Test reachability queries on random graphs with cycles.
+
+    Ensures that vertices of the same strongly connected component
+    reach each other and that components are collapsed.
+    """
+    for seed in range(4):
+        g = random_graph(40, 60, seed)
+        for hubs in (0, 3):
+            index = ReachabilityIndex(g, hubs=hubs)
+            assert len(index) <= 40
+            assert_matches_dfs(index, g)
+
+def test_reachability_incremental_add_edge():
+    """
+    Test that edges added through the index keep it exact.
+
+    Adds random edges, including ones that close cycles and ones to
+    new vertices, and compares every pair against dfs.
+    """
+    for hubs in (0, 3):
+        rng = random.Random(11)
+        g = random_graph(25, 20, seed=3, acyclic=True)
+        index = ReachabilityIndex(g, hubs=hubs)
+        for step in range(30):
+            index.add_edge(rng.randrange(27), rng.randrange(27))
+            if step % 5 == 0:
+                assert_matches_dfs(index, g)
+        assert_matches_dfs(index, g)
+
+def test_reachability_follows_the_graph():
+    """
+    Test that the index stays exact when the graph is changed directly.
+
+    Edges are added with `Graph.add_edge` and `Graph.bulk_add_edges`,
+    vertices with `Graph.add_vertex`, and edges and vertices are removed,
+    inside and outside batches.
+    """
+    rng = random.Random(5)
+    g = random_graph(25, 20, seed=4, acyclic=True)
+    index = ReachabilityIndex(g, hubs=3)
+    for step in range(40):
+        if step % 4 == 0:
+            g.bulk_add_edges([(rng.randrange(30), rng.randrange(30)) for _ in range(3)])
+        elif step % 4 == 1:
+            g.add_vertex(rng.randrange(30, 35))
+        elif step % 8 == 2:
+            with g.batch():
+                g.remove_vertex(rng.randrange(30))
+                g.add_edge(rng.randrange(30), rng.randrange(30))
+        else:
+            g.add_edge(rng.randrange(30), rng.randrange(30))
+        assert_matches_dfs(index, g)
+
+    # A closed index keeps its last state.
+    index.close()
+    g.add_edge("new", 0)
+    assert not index.is_reachable("new", 0)
+
+def test_reachability_unknown_vertices():
+    """
+    Test queries involving vertices that are not in the graph.
+    """
+    g = Graph()
+    g.add_edge("A", "B")
+    index = ReachabilityIndex(g)
+    assert index.is_reachable("A", "A")
+    assert not index.is_reachable("A", "X")
+    assert not index.is_reachable("X", "X")
+    assert index.component("A") != index.component("B")
@@ -1,5 +1,5 @@
 import pytest
-from src.graph import Graph
+from src.graph import Graph, ReversedGraph
 from src.graph.utils import reverse  # Replace with the correct import path of your Graph class and reverse function
 
 def test_reverse_empty_graph():
@@ -87,3 +87,23 @@ def test_reverse_complex_graph():
     assert reversed_g["B"] == ["A"]
     assert reversed_g["C"] == ["B"]
     assert reversed_g["A"] == ["C"]
+
+def test_reverse_with_reverse_index_is_view():
+    """
+    Test reversing a graph that maintains a reverse index.
+
+    Ensures that the reversed graph is a view that reflects edges
+    added after the reversal, without copying the graph.
+    """
+    g = Graph(reverse_index=True)
+    g.add_edge("A", "B")
+    g.add_vertex("C")
+    reversed_g = reverse(g)
+    assert isinstance(reversed_g, ReversedGraph)
+    assert reversed_g["B"] == ["A"]
+    assert reversed_g["A"] == []
+    assert reversed_g.get("C") == []
+    assert reversed_g.get("X", "default") == "default"
+    g.add_edge("C", "B")
+    assert reversed_g["B"] == ["A", "C"]
+    assert set(reversed_g.keys()) == {"A", "B", "C"}
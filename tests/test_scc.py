@@ -0,0 +1,100 @@
+import random
+
+import pytest
+from src.graph import Graph
+from src.graph.searching import (
+    CycleError, condensation, dfs, strongly_connected_components, topological_sort,
+)
+
+
+def random_graph(num_vertices, num_edges, seed):
+    rng = random.Random(seed)
+    g = Graph()
+    for vertex in range(num_vertices):
+        g.add_vertex(vertex)
+    for _ in range(num_edges):
+        g.add_edge(rng.randrange(num_vertices), rng.randrange(num_vertices))
+    return g
+
+
+def test_scc_matches_mutual_reachability():
+    """
+    Test that two vertices share a component exactly when each reaches the other.
+
+    Also checks that components come out in reverse topological order.
+    """
+    for seed in range(5):
+        g = random_graph(40, 55, seed)
+        components = strongly_connected_components(g)
+        component_of = {v: c for c, members in enumerate(components) for v in members}
+        assert set(component_of) == g.all_nodes()
+        reach = {v: dfs(g, v) for v in g.keys()}
+        for u in g.keys():
+            for v in g.keys():
+                same = u in reach[v] and v in reach[u]
+                assert (component_of[u] == component_of[v]) == same
+                if v in reach[u]:
+                    assert component_of[v] <= component_of[u]
+
+def test_scc_long_path():
+    """
+    Test that a path far longer than the recursion limit is handled.
+    """
+    g = Graph()
+    g.bulk_add_edges((i, i + 1) for i in range(100_000))
+    g.add_edge(100_000, 0)
+    components = strongly_connected_components(g)
+    assert len(components) == 1
+    assert topological_sort({i: [i + 1] for i in range(100_000)})[-1] == 100_000
+
+def test_condensation_is_dag():
+    """
+    Test that the condensation has one vertex per component and edges going forward.
+    """
+    g = Graph()
+    for src, dst in [("A", "B"), ("B", "A"), ("B", "C"), ("C", "D"), ("D", "C"), ("A", "D"), ("E", "A")]:
+        g.add_edge(src, dst)
+    dag, components = condensation(g)
+    assert sorted(map(sorted, components)) == [["A", "B"], ["C", "D"], ["E"]]
+    assert sorted(dag.keys()) == [0, 1, 2]
+    for c in dag.keys():
+        for d in dag[c]:
+            assert c < d
+    e, ab, cd = (next(i for i, m in enumerate(components) if v in m) for v in "EAC")
+    assert dag[e] == [ab]
+    assert dag[ab] == [cd]
+    assert topological_sort(dag) == [0, 1, 2]
+
+def test_topological_sort():
+    """
+    Test that every edge points forward in the topological order.
+    """
+    g = Graph()
+    rng = random.Random(0)
+    for _ in range(200):
+        u, v = sorted(rng.sample(range(60), 2))
+        g.add_edge(v, u)
+    order = topological_sort(g)
+    position = {v: i for i, v in enumerate(order)}
+    assert set(order) == g.all_nodes()
+    for u in g.keys():
+        for v in g[u]:
+            assert position[u] < position[v]
+    assert topological_sort({'A': ['C'], 'B': ['C'], 'C': []}) == ['A', 'B', 'C']
+
+@pytest.mark.parametrize("G", [
+    {'A': ['B'], 'B': ['C'], 'C': ['D', 'A'], 'D': []},
+    {'X': ['A'], 'A': ['A']},
+    {'A': ['B'], 'B': ['C'], 'C': ['B', 'D'], 'D': ['E'], 'E': []},
+])
+def test_topological_sort_reports_cycle(G):
+    """
+    Test that a cycle raises CycleError carrying a real cycle.
+    """
+    with pytest.raises(CycleError) as info:
+        topological_sort(G)
+    cycle = info.value.cycle
+    assert isinstance(info.value, ValueError)
+    assert cycle
+    for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+        assert v in G[u]
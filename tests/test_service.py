@@ -0,0 +1,173 @@
+import asyncio
+import threading
+
+import pytest
+from src.graph import Graph
+from src.graph.searching import dfs
+from src.graph.service import GraphQueryService
+from src.graph.utils import extract_genealogical_subgraph
+
+
+class BlockingGraph(dict):
+    """A dict graph whose lookups wait until `release` is set."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.release = threading.Event()
+        self.lookups = 0
+
+    def __getitem__(self, vertex):
+        self.lookups += 1
+        self.release.wait(5)
+        return super().__getitem__(vertex)
+
+
+@pytest.fixture
+def family():
+    g = Graph()
+    g.bulk_add_edges([("Grandma", "Mom"), ("Grandma", "Uncle"), ("Mom", "Alice"), ("Uncle", "Cousin")])
+    return g
+
+
+def test_subgraph_and_descendants(family):
+    """
+    Test that the service returns what the synchronous functions return.
+    """
+    async def main():
+        service = GraphQueryService(family)
+        return await service.subgraph("Alice"), await service.descendants("Grandma")
+
+    tree, reachable = asyncio.run(main())
+    assert tree.all_nodes() == extract_genealogical_subgraph(family, "Alice").all_nodes()
+    assert reachable == {"Grandma", "Mom", "Uncle", "Alice", "Cousin"}
+
+
+def test_identical_requests_are_coalesced(family):
+    """
+    Test that a burst of identical requests runs one traversal and shares its result.
+    """
+    async def main():
+        service = GraphQueryService(family)
+        results = await asyncio.gather(*(service.subgraph("Alice") for _ in range(50)),
+                                       service.subgraph("Cousin"))
+        return service.info(), results
+
+    info, results = asyncio.run(main())
+    assert info.requests == 51
+    assert info.coalesced == 49
+    assert info.in_flight == 0
+    assert all(result is results[0] for result in results[:50])
+    assert results[50] is not results[0]
+
+
+def test_requests_after_a_change_are_not_coalesced(family):
+    """
+    Test that a request made after the graph changed starts a new traversal.
+    """
+    async def main():
+        service = GraphQueryService(family)
+        first = asyncio.ensure_future(service.descendants("Mom"))
+        await asyncio.sleep(0)
+        family.add_edge("Alice", "Kid")
+        second = await service.descendants("Mom")
+        return await first, second, service.info()
+
+    first, second, info = asyncio.run(main())
+    assert info.coalesced == 0
+    assert second == {"Mom", "Alice", "Kid"}
+
+
+def test_deadline_expires_for_one_caller_only():
+    """
+    Test that a timed-out caller gets TimeoutError while the shared traversal finishes for the others.
+    """
+    graph = BlockingGraph({"A": ["B"], "B": []})
+
+    async def main():
+        service = GraphQueryService(graph)
+        patient = asyncio.ensure_future(service.descendants("A"))
+        with pytest.raises(asyncio.TimeoutError):
+            await service.descendants("A", timeout=0.05)
+        graph.release.set()
+        return await patient, service.info()
+
+    result, info = asyncio.run(main())
+    assert result == {"A", "B"}
+    assert info.timeouts == 1
+    assert info.coalesced == 1
+
+
+def test_default_timeout():
+    """
+    Test that the service's default deadline applies to every request.
+    """
+    graph = BlockingGraph({"A": []})
+
+    async def main():
+        service = GraphQueryService(graph, timeout=0.05)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await service.descendants("A")
+        finally:
+            graph.release.set()
+
+    asyncio.run(main())
+
+
+def test_bounded_concurrency():
+    """
+    Test that no more than `max_concurrency` traversals run at once.
+    """
+    graph = BlockingGraph({"A": [], "B": [], "C": []})
+
+    async def main():
+        service = GraphQueryService(graph, max_concurrency=2)
+        tasks = [asyncio.ensure_future(service.descendants(vertex)) for vertex in "ABC"]
+        await asyncio.sleep(0.05)
+        running = service.info().running
+        graph.release.set()
+        await asyncio.gather(*tasks)
+        return running, service.info()
+
+    running, info = asyncio.run(main())
+    assert running == 2
+    assert info.running == 0 and info.in_flight == 0
+
+
+def test_errors_reach_every_caller():
+    """
+    Test that a failing traversal raises in every coalesced caller.
+    """
+    class Broken(dict):
+        def __getitem__(self, vertex):
+            raise RuntimeError("broken")
+
+    async def main():
+        service = GraphQueryService(Broken({"A": []}))
+        return await asyncio.gather(*(service.descendants("A") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_invalid_concurrency(family):
+    """
+    Test the concurrency check.
+    """
+    with pytest.raises(ValueError):
+        GraphQueryService(family, max_concurrency=0)
+
+
+def test_successive_event_loops(family):
+    """
+    Test that one service keeps working across several event loops.
+    """
+    service = GraphQueryService(family, max_concurrency=1)
+
+    async def main():
+        return await asyncio.gather(service.descendants("Grandma"), service.descendants("Mom"))
+
+    first = asyncio.run(main())
+    second = asyncio.run(main())
+    assert first == second == [dfs(family, "Grandma"), dfs(family, "Mom")]
+    assert service.info().in_flight == 0
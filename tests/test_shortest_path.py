@@ -0,0 +1,97 @@
+import random
+from collections import deque
+
+import pytest
+from src.graph import Graph
+from src.graph.searching import shortest_path
+
+
+def bfs_distance(G, src, dst, directed):
+    """Length of a shortest path by a plain one-sided BFS, or None."""
+    neighbors = {}
+    for u in G.keys():
+        for v in G.get(u, []):
+            neighbors.setdefault(u, []).append(v)
+            if not directed:
+                neighbors.setdefault(v, []).append(u)
+    distance = {src: 0}
+    queue = deque([src])
+    while queue:
+        u = queue.popleft()
+        for v in neighbors.get(u, []):
+            if v not in distance:
+                distance[v] = distance[u] + 1
+                queue.append(v)
+    return distance.get(dst)
+
+
+def assert_valid_path(G, path, src, dst, directed):
+    assert path[0] == src and path[-1] == dst
+    for u, v in zip(path, path[1:]):
+        assert v in G.get(u, []) or (not directed and u in G.get(v, []))
+
+
+@pytest.fixture
+def family():
+    G = Graph(reverse_index=True)
+    G.bulk_add_edges([("Grandma", "Mom"), ("Grandma", "Uncle"), ("Mom", "Alice"), ("Uncle", "Cousin")])
+    return G
+
+
+def test_directed_and_undirected(family):
+    """
+    Test paths along the edges and through common ancestors.
+    """
+    assert shortest_path(family, "Grandma", "Cousin") == ["Grandma", "Uncle", "Cousin"]
+    assert shortest_path(family, "Alice", "Cousin") is None
+    assert shortest_path(family, "Alice", "Cousin", directed=False) == ["Alice", "Mom", "Grandma", "Uncle", "Cousin"]
+    assert shortest_path(family, "Alice", "Alice") == ["Alice"]
+    assert shortest_path(family, "Alice", "Nobody", directed=False) is None
+
+
+def test_max_hops(family):
+    """
+    Test that paths longer than the budget are not returned.
+    """
+    assert shortest_path(family, "Alice", "Cousin", directed=False, max_hops=3) is None
+    assert len(shortest_path(family, "Alice", "Cousin", directed=False, max_hops=4)) == 5
+    assert shortest_path(family, "Grandma", "Mom", max_hops=0) is None
+    with pytest.raises(ValueError):
+        shortest_path(family, "Grandma", "Mom", max_hops=-1)
+
+
+@pytest.mark.parametrize("kind", ["indexed", "plain", "csr", "dict"])
+@pytest.mark.parametrize("directed", [True, False])
+def test_matches_one_sided_bfs(kind, directed):
+    """
+    Test that path lengths equal those of a plain BFS on random graphs,
+    with and without a way to look up predecessors.
+    """
+    rng = random.Random(7)
+    G = Graph(reverse_index=kind == "indexed")
+    for _ in range(300):
+        G.add_edge(rng.randrange(120), rng.randrange(120))
+    if kind == "csr":
+        G = G.freeze()
+    elif kind == "dict":
+        G = {vertex: G[vertex] for vertex in G.keys()}
+    vertices = list(G.keys())
+    for _ in range(200):
+        src, dst = rng.choice(vertices), rng.choice(vertices)
+        path = shortest_path(G, src, dst, directed=directed)
+        expected = bfs_distance(G, src, dst, directed)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) - 1 == expected
+            assert_valid_path(G, path, src, dst, directed)
+
+
+def test_does_not_add_vertices(family):
+    """
+    Test that searching for unknown vertices leaves the graph unchanged.
+    """
+    keys = set(family.keys())
+    shortest_path(family, "Ghost", "Alice", directed=False)
+    shortest_path(family, "Alice", "Ghost")
+    assert set(family.keys()) == keys
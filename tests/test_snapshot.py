@@ -0,0 +1,203 @@
+import gc
+import pickle
+import random
+import threading
+
+import pytest
+from conftest import apply_changes, predecessors_of, random_changes, state_of
+from src.graph import Graph, GraphSnapshot, ReversedGraph
+from src.graph.searching import dfs, shortest_path
+from src.graph.utils import extract_genealogical_subgraph
+
+
+@pytest.mark.parametrize("adjacency", ["list", "set"])
+@pytest.mark.parametrize("reverse_index", [False, True])
+def test_snapshots_keep_their_state(adjacency, reverse_index):
+    """
+    Test that every snapshot keeps the edges of the moment it was taken.
+
+    Snapshots are taken between random changes of every kind and reads
+    of unknown vertices, and each is compared with the state recorded
+    just before it was taken.
+    """
+    rng = random.Random(7)
+    g = Graph(reverse_index=reverse_index, adjacency=adjacency)
+    taken = []
+    for step, change in enumerate(random_changes(rng, 400)):
+        apply_changes(g, [change])
+        if step % 10 == 5:
+            g[rng.randrange(30, 40)]
+        if step % 20 == 0:
+            state = state_of(g), predecessors_of(g), g.version
+            taken.append((g.snapshot(), *state))
+    for snapshot, edges, predecessors, version in taken:
+        assert state_of(snapshot) == edges
+        assert predecessors_of(snapshot) == predecessors
+        assert snapshot.version == version
+
+
+def test_snapshot_shares_untouched_lists():
+    """
+    Test that a snapshot copies nothing and that the graph only copies the
+    adjacency lists it modifies.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([(0, 1), (0, 2), (1, 3), (2, 3)])
+    snapshot = g.snapshot()
+    assert snapshot._graph is g._graph
+    g.add_edge(1, 4)
+    assert snapshot._graph is not g._graph
+    assert snapshot._graph[0] is g._graph[0]
+    assert snapshot._graph[1] is not g._graph[1]
+    assert snapshot._pred[3] is g._pred[3]
+    assert snapshot[1] == [3] and g[1] == [3, 4]
+
+    # The copied list is now private and is not copied again.
+    copied = g._graph[1]
+    g.add_edge(1, 5)
+    assert g._graph[1] is copied
+
+
+@pytest.mark.parametrize("reverse_index", [False, True])
+def test_reading_after_snapshot_copies_nothing(reverse_index):
+    """
+    Test that reading the live graph after a snapshot, traversals included,
+    neither copies the vertex map nor marks any list as copied.
+    """
+    g = Graph(reverse_index=reverse_index)
+    g.bulk_add_edges([('A', 'B'), ('B', 'C'), ('A', 'C')])
+    snapshot = g.snapshot()
+    assert g['A'] is snapshot['A'] and g.get('B') is snapshot.get('B')
+    assert dfs(g, 'A') == {'A', 'B', 'C'}
+    assert state_of(extract_genealogical_subgraph(g, 'B')) == state_of(snapshot)
+    assert g._owned == set() and g._graph is snapshot._graph
+
+    g.add_edge('A', 'D')
+    assert g._owned == {'A', 'D'}
+    assert snapshot['A'] == ['B', 'C']
+
+
+def test_snapshot_is_read_only():
+    """
+    Test that modifying a snapshot raises TypeError and reading an unknown
+    vertex does not add it.
+    """
+    g = Graph()
+    g.add_edge('A', 'B')
+    snapshot = g.snapshot()
+    for modify in (lambda: snapshot.add_edge('A', 'C'), lambda: snapshot.remove_vertex('A'),
+                   lambda: snapshot.remove_edge('A', 'B'), lambda: snapshot.add_vertex('C'),
+                   lambda: snapshot.bulk_add_edges([('A', 'C')])):
+        with pytest.raises(TypeError):
+            modify()
+    with pytest.raises(TypeError):
+        snapshot['A'] = ['C']
+    assert snapshot['Z'] == []
+    assert 'Z' not in snapshot
+    assert snapshot.snapshot() is snapshot
+
+
+def test_phantom_vertex_after_snapshot():
+    """
+    Test that indexing the graph with an unknown vertex after a snapshot
+    adds the vertex to the graph only.
+    """
+    g = Graph()
+    g.add_edge('A', 'B')
+    snapshot = g.snapshot()
+    assert g['C'] == []
+    assert 'C' in g and 'C' not in snapshot
+
+
+def test_snapshot_traversals():
+    """
+    Test that the traversals accept a snapshot and see its state.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges([('Grandma', 'Mom'), ('Mom', 'Alice'), ('Mom', 'Bob')])
+    snapshot = g.snapshot()
+    g.add_edge('Alice', 'Carol')
+    g.remove_edge('Mom', 'Bob')
+
+    assert isinstance(snapshot, GraphSnapshot)
+    assert dfs(snapshot, 'Mom') == {'Mom', 'Alice', 'Bob'}
+    assert ReversedGraph(snapshot)['Bob'] == ['Mom']
+    assert shortest_path(snapshot, 'Alice', 'Bob', directed=False) == ['Alice', 'Mom', 'Bob']
+    subgraph = extract_genealogical_subgraph(snapshot, 'Alice')
+    assert 'Carol' not in subgraph.all_nodes()
+    assert snapshot.freeze().keys() == snapshot.keys()
+
+
+def test_snapshot_released():
+    """
+    Test that once every snapshot is gone the graph stops copying on write.
+    """
+    g = Graph()
+    g.add_edge(0, 1)
+    snapshot = g.snapshot()
+    g.add_edge(0, 2)
+    del snapshot
+    gc.collect()
+    adjacent = g._graph[0]
+    g.add_edge(0, 3)
+    assert g._graph[0] is adjacent
+    assert g._owned is None
+
+
+def test_pickled_graph_shares_nothing():
+    """
+    Test that a graph pickled after a snapshot copies nothing on write.
+    """
+    g = Graph()
+    g.add_edge(0, 1)
+    snapshot = g.snapshot()
+    clone = pickle.loads(pickle.dumps(g))
+    clone.add_edge(0, 2)
+    assert clone[0] == [1, 2] and snapshot[0] == [1]
+    assert pickle.loads(pickle.dumps(snapshot))[0] == [1]
+
+
+def test_reads_during_writes():
+    """
+    Test that a reader thread traversing snapshots sees consistent states
+    while another thread keeps modifying the graph.
+
+    The writer keeps a chain 0 -> 1 -> ... -> n, growing it and cutting its
+    tail, and publishes a snapshot after every change; every snapshot must
+    contain one unbroken chain.
+    """
+    g = Graph(reverse_index=True)
+    g.bulk_add_edges((i, i + 1) for i in range(200))
+    published = [g.snapshot()]
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        n = 200
+        for step in range(3000):
+            if step % 3 == 2:
+                g.remove_vertex(n)
+                n -= 1
+            else:
+                g.add_edge(n, n + 1)
+                n += 1
+            published[0] = g.snapshot()
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            snapshot = published[0]
+            try:
+                reached = dfs(snapshot, 0)
+                assert reached == set(range(len(reached)))
+                assert len(reached) == len(snapshot.keys())
+            except Exception as error:
+                errors.append(error)
+                return
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
@@ -0,0 +1,105 @@
+import pytest
+from src.graph import Graph, CSRGraph
+
+
+def build_graph(labels):
+    a, b, c, d, e, f = labels
+    g = Graph()
+    g.add_edge(a, b)
+    g.add_edge(a, c)
+    g.add_edge(b, d)
+    g.add_edge(c, d)
+    g.add_edge(e, a)
+    g.add_vertex(f)
+    return g
+
+
+@pytest.mark.parametrize("labels", [
+    ["A", "B", "C", "D", "E", "F"],
+    ["ä", "β", "C", "", "E\nF", "🙂"],
+    [10, -2, 3, 2**40, 0, 7],
+    [("A", 1), ("B", 2), ("C", 3), ("D", 4), 5, "F"],
+])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(tmp_path, labels, mmap):
+    """
+    Test that a saved graph loads with the same keys, values and nodes.
+
+    Covers string, non-ASCII, integer and mixed (pickled) labels, with and
+    without memory mapping.
+    """
+    g = build_graph(labels)
+    path = tmp_path / "g.graph"
+    g.save(path, fsync=mmap)
+    loaded = Graph.load(path, mmap=mmap)
+    assert isinstance(loaded, CSRGraph)
+    assert loaded.keys() == g.keys()
+    assert loaded.values() == g.values()
+    assert loaded.all_nodes() == g.all_nodes()
+    assert loaded[labels[0]] == g[labels[0]]
+
+def test_load_is_zero_copy(tmp_path):
+    """
+    Test that memory-mapped arrays are read-only views of the file.
+    """
+    g = build_graph(list(range(6)))
+    path = tmp_path / "g.graph"
+    g.save(path)
+    loaded = CSRGraph.load(path)
+    assert not loaded.indices.flags.writeable
+    assert not loaded.indices.flags.owndata
+    assert loaded.indptr.tolist() == g.freeze().indptr.tolist()
+    assert loaded.id_of(3) == g.freeze().id_of(3)
+
+def test_save_keeps_non_key_vertices(tmp_path):
+    """
+    Test that destination-only vertices do not become keys after a round trip.
+    """
+    g = Graph()
+    g["A"] = ["B", "C"]
+    path = tmp_path / "g.graph"
+    g.save(path)
+    loaded = Graph.load(path)
+    assert loaded.keys() == ["A"]
+    assert loaded.all_nodes() == {"A", "B", "C"}
+
+def test_save_empty_graph(tmp_path):
+    """
+    Test the round trip of a graph without vertices.
+    """
+    path = tmp_path / "g.graph"
+    Graph().save(path)
+    loaded = Graph.load(path)
+    assert loaded.keys() == []
+    assert loaded.num_edges == 0
+
+def test_thaw(tmp_path):
+    """
+    Test that a loaded graph thaws into an equal, mutable Graph.
+    """
+    g = build_graph(["A", "B", "C", "D", "E", "F"])
+    path = tmp_path / "g.graph"
+    g.save(path)
+    thawed = Graph.load(path).thaw(reverse_index=True)
+    assert thawed.keys() == g.keys()
+    assert thawed.values() == g.values()
+    assert thawed.predecessors("D") == ["B", "C"]
+    thawed.add_edge("F", "A")
+    assert thawed["F"] == ["A"]
+
+def test_load_rejects_other_files(tmp_path):
+    """
+    Test that loading a file that is not a saved graph raises ValueError.
+    """
+    path = tmp_path / "edges.txt"
+    path.write_text("A B\n" * 20)
+    with pytest.raises(ValueError):
+        Graph.load(path)
+
+    g = build_graph(["A", "B", "C", "D", "E", "F"])
+    g.save(path)
+    data = bytearray(path.read_bytes())
+    data[8] = 99
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="version"):
+        Graph.load(path, mmap=False)
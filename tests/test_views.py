@@ -0,0 +1,132 @@
+import gc
+import random
+
+import pytest
+from src.graph import Graph
+from src.graph.utils import extract_genealogical_subgraph
+from src.graph.views import GenealogyView
+
+
+def edges_of(graph):
+    return {vertex: set(graph.get(vertex, [])) for vertex in graph.all_nodes()}
+
+
+@pytest.mark.parametrize("reverse_index", [False, True])
+def test_view_matches_recomputation(reverse_index):
+    """
+    Test that views equal a full recomputation after every change.
+
+    Random edges are added and removed, including parallel edges, cycles
+    and edges between vertices that are not in the view yet.
+    """
+    for seed in range(4):
+        rng = random.Random(seed)
+        g = Graph(reverse_index=reverse_index)
+        views = [GenealogyView(g, vertex) for vertex in range(0, 24, 3)]
+        for step in range(250):
+            u, v = rng.randrange(24), rng.randrange(24)
+            if rng.random() < 0.65:
+                g.add_edge(u, v)
+            else:
+                existing = [(src, dst) for src in g.keys() for dst in g[src]]
+                if existing:
+                    g.remove_edge(*rng.choice(existing))
+            for view in views:
+                expected = extract_genealogical_subgraph(g, view.start_vertex)
+                assert edges_of(view.subgraph) == edges_of(expected), (seed, step, view.start_vertex)
+
+def test_view_delta_on_add():
+    """
+    Test that new ancestors and relatives are picked up through a new edge.
+    """
+    g = Graph(reverse_index=True)
+    g.add_edge("Mom", "Alice")
+    g.add_edge("Uncle", "Cousin")
+    view = GenealogyView(g, "Alice")
+    assert view.ancestors == {"Alice", "Mom"}
+    g.add_edge("Mom", "Bob")
+    assert view.subgraph["Mom"] == ["Alice", "Bob"]
+    g.add_edge("Grandma", "Mom")
+    g.add_edge("Grandma", "Uncle")
+    assert view.ancestors == {"Alice", "Mom", "Grandma"}
+    assert view.members == {"Alice", "Bob", "Mom", "Grandma", "Uncle", "Cousin"}
+    g.add_edge("Stranger", "Other")
+    assert "Stranger" not in view.subgraph.all_nodes()
+
+def test_view_prunes_on_remove():
+    """
+    Test that removing an edge drops the relatives that hung on it.
+    """
+    g = Graph()
+    g.bulk_add_edges([("Grandma", "Mom"), ("Grandma", "Uncle"), ("Uncle", "Cousin"), ("Mom", "Alice")])
+    view = GenealogyView(g, "Alice")
+    g.remove_edge("Grandma", "Mom")
+    assert view.ancestors == {"Alice", "Mom"}
+    assert view.subgraph.all_nodes() == {"Alice", "Mom"}
+    g.remove_edge("Mom", "Alice")
+    assert view.subgraph.all_nodes() == set()
+
+def test_view_recomputes_after_other_changes():
+    """
+    Test that vertex removal and item assignment trigger a full recomputation.
+    """
+    g = Graph()
+    g.bulk_add_edges([("Grandma", "Mom"), ("Mom", "Alice"), ("Mom", "Bob")])
+    view = GenealogyView(g, "Alice")
+    g.remove_vertex("Bob")
+    assert edges_of(view.subgraph) == edges_of(extract_genealogical_subgraph(g, "Alice"))
+    g["Mom"] = ["Alice", "Carol"]
+    assert view.members == {"Grandma", "Mom", "Alice", "Carol"}
+
+def test_view_unsubscribes():
+    """
+    Test that closed and discarded views stop receiving events.
+    """
+    g = Graph()
+    g.add_edge("Mom", "Alice")
+    view = GenealogyView(g, "Alice")
+    view.close()
+    g.add_edge("Mom", "Bob")
+    assert "Bob" not in view.members
+
+    GenealogyView(g, "Alice")
+    gc.collect()
+    assert not g._observers
+
+def test_subscribed_graph_pickles():
+    """
+    Test that a graph with views can still be pickled, without its observers.
+    """
+    import pickle
+
+    g = Graph()
+    g.add_edge("Mom", "Alice")
+    view = GenealogyView(g, "Alice")
+    copy = pickle.loads(pickle.dumps(g))
+    assert copy["Mom"] == ["Alice"]
+    copy.add_edge("Mom", "Bob")
+    assert "Bob" not in view.members
+
+def test_observer_events():
+    """
+    Test the events sent for new vertices and for deduplicated bulk loads,
+    and that a view is not invalidated by a vertex without edges.
+    """
+    class Recorder:
+        def __init__(self):
+            self.events = []
+
+        def graph_changed(self, event, src_vertex, dst_vertex):
+            self.events.append((event, src_vertex, dst_vertex))
+
+    g = Graph()
+    g.add_edge("Mom", "Alice")
+    recorder = Recorder()
+    g.subscribe(recorder)
+    view = GenealogyView(g, "Alice")
+    view.members
+    g.add_vertex("Carol")
+    g.add_vertex("Carol")
+    g.bulk_add_edges([("Mom", "Alice"), ("Mom", "Bob")], dedupe=True)
+    assert recorder.events == [("add_vertex", "Carol", None), ("add_edge", "Mom", "Bob")]
+    assert not view._stale